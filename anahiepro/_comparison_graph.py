@@ -0,0 +1,100 @@
+import numpy as np
+
+
+"""
+    Helpers for the comparison graph of an incomplete pairwise comparison matrix.
+    The vertices are the compared items and every known judgment a[i, j] is an
+    edge (i, j), so all the helpers cost O(n + number of judgments).
+"""
+
+
+def _connected_components(size, rows, cols):
+    """
+    Label the connected components of the comparison graph.
+
+    Every vertex takes the smallest label among its neighbours and the labels
+    are shortcut by pointer jumping, so the loop runs O(log n) times for most graphs.
+
+    Parameters
+    ----------
+    size : int
+        The number of the vertices.
+    rows, cols : numpy.ndarray
+        The ends of the edges.
+
+    Returns
+    -------
+    numpy.ndarray
+        The labels with shape (size,), the label of a component is its smallest vertex.
+    """
+    labels = np.arange(size)
+    while True:
+        next_labels = labels.copy()
+        np.minimum.at(next_labels, rows, labels[cols])
+        np.minimum.at(next_labels, cols, labels[rows])
+        next_labels = next_labels[next_labels]
+        if np.array_equal(next_labels, labels):
+            return labels
+        labels = next_labels
+
+
+def _degrees(size, rows, cols):
+    """
+    Get the number of the edges of each vertex.
+    """
+    return np.bincount(rows, minlength=size) + np.bincount(cols, minlength=size)
+
+
+def _laplacian_product(rows, cols, degrees, vector):
+    """
+    Multiply the graph Laplacian L = D - A by the vector without building the matrix.
+    """
+    size = len(degrees)
+    return degrees * vector - np.bincount(rows, vector[cols], size) - np.bincount(cols, vector[rows], size)
+
+
+def _solve_laplacian(rows, cols, degrees, rhs, tolerance, max_iterations):
+    """
+    Solve L x = rhs for a connected graph by the conjugate gradients with the Jacobi preconditioner.
+
+    L is singular with the constant null vector, the right-hand side must sum
+    to zero and the returned solution is the one with the zero mean.
+
+    Parameters
+    ----------
+    rows, cols : numpy.ndarray
+        The ends of the edges.
+    degrees : numpy.ndarray
+        The degrees of the vertices.
+    rhs : numpy.ndarray
+        The right-hand side.
+    tolerance : float
+        The iteration stops when the norm of the residual is not bigger than that times the norm of rhs.
+    max_iterations : int
+        The maximum number of the iterations.
+
+    Returns
+    -------
+    numpy.ndarray
+        The solution.
+    """
+    scale = 1 / np.maximum(degrees, 1)  # The only vertex without edges is the single one.
+    solution = np.zeros_like(rhs)
+    residual = rhs - rhs.mean()
+    threshold = tolerance * np.linalg.norm(residual)
+    preconditioned = residual * scale
+    direction = preconditioned
+    product = residual @ preconditioned
+
+    for _ in range(max_iterations):
+        if np.linalg.norm(residual) <= threshold:
+            break
+        laplacian_direction = _laplacian_product(rows, cols, degrees, direction)
+        step = product / (direction @ laplacian_direction)
+        solution += step * direction
+        residual -= step * laplacian_direction
+        preconditioned = residual * scale
+        (product, previous_product) = (residual @ preconditioned, product)
+        direction = preconditioned + (product / previous_product) * direction
+
+    return solution - solution.mean()
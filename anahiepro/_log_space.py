@@ -0,0 +1,168 @@
+from functools import lru_cache
+import numpy as np
+
+
+"""
+    Helpers for the reciprocal matrices kept as the logarithms of their strict
+    upper triangles (the packed log-judgments). In the log space reciprocity is
+    antisymmetry, log a[j, i] = -log a[i, j], so the row sums, the residuals and
+    the consistency measures are plain sums over the n(n-1)/2 values.
+"""
+
+
+@lru_cache(maxsize=None)
+def _upper_triangle_indices(size):
+    """
+    Get the (rows, cols) indexes of the strict upper triangle of a matrix with the given size.
+    """
+    return np.triu_indices(size, 1)
+
+
+def _pack(matrices):
+    """
+    Pack reciprocal matrices into the logarithms of their strict upper triangles.
+
+    Parameters
+    ----------
+    matrices : array_like
+        The matrices with shape (..., n, n).
+
+    Returns
+    -------
+    numpy.ndarray
+        The log-judgments with shape (..., n * (n - 1) / 2), row by row.
+    """
+    matrices = np.asarray(matrices)
+    (rows, cols) = _upper_triangle_indices(matrices.shape[-1])
+    return np.log(matrices[..., rows, cols])
+
+
+def _unpack(log_judgments, size):
+    """
+    Materialize reciprocal matrices from their packed log-judgments.
+
+    The lower triangle is exp(-log_judgments), so the result is reciprocal by construction.
+
+    Parameters
+    ----------
+    log_judgments : numpy.ndarray
+        The packed log-judgments with shape (..., n * (n - 1) / 2).
+    size : int
+        The size n of the matrices.
+
+    Returns
+    -------
+    numpy.ndarray
+        The matrices with shape (..., n, n).
+    """
+    (rows, cols) = _upper_triangle_indices(size)
+    matrices = np.ones(log_judgments.shape[:-1] + (size, size), dtype=log_judgments.dtype)
+    matrices[..., rows, cols] = np.exp(log_judgments)
+    matrices[..., cols, rows] = np.exp(-log_judgments)
+    return matrices
+
+
+def _packed_index(row, col, size):
+    """
+    Get the index of the item (row, col), row < col, in the packed strict upper triangle.
+    """
+    return row * size - row * (row + 1) // 2 + col - row - 1
+
+
+def _log_row_sums(log_judgments, size):
+    """
+    Sum the rows of the antisymmetric log-matrices without materializing them.
+
+    Parameters
+    ----------
+    log_judgments : numpy.ndarray
+        The packed log-judgments with shape (N, n * (n - 1) / 2).
+    size : int
+        The size n of the matrices.
+
+    Returns
+    -------
+    numpy.ndarray
+        The row sums with shape (N, n).
+    """
+    (rows, cols) = _upper_triangle_indices(size)
+    offsets = (np.arange(log_judgments.shape[0]) * size)[:, np.newaxis]
+    minlength = log_judgments.shape[0] * size
+    row_sums = np.bincount((offsets + rows).ravel(), log_judgments.ravel(), minlength) \
+        - np.bincount((offsets + cols).ravel(), log_judgments.ravel(), minlength)
+    return row_sums.reshape(-1, size)
+
+
+def _log_residuals(log_judgments, log_weights):
+    """
+    Get the residuals log a[i, j] - (v[i] - v[j]) of the judgments above the diagonal.
+
+    Parameters
+    ----------
+    log_judgments : numpy.ndarray
+        The packed log-judgments with shape (N, n * (n - 1) / 2).
+    log_weights : numpy.ndarray
+        The logarithms v of the priorities with shape (N, n).
+
+    Returns
+    -------
+    numpy.ndarray
+        The residuals with the shape of the log-judgments.
+    """
+    (rows, cols) = _upper_triangle_indices(log_weights.shape[-1])
+    return log_judgments - (log_weights[:, rows] - log_weights[:, cols])
+
+
+def _geometric_consistency_index(log_judgments, size):
+    """
+    Calculate the geometric consistency index (GCI) of packed matrices.
+
+    GCI = 2 / ((n - 1)(n - 2)) * sum over i < j of the squared residuals of the
+    geometric-mean priorities. Its usual thresholds are 0.31 for n = 3, 0.35 for
+    n = 4 and 0.37 for bigger matrices (Aguarón and Moreno-Jiménez, 2003).
+
+    Returns
+    -------
+    numpy.ndarray
+        The indexes with shape (N,), NaN for the matrices smaller than 3x3.
+    """
+    residuals = _log_residuals(log_judgments, _log_row_sums(log_judgments, size) / size)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.einsum("ij,ij->i", residuals, residuals) * np.divide(2.0, (size - 1) * (size - 2))
+
+
+def _log_matrix(log_judgments, size):
+    """
+    Build the antisymmetric log-matrix, log a[i, j], from the packed log-judgments of one matrix.
+    """
+    (rows, cols) = _upper_triangle_indices(size)
+    log_matrix = np.zeros((size, size))
+    log_matrix[rows, cols] = log_judgments
+    log_matrix[cols, rows] = -log_judgments
+    return log_matrix
+
+
+def _inconsistent_triad_counts(log_matrix, threshold, chunk_items=4_000_000):
+    """
+    Count the inconsistent triads of every judgment.
+
+    The triad (i, j, k) is inconsistent when Koczkodaj's index
+    1 - exp(-|log a[i, j] + log a[j, k] - log a[i, k]|) is above the threshold.
+    The (rows, n, n) tensor of the triads is built by chunks of rows, so the
+    memory stays bounded while the work is the O(n^3) vectorized sum.
+
+    Returns
+    -------
+    numpy.ndarray
+        The number of the inconsistent triads of each (i, j) with shape (n, n).
+    """
+    size = len(log_matrix)
+    bound = -np.log1p(-threshold) if threshold < 1 else np.inf
+    counts = np.zeros((size, size), dtype=np.intp)
+    chunk_size = max(1, chunk_items // max(size * size, 1))
+
+    for start in range(0, size, chunk_size):
+        block = log_matrix[start:start + chunk_size]
+        triads = block[:, :, np.newaxis] + log_matrix[np.newaxis, :, :] - block[:, np.newaxis, :]
+        counts[start:start + chunk_size] = np.count_nonzero(np.abs(triads) > bound, axis=-1)
+    return counts
@@ -0,0 +1,575 @@
+import numpy as np
+from anahiepro.nodes import Alternative
+from anahiepro.pairwise import calculate_batch, validate_matrices
+from anahiepro.priority_methods import get_priority_method
+
+
+class CompactHierarchy:
+    """
+    A hierarchy of a problem and criterias stored as parallel arrays instead of linked nodes.
+
+    The problem and the criterias are numbered in the level order, so the
+    children of the node `i` are the nodes child_offsets[i]:child_offsets[i + 1]
+    and the nodes of the level `d` are level_offsets[d]:level_offsets[d + 1].
+    The leaves (the nodes without criterias below) compare the alternatives.
+    The matrices of all the nodes are flattened into one `judgments` array.
+
+    A node costs a few array items instead of a `Node` object with its lists
+    and a `PairwiseComparisonMatrix`, so hierarchies with 100k+ criterias are
+    cheap to build and to keep. `NodeView` objects give the usual node API
+    over the arrays.
+    """
+    def __init__(self, names, parents, alternatives, ids=None, priority_method=None):
+        """
+        Build the hierarchy from the parent index of every node.
+
+        Parameters
+        ----------
+        names : sequence of str
+            The names of the problem and the criterias.
+        parents : array_like of int
+            The index of the parent of each node in `names`, -1 for the problem.
+        alternatives : sequence of str
+            The names of the alternatives.
+        ids : array_like of int, optional
+            The ids of the nodes (default is 0 for the problem and 0, 1, ... for the
+            criterias in the given order, as the `Problem` and `Criteria` nodes get them).
+        priority_method : str or PriorityMethod, optional
+            The method used to calculate the priority vectors (default is the 'eig' method).
+
+        Raises
+        ------
+        ValueError
+            If the arrays do not describe a tree rooted in a single problem, or there are no alternatives.
+        """
+        parents = np.asarray(parents, dtype=np.intp)
+        if parents.ndim != 1 or len(parents) != len(names):
+            raise ValueError("The parents must be a one-dimensional array with an index for each name.")
+        if len(alternatives) == 0:
+            raise ValueError("The hierarchy must have alternatives.")
+        if ids is None:
+            ids = np.where(parents == -1, 0, np.cumsum(parents != -1) - 1)
+        ids = np.asarray(ids, dtype=np.int64)
+        if ids.shape != parents.shape:
+            raise ValueError("The ids must have an item for each name.")
+
+        (order, level_offsets, children_nums) = self._level_order(parents)
+        positions = np.empty(len(order), dtype=np.intp)
+        positions[order] = np.arange(len(order))
+
+        self.names = tuple(names[index] for index in order)
+        self.ids = self._read_only(ids[order])
+        self.parents = self._read_only(np.concatenate(([-1], positions[parents[order[1:]]])))
+        self.child_offsets = self._read_only(np.concatenate(([1], 1 + np.cumsum(children_nums[order]))))
+        self.level_offsets = self._read_only(level_offsets)
+        self.alternatives = tuple(alternatives)
+
+        children_nums = np.diff(self.child_offsets)
+        self.leaves = self._read_only(children_nums == 0)
+        self.sizes = self._read_only(np.where(self.leaves, len(self.alternatives), children_nums))
+        self.pcm_offsets = self._read_only(np.concatenate(([0], np.cumsum(self.sizes ** 2))))
+        self.judgments = np.ones(self.pcm_offsets[-1])
+        self.priority_method = get_priority_method(priority_method)
+        self._index = None
+
+
+    @classmethod
+    def from_model(cls, model):
+        """
+        Copy the structure and the judgments of a model.
+
+        The priority methods set for the nodes are not copied, the hierarchy
+        uses the method of the model.
+
+        Parameters
+        ----------
+        model : Model
+            The model to copy.
+
+        Returns
+        -------
+        CompactHierarchy
+            The hierarchy with the same nodes and matrices.
+        """
+        nodes = [model.get_problem()]
+        parents = [-1]
+        index = 0
+        while index < len(nodes):
+            children = nodes[index].get_children()
+            if children and not isinstance(children[0], Alternative):
+                nodes.extend(children)
+                parents.extend([index] * len(children))
+            index += 1
+
+        hierarchy = cls([node.get_name() for node in nodes], parents,
+                        [alternative.get_name() for alternative in model.get_alternatives()],
+                        ids=[node.get_key()[1] for node in nodes], priority_method=model.priority_method)
+        for position, node in enumerate(nodes):  # The nodes are already in the level order.
+            hierarchy.judgments[hierarchy.pcm_offsets[position]:hierarchy.pcm_offsets[position + 1]] = node.get_pcm().ravel()
+        return hierarchy
+
+
+    def _level_order(self, parents):
+        """
+        Order the nodes level by level, the children of each node one after another.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            The indexes of the nodes in the level order, the offsets of the levels
+            and the number of the children of each node (by its original index).
+
+        Raises
+        ------
+        ValueError
+            If there is not exactly one root or some nodes are not connected to it.
+        """
+        nodes_num = len(parents)
+        roots = np.flatnonzero(parents == -1)
+        if len(roots) != 1:
+            raise ValueError("The hierarchy must have exactly one problem, whose parent is -1.")
+        if np.any((parents < -1) | (parents >= nodes_num)):
+            raise ValueError("The parents must be the indexes of the nodes.")
+
+        children_nums = np.bincount(parents[parents >= 0], minlength=nodes_num)
+        children_offsets = np.concatenate(([0], np.cumsum(children_nums)))
+        children = np.argsort(parents, kind="stable")[1:]  # The root with -1 goes first.
+
+        levels = [roots]
+        level_offsets = [0, 1]
+        while True:
+            frontier = levels[-1]
+            counts = children_nums[frontier]
+            total = int(counts.sum())
+            if total == 0:
+                break
+            starts = np.repeat(children_offsets[frontier] - (np.cumsum(counts) - counts), counts)
+            levels.append(children[starts + np.arange(total)])
+            level_offsets.append(level_offsets[-1] + total)
+
+        # Every node has one parent, so the nodes which are not reached from the root are in cycles.
+        if level_offsets[-1] != nodes_num:
+            raise ValueError("The hierarchy must be a tree, some criterias are not connected to the problem.")
+        return np.concatenate(levels), np.array(level_offsets), children_nums
+
+
+    def _read_only(self, array):
+        array.flags.writeable = False
+        return array
+
+
+    def __len__(self):
+        return len(self.names)
+
+
+    def get_problem(self):
+        """
+        Get the problem of the hierarchy.
+
+        Returns
+        -------
+        NodeView
+            The view of the problem.
+        """
+        return NodeView(self, 0)
+
+
+    def get_alternatives(self):
+        """
+        Get the alternatives of the hierarchy.
+
+        Returns
+        -------
+        list
+            The views of the alternatives.
+        """
+        return [NodeView(self, len(self) + index) for index in range(len(self.alternatives))]
+
+
+    def get_criterias_name_ids(self):
+        """
+        Get the keys of all the criterias.
+
+        Returns
+        -------
+        tuple
+            The (name, id) keys of the criterias in the level order.
+        """
+        return tuple(zip(self.names[1:], self.ids[1:].tolist()))
+
+
+    def find_criteria(self, key: tuple):
+        """
+        Find a node by its key.
+
+        Parameters
+        ----------
+        key : tuple
+            The (name, id) key of the problem or a criteria.
+
+        Returns
+        -------
+        NodeView
+            The view of the node.
+
+        Raises
+        ------
+        KeyError
+            If the key is not a (name, id) tuple.
+        ValueError
+            If there is no node with the key.
+        """
+        if not isinstance(key, tuple) or len(key) != 2:
+            raise KeyError("Invalid key. Key must be a tuple of (name, id).")
+        if self._index is None:
+            self._index = {}
+            for index, node_key in enumerate(zip(self.names, self.ids.tolist())):
+                self._index.setdefault(node_key, index)
+        if key not in self._index:
+            raise ValueError(f"Criteria with key {key} not found.")
+        return NodeView(self, self._index[key])
+
+
+    def __getitem__(self, key):
+        """
+        Get a node by its index in the level order or by its (name, id) key.
+        """
+        if isinstance(key, (int, np.integer)):
+            if not 0 <= key < len(self):
+                raise IndexError("The node index is out of range.")
+            return NodeView(self, int(key))
+        return self.find_criteria(key)
+
+
+    def get_matrix(self, index):
+        """
+        Get the pairwise comparison matrix of a node.
+
+        Parameters
+        ----------
+        index : int
+            The index of the node.
+
+        Returns
+        -------
+        numpy.ndarray
+            The matrix as a view into `judgments`.
+        """
+        size = self.sizes[index]
+        return self.judgments[self.pcm_offsets[index]:self.pcm_offsets[index + 1]].reshape(size, size)
+
+
+    def set_matrix(self, index, matrix, validate=True):
+        """
+        Set the pairwise comparison matrix of a node.
+
+        Parameters
+        ----------
+        index : int
+            The index of the node.
+        matrix : array_like
+            The matrix to set.
+        validate : bool, optional
+            Whether to check the matrix, pass False only for trusted data (default is True).
+
+        Raises
+        ------
+        ValueError
+            If the shape of the matrix does not match or the matrix is not valid.
+        """
+        matrix = np.asarray(matrix, dtype=float)
+        if matrix.shape != (self.sizes[index], self.sizes[index]):
+            raise ValueError("The shape of matrix do not match.")
+        if validate:
+            reason = validate_matrices(matrix)[0]
+            if reason is not None:
+                raise ValueError("Matrix is not consistent or not a valid pairwise comparison matrix: " + reason)
+        self.get_matrix(index)[:] = matrix
+
+
+    def set_comparison(self, index, i, j, value):
+        """
+        Set a judgment of a node and its reciprocal.
+
+        Parameters
+        ----------
+        index : int
+            The index of the node.
+        i : int
+            Row index.
+        j : int
+            Column index.
+        value : float
+            The value to set at (i, j) and its reciprocal at (j, i).
+
+        Raises
+        ------
+        ValueError
+            If trying to set a non-1 value on the diagonal.
+        """
+        if i == j and value != 1:
+            raise ValueError("The element in diagonal of matrix must be 1")
+        matrix = self.get_matrix(index)
+        matrix[i, j] = value
+        matrix[j, i] = 1 / value
+
+
+    def solve(self, showAlternatives=False):
+        """
+        Calculate the global priority vector.
+
+        The matrices of the same size are decomposed by one batched call, and
+        the global vectors are composed level by level from the bottom, with
+        one vectorized step per level.
+
+        Parameters
+        ----------
+        showAlternatives : bool, optional
+            Whether to show alternatives in the output, by default False.
+
+        Returns
+        -------
+        numpy.ndarray or list
+            The global priority vector, or a list of (alternative, value) tuples if showAlternatives is True.
+        """
+        global_vectors = np.zeros((len(self), len(self.alternatives)))
+        weights = np.zeros(len(self))  # The priority of each node in the vector of its parent.
+
+        for size in np.unique(self.sizes):
+            nodes = np.flatnonzero(self.sizes == size)
+            items = self.pcm_offsets[nodes][:, np.newaxis] + np.arange(size * size)
+            (_, vectors) = self.priority_method.calculate(self.judgments[items].reshape(-1, size, size))
+
+            leaves = self.leaves[nodes]
+            if leaves.any():
+                global_vectors[nodes[leaves]] = vectors[leaves]
+            parents = nodes[~leaves]
+            weights[self.child_offsets[parents][:, np.newaxis] + np.arange(size)] = np.abs(vectors[~leaves])
+
+        for level in range(len(self.level_offsets) - 3, -1, -1):  # The last level has only leaves.
+            level_nodes = np.arange(self.level_offsets[level], self.level_offsets[level + 1])
+            parents = level_nodes[~self.leaves[level_nodes]]
+            if not len(parents):
+                continue
+            (start, stop) = (self.child_offsets[parents[0]], self.child_offsets[parents[-1] + 1])
+            weighted = weights[start:stop, np.newaxis] * global_vectors[start:stop]
+            global_vectors[parents] = np.add.reduceat(weighted, self.child_offsets[parents] - start, axis=0)
+
+        global_vector = global_vectors[0]
+        if showAlternatives:
+            return [(alternative, value) for (alternative, value) in zip(self.get_alternatives(), global_vector)]
+        return global_vector
+
+
+    def show(self):
+        """
+        Show the hierarchy in the same form as `Model.show`.
+
+        Returns
+        -------
+        str
+            Hierarchical representation of the problem.
+        """
+        lines = []
+        stack = [(0, 0)]
+        while stack:
+            (index, depth) = stack.pop()
+            lines.append('+' + ('--' * depth) + self.names[index] + '\n')
+            if self.leaves[index]:
+                lines.extend('+' + ('--' * (depth + 1)) + name + '\n' for name in self.alternatives)
+            else:
+                stack.extend((child, depth + 1) for child in range(self.child_offsets[index + 1] - 1,
+                                                                   self.child_offsets[index] - 1, -1))
+        return ''.join(lines)
+
+
+class NodeView:
+    """
+    A lightweight node of a `CompactHierarchy`.
+
+    The view only keeps the hierarchy and the index of the node, so it is
+    created on request and costs nothing to drop. The alternatives have
+    indexes after the criterias. The views of the same node compare equal.
+    """
+    __slots__ = ("_hierarchy", "_index")
+
+    def __init__(self, hierarchy, index):
+        self._hierarchy = hierarchy
+        self._index = index
+
+
+    def _is_alternative(self):
+        return self._index >= len(self._hierarchy)
+
+
+    def get_name(self):
+        """
+        Get the name of the node.
+
+        Returns
+        -------
+        str
+            Name of the node.
+        """
+        if self._is_alternative():
+            return self._hierarchy.alternatives[self._index - len(self._hierarchy)]
+        return self._hierarchy.names[self._index]
+
+
+    def get_key(self):
+        if self._is_alternative():
+            return (self.get_name(), self._index - len(self._hierarchy))
+        return (self.get_name(), int(self._hierarchy.ids[self._index]))
+
+
+    def get_index(self):
+        """
+        Get the index of the node in the hierarchy arrays.
+
+        Returns
+        -------
+        int
+            The index of the node.
+        """
+        return self._index
+
+
+    def get_parents(self):
+        """
+        Get the list of parent nodes.
+
+        Returns
+        -------
+        list
+            The views of the parent, or of all the leaves for an alternative.
+        """
+        hierarchy = self._hierarchy
+        if self._is_alternative():
+            return [NodeView(hierarchy, int(index)) for index in np.flatnonzero(hierarchy.leaves)]
+        parent = hierarchy.parents[self._index]
+        return [] if parent == -1 else [NodeView(hierarchy, int(parent))]
+
+
+    def get_children(self):
+        """
+        Get the list of child nodes.
+
+        Returns
+        -------
+        list
+            The views of the children.
+        """
+        hierarchy = self._hierarchy
+        if self._is_alternative():
+            return []
+        if hierarchy.leaves[self._index]:
+            return hierarchy.get_alternatives()
+        return [NodeView(hierarchy, index) for index in range(hierarchy.child_offsets[self._index],
+                                                              hierarchy.child_offsets[self._index + 1])]
+
+
+    def compare(self, key: tuple):
+        """
+        Compare the node with a given key.
+
+        Parameters
+        ----------
+        key : tuple
+            Tuple containing name and id to compare.
+
+        Returns
+        -------
+        bool
+            True if name and id match the key, False otherwise.
+        """
+        return len(key) == 2 and self.get_key() == tuple(key)
+
+
+    def get_pcm(self):
+        """
+        Get the pairwise comparison matrix of the node's children.
+
+        Returns
+        -------
+        numpy.ndarray
+            The matrix as a view into the hierarchy, None for an alternative.
+        """
+        if self._is_alternative():
+            return None
+        return self._hierarchy.get_matrix(self._index)
+
+
+    def set_matrix(self, matrix, validate=True):
+        """
+        Set the matrix of the node's children.
+
+        Parameters
+        ----------
+        matrix : np.ndarray
+            Matrix to be set.
+        validate : bool, optional
+            Whether to check the matrix, pass False only for trusted data (default is True).
+        """
+        if self._is_alternative():
+            raise NotImplementedError("The alternative cannot have a pairwise comparison matrix.")
+        self._hierarchy.set_matrix(self._index, matrix, validate)
+
+
+    def set_comparison(self, i, j, value):
+        """
+        Set a comparison value in the matrix of the node's children.
+
+        Parameters
+        ----------
+        i : int
+            Index of the first element.
+        j : int
+            Index of the second element.
+        value : float
+            Comparison value.
+        """
+        if self._is_alternative():
+            raise NotImplementedError("The alternative cannot have a pairwise comparison matrix.")
+        self._hierarchy.set_comparison(self._index, i, j, value)
+
+
+    def get_priority_vector(self):
+        """
+        Get the priority vector of the node's children.
+
+        Returns
+        -------
+        np.ndarray
+            Priority vector, None for an alternative.
+        """
+        if not self._is_alternative():
+            return calculate_batch(self.get_pcm()[np.newaxis], self._hierarchy.priority_method)[0][0]
+
+
+    def get_consistency_ratio(self):
+        """
+        Get the consistency ratio of the matrix of the node's children.
+
+        Returns
+        -------
+        float
+            Consistency ratio, None for an alternative.
+        """
+        if not self._is_alternative():
+            return calculate_batch(self.get_pcm()[np.newaxis], self._hierarchy.priority_method)[1][0]
+
+
+    def __str__(self) -> str:
+        return self.get_name() + '\n'
+
+
+    def __eq__(self, value) -> bool:
+        return isinstance(value, NodeView) and self._hierarchy is value._hierarchy and self._index == value._index
+
+
+    def __hash__(self) -> int:
+        return hash(self.get_name()) + hash(self.get_key()[1])
+
+
+    def __repr__(self):
+        return self.get_name()
@@ -16,6 +16,94 @@ HOMOGENEITY_INDEXES : Final = { 1  : 0.00,
                                 14 : 1.57,
                                 15 : 1.59 }
 
+# The random indexes of the bigger matrices, which are out of Saaty's table, simulated by
+# anahiepro.random_index.generate_random_index(n, samples=10000, seed=n).
+SIMULATED_HOMOGENEITY_INDEXES : Final = { 16 : 1.5940,
+                                          17 : 1.6065,
+                                          18 : 1.6167,
+                                          19 : 1.6226,
+                                          20 : 1.6294,
+                                          21 : 1.6353,
+                                          22 : 1.6403,
+                                          23 : 1.6469,
+                                          24 : 1.6508,
+                                          25 : 1.6557,
+                                          26 : 1.6592,
+                                          27 : 1.6626,
+                                          28 : 1.6661,
+                                          29 : 1.6701,
+                                          30 : 1.6719,
+                                          31 : 1.6753,
+                                          32 : 1.6779,
+                                          33 : 1.6804,
+                                          34 : 1.6823,
+                                          35 : 1.6841,
+                                          36 : 1.6872,
+                                          37 : 1.6879,
+                                          38 : 1.6907,
+                                          39 : 1.6921,
+                                          40 : 1.6935,
+                                          41 : 1.6953,
+                                          42 : 1.6963,
+                                          43 : 1.6987,
+                                          44 : 1.6988,
+                                          45 : 1.7009,
+                                          46 : 1.7016,
+                                          47 : 1.7026,
+                                          48 : 1.7040,
+                                          49 : 1.7053,
+                                          50 : 1.7054,
+                                          51 : 1.7070,
+                                          52 : 1.7079,
+                                          53 : 1.7090,
+                                          54 : 1.7095,
+                                          55 : 1.7102,
+                                          56 : 1.7115,
+                                          57 : 1.7115,
+                                          58 : 1.7123,
+                                          59 : 1.7143,
+                                          60 : 1.7143,
+                                          61 : 1.7149,
+                                          62 : 1.7149,
+                                          63 : 1.7165,
+                                          64 : 1.7167,
+                                          65 : 1.7172,
+                                          66 : 1.7176,
+                                          67 : 1.7181,
+                                          68 : 1.7190,
+                                          69 : 1.7197,
+                                          70 : 1.7202,
+                                          71 : 1.7210,
+                                          72 : 1.7209,
+                                          73 : 1.7214,
+                                          74 : 1.7224,
+                                          75 : 1.7227,
+                                          76 : 1.7225,
+                                          77 : 1.7231,
+                                          78 : 1.7241,
+                                          79 : 1.7240,
+                                          80 : 1.7248,
+                                          81 : 1.7246,
+                                          82 : 1.7253,
+                                          83 : 1.7254,
+                                          84 : 1.7260,
+                                          85 : 1.7264,
+                                          86 : 1.7265,
+                                          87 : 1.7269,
+                                          88 : 1.7273,
+                                          89 : 1.7277,
+                                          90 : 1.7278,
+                                          91 : 1.7279,
+                                          92 : 1.7285,
+                                          93 : 1.7289,
+                                          94 : 1.7289,
+                                          95 : 1.7293,
+                                          96 : 1.7296,
+                                          97 : 1.7299,
+                                          98 : 1.7300,
+                                          99 : 1.7301,
+                                          100: 1.7307 }
+
 MIN_MARK : Final = 1
 MAX_MARK : Final = 9
 
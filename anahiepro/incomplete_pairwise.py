@@ -0,0 +1,312 @@
+import numpy as np
+from anahiepro.pairwise import PairwiseComparisonMatrix, _EigenResult
+from anahiepro.priority_methods import get_priority_method
+from anahiepro._comparison_graph import _connected_components
+
+
+"""
+    IncompletePairwiseComparisonMatrix represents a pairwise comparison matrix
+    with only some of the judgments known
+"""
+class IncompletePairwiseComparisonMatrix:
+    __slots__ = ("size", "_judgments", "_edges", "_eigen", "_priority_method")
+
+    def __init__(self, size, judgments=None, priority_method="llsm"):
+        """
+        Initialize an incomplete pairwise comparison matrix without any judgment.
+
+        Only the given judgments are kept, as the edges (i, j) of the comparison
+        graph, so the memory and the cost of the priority vector scale with their
+        number instead of n^2.
+
+        Parameters
+        ----------
+        size : int
+            The size of the matrix.
+        judgments : dict or iterable, optional
+            The known judgments as {(i, j): value} or as (i, j, value) triples (default is None).
+        priority_method : str or PriorityMethod, optional
+            The method used to calculate the priority vector, 'llsm' or 'harker' (default is 'llsm').
+        """
+        self.size = size
+        self._judgments = {}
+        self._edges = None
+        self._eigen = None
+        self._priority_method = get_priority_method(priority_method)
+
+        if judgments is not None:
+            items = judgments.items() if isinstance(judgments, dict) else (((i, j), value) for (i, j, value) in judgments)
+            for ((i, j), value) in items:
+                self.set_comparison(i, j, value)
+
+
+    def set_comparison(self, i, j, value):
+        """
+        Set the comparison value for the given indices.
+
+        Parameters
+        ----------
+        i : int
+            Row index.
+        j : int
+            Column index.
+        value : float
+            The value of (i, j), the value of (j, i) is its reciprocal.
+
+        Raises
+        ------
+        IndexError
+            If the indices are out of the matrix.
+        ValueError
+            If the value is not a positive finite number or a non-1 value is set on the diagonal.
+        """
+        self._check_indexes(i, j)
+        if not (0 < value < np.inf):
+            raise ValueError("The items of the matrix must be positive finite numbers.")
+        if i == j:
+            if value != 1:
+                raise ValueError("The element in diagonal of matrix must be 1")
+            return
+
+        (key, log_value) = (((i, j), np.log(value)) if i < j else ((j, i), -np.log(value)))
+        self._judgments[key] = log_value
+        self._invalidate()
+
+
+    def remove_comparison(self, i, j):
+        """
+        Forget the judgment of the given pair.
+
+        Parameters
+        ----------
+        i : int
+            Row index.
+        j : int
+            Column index.
+        """
+        self._check_indexes(i, j)
+        if self._judgments.pop((min(i, j), max(i, j)), None) is not None:
+            self._invalidate()
+
+
+    def has_comparison(self, i, j):
+        """
+        Check if the judgment of the given pair is known.
+
+        Returns
+        -------
+        bool
+            True for the known judgments and the diagonal items, False otherwise.
+        """
+        self._check_indexes(i, j)
+        return i == j or (min(i, j), max(i, j)) in self._judgments
+
+
+    def _check_indexes(self, i, j):
+        if not (0 <= i < self.size and 0 <= j < self.size):
+            raise IndexError(f"The indices ({i}, {j}) are out of the matrix with size {self.size}.")
+
+
+    def get_judgments(self):
+        """
+        Get the known judgments above the diagonal as an edge list.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            The row indexes, the column indexes (row < column) and the values of the judgments.
+        """
+        (rows, cols, log_judgments) = self._get_edges()
+        return rows.copy(), cols.copy(), np.exp(log_judgments)
+
+
+    def _get_edges(self):
+        """
+        Get the edges of the comparison graph and the log-judgments, built once until the next change.
+        """
+        if self._edges is None:
+            keys = np.array(list(self._judgments), dtype=np.intp).reshape(-1, 2)
+            self._edges = (keys[:, 0], keys[:, 1], np.fromiter(self._judgments.values(), float, len(self._judgments)))
+        return self._edges
+
+
+    def get_matrix(self):
+        """
+        Get the matrix with NaN in place of the missing judgments.
+
+        Returns
+        -------
+        numpy.ndarray
+            The matrix with shape (n, n).
+        """
+        (rows, cols, log_judgments) = self._get_edges()
+        matrix = np.full((self.size, self.size), np.nan)
+        np.fill_diagonal(matrix, 1)
+        matrix[rows, cols] = np.exp(log_judgments)
+        matrix[cols, rows] = np.exp(-log_judgments)
+        return matrix
+
+
+    def is_complete(self):
+        """
+        Check if all the n(n-1)/2 judgments are known.
+
+        Returns
+        -------
+        bool
+            True if the matrix is complete, False otherwise.
+        """
+        return len(self._judgments) == self.size * (self.size - 1) // 2
+
+
+    def get_components(self):
+        """
+        Label the connected components of the comparison graph.
+
+        The items of different components are never compared, even indirectly,
+        so their relative priorities are not defined.
+
+        Returns
+        -------
+        numpy.ndarray
+            The component of each item, labelled by its smallest item.
+        """
+        (rows, cols, _) = self._get_edges()
+        return _connected_components(self.size, rows, cols)
+
+
+    def is_connected(self):
+        """
+        Check if every two items are compared directly or through other items.
+
+        Returns
+        -------
+        bool
+            True if the comparison graph is connected, False otherwise.
+        """
+        return self.size == 0 or not self.get_components().any()
+
+
+    @property
+    def priority_method(self):
+        """
+        PriorityMethod: The method used to calculate the priority vector.
+        """
+        return self._priority_method
+
+
+    @priority_method.setter
+    def priority_method(self, priority_method):
+        self._priority_method = get_priority_method(priority_method)
+        self._invalidate()
+
+
+    def _invalidate(self):
+        self._edges = None
+        self._eigen = None
+
+
+    def _get_eigen(self):
+        """
+        Get the principal eigenvalue, the priority vector and the consistency ratio, cached until the next change.
+
+        Raises
+        ------
+        ValueError
+            If the comparison graph is not connected.
+        """
+        if self._eigen is None:
+            if not self.is_connected():
+                raise ValueError("The comparison graph is not connected, so the priorities are not defined.")
+            (max_eigval, priority_vector) = self._priority_method.calculate_sparse(self.size, *self._get_edges())
+            self._eigen = _EigenResult(max_eigval, priority_vector)
+        return self._eigen
+
+
+    def calculate_priority_vector(self):
+        """
+        Calculate the priority vector from the known judgments.
+
+        Returns
+        -------
+        numpy.ndarray
+            The priority vector.
+        """
+        return self._get_eigen().priority_vector.copy()
+
+
+    def calculate_consistency_ratio(self):
+        """
+        Calculate the consistency ratio of the matrix completed by the priority vector.
+
+        Like for a complete matrix, the ratio is defined by the principal eigenvalue
+        of the completed matrix whatever the priority method is.
+
+        Returns
+        -------
+        float
+            The consistency ratio.
+        """
+        return self.complete().calculate_consistency_ratio()
+
+
+    def estimate_consistency_ratio(self):
+        """
+        Estimate the consistency ratio of the completed matrix by the eigenvalue estimation of the priority method.
+
+        It costs O(n + number of judgments), but depends on the method.
+
+        Returns
+        -------
+        float
+            The estimated consistency ratio.
+        """
+        return self._get_eigen().consistency_ratio
+
+
+    def complete(self):
+        """
+        Fill the missing judgments with the ratios w[i] / w[j] of the priorities.
+
+        The completed matrix has the same priority vector for the 'llsm' method,
+        so it might be set to a node of a model.
+
+        Returns
+        -------
+        PairwiseComparisonMatrix
+            The complete matrix.
+        """
+        priority_vector = self.calculate_priority_vector()
+        matrix = priority_vector[:, np.newaxis] / priority_vector[np.newaxis, :]
+        (rows, cols, log_judgments) = self._get_edges()
+        matrix[rows, cols] = np.exp(log_judgments)
+        matrix[cols, rows] = np.exp(-log_judgments)
+        return PairwiseComparisonMatrix(matrix=matrix, priority_method=self._priority_method, validate=False)
+
+
+    def __getitem__(self, key):
+        """
+        Get the value at the specified index, NaN for the missing judgments.
+        """
+        (i, j) = key
+        self._check_indexes(i, j)
+        if i == j:
+            return 1.0
+        log_value = self._judgments.get((min(i, j), max(i, j)))
+        if log_value is None:
+            return np.nan
+        return np.exp(log_value if i < j else -log_value)
+
+
+    def __setitem__(self, key, value):
+        """
+        Set the value at the specified index.
+        """
+        self.set_comparison(*key, value)
+
+
+    def __len__(self):
+        """
+        Get the number of the known judgments above the diagonal.
+        """
+        return len(self._judgments)
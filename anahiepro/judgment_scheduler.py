@@ -0,0 +1,274 @@
+import math
+from statistics import NormalDist
+import numpy as np
+from anahiepro._comparison_graph import _degrees
+
+
+"""
+    JudgmentScheduler proposes the pairs to compare next, so that the priorities
+    of an incomplete matrix are found with as few judgments as possible
+"""
+class JudgmentScheduler:
+    DEFAULT_NOISE = 0.5  # The prior standard deviation of log a[i, j].
+    PRIOR_FREEDOM = 3    # The weight of the prior in the degrees of freedom.
+    _BLOCK_ROWS = 64     # The rank-one updates go by blocks of rows, which fit into the cache.
+
+    def __init__(self, pcm, top_k=None, noise=None, regularization=1e-8):
+        """
+        Initialize the scheduler for an incomplete pairwise comparison matrix.
+
+        The log-priorities are the LLSM estimate v = M b, where M = (L + delta * I)^-1,
+        L is the Laplacian of the comparison graph and b are the sums of the
+        log-judgments. If every log-judgment has an independent error with the
+        standard deviation sigma, the variance of v[i] - v[j] is sigma^2 times
+        the effective resistance R[i, j] = M[i, i] + M[j, j] - 2 * M[i, j].
+        M is inverted once, and every new judgment updates M, R and v by the
+        Sherman-Morrison formula in O(n^2).
+
+        The judgments must be added by `add_judgment`, the changes made
+        directly to the matrix are not tracked.
+
+        Parameters
+        ----------
+        pcm : IncompletePairwiseComparisonMatrix
+            The matrix to fill, it might be empty.
+        top_k : int, optional
+            Only the order of the k most important items matters (default is None, the order of all items).
+        noise : float, optional
+            The standard deviation sigma of the log-judgments (default is None,
+            it is estimated from the residuals of the judgments).
+        regularization : float, optional
+            The delta added to the diagonal of the Laplacian, so that it is
+            invertible while the graph is not connected (default is 1e-8).
+
+        Raises
+        ------
+        ValueError
+            If top_k is not a positive integer.
+        """
+        if top_k is not None and not (isinstance(top_k, int) and top_k > 0):
+            raise ValueError("The 'top_k' must be a positive integer.")
+
+        self.pcm = pcm
+        self.top_k = top_k
+        self.noise = noise
+        self.regularization = regularization
+        self._build()
+
+
+    def _build(self):
+        """
+        Invert the regularized Laplacian and find the log-priorities from the judgments of the matrix.
+        """
+        size = self.pcm.size
+        (rows, cols, log_judgments) = self.pcm._get_edges()
+
+        laplacian = np.zeros((size, size))
+        laplacian[rows, cols] = laplacian[cols, rows] = -1
+        laplacian[np.diag_indices(size)] = _degrees(size, rows, cols) + self.regularization
+        self._inverse = np.linalg.inv(laplacian)
+
+        self._rhs = np.bincount(rows, log_judgments, size) - np.bincount(cols, log_judgments, size)
+        self._log_weights = self._inverse @ self._rhs
+        self._squared_errors = self._get_squared_errors()
+
+        # The resistances of the pairs which might be proposed, -inf for the known pairs.
+        self._resistances = self._get_resistances()
+        self._resistances[rows, cols] = self._resistances[cols, rows] = -np.inf
+        self._resistances[np.diag_indices(size)] = -np.inf
+        self._buffer = np.empty((min(self._BLOCK_ROWS, size), size))
+
+
+    def add_judgment(self, i, j, value):
+        """
+        Set the judgment to the matrix and update the estimate of the priorities.
+
+        A new pair costs O(n^2), a new value of a known pair costs O(n).
+
+        Parameters
+        ----------
+        i : int
+            Row index.
+        j : int
+            Column index.
+        value : float
+            The comparison value of (i, j).
+        """
+        previous = self.pcm[i, j]
+        self.pcm.set_comparison(i, j, value)
+        if i == j:
+            return
+
+        # u = e_i - e_j, so M u, u^T M u and u^T v are the differences of the rows and items.
+        inverse_u = self._inverse[i] - self._inverse[j]
+        if not np.isnan(previous):
+            change = np.log(value) - np.log(previous)
+            self._rhs[i] += change
+            self._rhs[j] -= change
+            self._log_weights += inverse_u * change
+            self._squared_errors = self._get_squared_errors()
+            return
+
+        resistance = inverse_u[i] - inverse_u[j]
+        innovation = np.log(value) - (self._log_weights[i] - self._log_weights[j])
+        self._rhs[i] += np.log(value)
+        self._rhs[j] -= np.log(value)
+        self._log_weights += inverse_u * (innovation / (1 + resistance))
+        self._squared_errors += innovation ** 2 / (1 + resistance)
+        self._update(inverse_u, 1 / (1 + resistance))
+        self._resistances[i, j] = self._resistances[j, i] = -np.inf
+
+
+    def _update(self, inverse_u, scale):
+        """
+        Apply M -= s * (M u)(M u)^T and the same change of R in place.
+
+        R[k, l] drops by s * ((M u)[k] - (M u)[l])^2, i.e. by s * (M u)[k]^2 +
+        s * (M u)[l]^2 - 2 * s * (M u)[k] * (M u)[l], so both updates share the outer product.
+        """
+        scaled = inverse_u * scale
+        squares = inverse_u * scaled
+        for start in range(0, len(inverse_u), self._BLOCK_ROWS):
+            stop = start + self._BLOCK_ROWS
+            block = self._buffer[:len(inverse_u[start:stop])]
+            (inverse, resistances) = (self._inverse[start:stop], self._resistances[start:stop])
+
+            np.multiply(inverse_u[start:stop, np.newaxis], scaled, out=block)
+            np.subtract(inverse, block, out=inverse)
+            np.multiply(block, 2, out=block)
+            np.subtract(block, squares, out=block)
+            np.subtract(block, squares[start:stop, np.newaxis], out=block)
+            np.add(resistances, block, out=resistances)
+
+
+    def _get_squared_errors(self):
+        (rows, cols, log_judgments) = self.pcm._get_edges()
+        return np.sum((log_judgments - self._log_weights[rows] + self._log_weights[cols]) ** 2)
+
+
+    def _get_resistances(self, items=None):
+        """
+        Get the effective resistances between the given items (default is all of them) and all the items.
+        """
+        diagonal = np.diagonal(self._inverse)
+        if items is None:
+            return diagonal[:, np.newaxis] + diagonal[np.newaxis, :] - 2 * self._inverse
+        return diagonal[items, np.newaxis] + diagonal[np.newaxis, :] - 2 * self._inverse[items]
+
+
+    def _top_items(self):
+        if self.top_k is None or self.top_k >= self.pcm.size:
+            return None
+        return np.argpartition(-self._log_weights, self.top_k - 1)[:self.top_k]
+
+
+    def propose(self):
+        """
+        Propose the pair to compare next.
+
+        Without `top_k` it is the pair with the most uncertain ratio, i.e. with the
+        biggest effective resistance, whose judgment shrinks the confidence
+        ellipsoid of the priorities the most. With `top_k` it is the pair with
+        one of the top items whose order is the most likely to be wrong. The
+        items of different components of the graph go first in both cases.
+
+        Returns
+        -------
+        tuple of int or None
+            The pair (i, j), None if all the judgments are known.
+        """
+        if self.pcm.is_complete():
+            return None
+
+        items = self._top_items()
+        if items is not None:
+            pair = self._propose_for_order(items)
+            if pair is not None:
+                return pair
+
+        # Without top_k, or when the top items are compared with all the others.
+        (row, col) = np.unravel_index(np.argmax(self._resistances), self._resistances.shape)
+        return (int(min(row, col)), int(max(row, col)))
+
+
+    def _propose_for_order(self, items):
+        """
+        Get the unknown pair with one of the items whose order is the most uncertain, None if there is no such pair.
+        """
+        resistances = self._resistances[items]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            scores = np.abs(self._log_weights[items, np.newaxis] - self._log_weights[np.newaxis, :]) / np.sqrt(resistances)
+        scores[np.isneginf(resistances)] = np.inf
+
+        (row, col) = np.unravel_index(np.argmin(scores), scores.shape)
+        if scores[row, col] == np.inf:
+            return None
+        return (int(min(items[row], col)), int(max(items[row], col)))
+
+
+    def get_noise(self):
+        """
+        Get the standard deviation sigma of the log-judgments.
+
+        Without the given noise it is estimated from the sum of squared residuals
+        of m judgments of n items in c components, which has m - n + c degrees of
+        freedom. DEFAULT_NOISE is pooled with it as PRIOR_FREEDOM more degrees,
+        so a few redundant judgments do not make the scheduler overconfident.
+
+        Returns
+        -------
+        float
+            The standard deviation.
+        """
+        if self.noise is not None:
+            return self.noise
+
+        components = np.count_nonzero(self.pcm.get_components() == np.arange(self.pcm.size))
+        freedom = max(len(self.pcm) - self.pcm.size + components, 0)
+        return math.sqrt((self._squared_errors + self.PRIOR_FREEDOM * self.DEFAULT_NOISE ** 2)
+                         / (freedom + self.PRIOR_FREEDOM))
+
+
+    def is_confident(self, confidence=0.95, tolerance=0.1):
+        """
+        Check if the remaining comparisons are unnecessary at the given confidence.
+
+        It is so when the ratio of every two items (one of the top items, if
+        `top_k` is set) is either in the right order with the given probability,
+        or is known up to the relative tolerance, so the order of the items does
+        not matter. It is also so when all the judgments are known.
+
+        Parameters
+        ----------
+        confidence : float, optional
+            The one-sided probability of the confidence intervals (default is 0.95).
+        tolerance : float, optional
+            The relative difference of the priorities that is treated as a tie (default is 0.1).
+
+        Returns
+        -------
+        bool
+            True if the comparisons might be stopped, False otherwise.
+        """
+        if self.pcm.is_complete():
+            return True
+
+        items = self._top_items()
+        items = np.arange(self.pcm.size) if items is None else items
+        differences = np.abs(self._log_weights[items, np.newaxis] - self._log_weights[np.newaxis, :])
+        margins = NormalDist().inv_cdf(confidence) * self.get_noise() \
+            * np.sqrt(np.maximum(self._get_resistances(items), 0))
+        return bool(np.all(margins <= np.maximum(differences, np.log1p(tolerance))))
+
+
+    def get_priority_vector(self):
+        """
+        Get the current estimate of the priority vector.
+
+        Returns
+        -------
+        numpy.ndarray
+            The priority vector with the unit length.
+        """
+        weights = np.exp(self._log_weights - self._log_weights.max())
+        return weights / np.linalg.norm(weights)
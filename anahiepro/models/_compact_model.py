@@ -0,0 +1,135 @@
+from collections import namedtuple
+import numpy as np
+from anahiepro.nodes import Alternative
+
+
+"""
+    _CompactModel is a picklable snapshot of a model made of plain arrays.
+
+    The problem and the criterias are numbered in the level order, so the
+    children of the node `i` are the nodes child_offsets[i]:child_offsets[i + 1].
+    The matrices of all the nodes are flattened one after another into
+    `judgments`, `sizes` keeps their sizes. `order` lists the nodes which are
+    not leaves, children before parents.
+"""
+_CompactModel = namedtuple("_CompactModel", ["judgments", "sizes", "methods", "child_offsets", "order", "alternatives_num"])
+
+
+def _compact_model(model):
+    """
+    Take the judgments and the structure of the model as a _CompactModel.
+
+    Nothing is decomposed, so the snapshot is cheap to take and to send to another process.
+    The priority methods are resolved as `Model.solve` resolves them, but they
+    are not set to the PCMs, so the model is not changed.
+
+    Parameters
+    ----------
+    model : Model
+        The model to take.
+
+    Returns
+    -------
+    _CompactModel
+        The snapshot of the model.
+    """
+    nodes = [model.get_problem()]
+    children_nums = []
+    order = []
+    index = 0
+    while index < len(nodes):
+        children = nodes[index].get_children()
+        if children and not isinstance(children[0], Alternative):
+            nodes.extend(children)
+            children_nums.append(len(children))
+            order.append(index)
+        else:
+            children_nums.append(0)
+        index += 1
+
+    return _CompactModel(judgments=np.concatenate([node.pcm.matrix.ravel() for node in nodes]).astype(float, copy=False),
+                         sizes=np.array([len(node.pcm.matrix) for node in nodes], dtype=np.intp),
+                         methods=tuple(node.get_priority_method() or model.priority_method for node in nodes),
+                         child_offsets=np.concatenate(([1], 1 + np.cumsum(children_nums))),
+                         order=np.array(order[::-1], dtype=np.intp),
+                         alternatives_num=len(model.get_alternatives()))
+
+
+def _matrices(compact):
+    """
+    Get the matrices of the snapshot's nodes as views into its judgments.
+
+    Parameters
+    ----------
+    compact : _CompactModel
+        The snapshot of a model.
+
+    Returns
+    -------
+    list of numpy.ndarray
+        The matrix of each node.
+    """
+    bounds = np.concatenate(([0], np.cumsum(compact.sizes ** 2)))
+    return [compact.judgments[start:stop].reshape(size, size)
+            for start, stop, size in zip(bounds[:-1], bounds[1:], compact.sizes)]
+
+
+def _decompose_groups(matrices, methods):
+    """
+    Calculate the priority vectors of stacks of matrices.
+
+    The stacks of the same size and priority method are decomposed together by one call.
+
+    Parameters
+    ----------
+    matrices : sequence of numpy.ndarray
+        The stacks of matrices with shape (S, n, n).
+    methods : sequence of PriorityMethod
+        The priority method of each stack.
+
+    Returns
+    -------
+    list of numpy.ndarray
+        The priority vectors of each stack with shape (S, n).
+    """
+    groups = {}
+    for index, (stack, method) in enumerate(zip(matrices, methods)):
+        groups.setdefault((stack.shape, method), []).append(index)
+
+    vectors = [None] * len(matrices)
+    for ((samples, size, _), method), indexes in groups.items():
+        (_, group_vectors) = method.calculate(np.concatenate([matrices[index] for index in indexes]))
+        for index, stack_vectors in zip(indexes, group_vectors.reshape(len(indexes), samples, size)):
+            vectors[index] = stack_vectors
+    return vectors
+
+
+def _compose(compact, local_vectors):
+    """
+    Compose the global priority vectors from the local ones, as `Model.solve` does.
+
+    The local vectors of the leaves are used as they are, and the absolute
+    values of the others weight the children.
+
+    Parameters
+    ----------
+    compact : _CompactModel
+        The structure of the model.
+    local_vectors : sequence of numpy.ndarray
+        The local priority vectors of each node with shape (S, n), one row per sample.
+
+    Returns
+    -------
+    numpy.ndarray
+        The global priority vectors with shape (S, alternatives).
+    """
+    samples = local_vectors[0].shape[0]
+    global_vectors = np.zeros((samples, len(local_vectors), compact.alternatives_num))
+    leaves = np.ones(len(local_vectors), dtype=bool)
+    leaves[compact.order] = False
+    for index in np.flatnonzero(leaves):
+        global_vectors[:, index] = local_vectors[index]
+    for index in compact.order:
+        children = global_vectors[:, compact.child_offsets[index]:compact.child_offsets[index + 1]]
+        global_vectors[:, index] = np.matmul(np.abs(local_vectors[index])[:, np.newaxis, :], children)[:, 0]
+    return global_vectors[:, 0]
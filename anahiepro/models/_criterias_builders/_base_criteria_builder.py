@@ -1,22 +1,31 @@
 from abc import ABC, abstractmethod
+from anahiepro.models._depth_analysis import _DepthAnalysis
 
 
 class _BaseCriteriaBuilder(ABC):
     def __init__(self, criterias):
         self.checkDepth = True
         self.criterias = criterias
+        self.depth_analysis = _DepthAnalysis(self._get_children)
     
-    @abstractmethod
     def has_same_depth(self):
-        pass
+        return self.depth_analysis.has_same_depth(self._get_roots())
 
     @abstractmethod
     def build_criteria(self):
         pass
     
-    @abstractmethod
     def _get_depth(self):
+        """Return the smallest and the biggest depth of the leaves, 1 for the criterias without children."""
+        return self.depth_analysis.get_range(self._get_roots())
+    
+    @abstractmethod
+    def _get_roots(self):
+        pass
+    
+    @abstractmethod
+    def _get_children(self, criteria):
         pass
     
     def not_throw_exception_while_build(self):
-        self.checkDepth = False
\ No newline at end of file
+        self.checkDepth = False
@@ -11,5 +11,8 @@ class _EmptyCriteriaBuilder(_BaseCriteriaBuilder):
     def build_criteria(self):
         return list()
     
-    def _get_depth(self):
-        return 0
\ No newline at end of file
+    def _get_roots(self):
+        return []
+    
+    def _get_children(self, criteria):
+        return []
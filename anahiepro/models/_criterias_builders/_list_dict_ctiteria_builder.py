@@ -8,14 +8,7 @@ class _ListDictCriteriaBuilder(_BaseCriteriaBuilder):
         if not self._is_valid_structure(criterias):
             raise TypeError("The criterias have wrong structure.")
         super().__init__(criterias)
-    
-    
-    def has_same_depth(self):
-        try:
-            depths = [self._get_depth(item) for item in self.criterias]
-            return len(set(depths)) == 1
-        except ValueError:
-            return False
+        self._children = self._index_children(criterias)
 
 
     def build_criteria(self):
@@ -24,29 +17,44 @@ class _ListDictCriteriaBuilder(_BaseCriteriaBuilder):
         return self.criterias
     
     
-    def _get_depth(self, structure, depth=0):
-        if isinstance(structure, dict):
-            for key, value in structure.items():
-                return self._get_depth(value, depth + 1)
-        elif isinstance(structure, list):
-            depths = [self._get_depth(item, depth) for item in structure]
-            if len(set(depths)) != 1:
-                raise ValueError("Different depths found in list: {}".format(depths))
-            return depths[0]
-        return depth
+    def _index_children(self, criterias):
+        """Map the id of every criteria to its child criterias, so the depths are analysed over the criterias."""
+        children = {}
+        stack = [criterias]
+        while stack:
+            for criteria_dict in stack.pop():
+                for criteria, criteria_list in criteria_dict.items():
+                    if criteria_list is None:
+                        children[id(criteria)] = ()
+                    else:
+                        children[id(criteria)] = [child for child_dict in criteria_list for child in child_dict]
+                        stack.append(criteria_list)
+        return children
+    
+    
+    def _get_roots(self):
+        return [criteria for criteria_dict in self.criterias for criteria in criteria_dict]
+    
+    
+    def _get_children(self, criteria):
+        return self._children[id(criteria)]
     
 
     def _is_valid_structure(self, obj):
-        if not isinstance(obj, list):
-            return False
-
-        for item in obj:
-            if not isinstance(item, dict):
+        stack = [obj]
+        while stack:
+            obj = stack.pop()
+            if not isinstance(obj, list):
                 return False
-            for key, value in item.items():
-                if not isinstance(key, Criteria):
+
+            for item in obj:
+                if not isinstance(item, dict):
                     return False
-                if value is not None:
-                    if not self._is_valid_structure(value):
+                for key, value in item.items():
+                    if not isinstance(key, Criteria):
                         return False
+                    if value is not None:
+                        if not value:  # A leaf has None instead of the children.
+                            return False
+                        stack.append(value)
         return True
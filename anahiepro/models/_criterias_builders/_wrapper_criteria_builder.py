@@ -23,6 +23,10 @@ class _WrapperCriteriaBuilder():
         return self._builder._get_depth()
     
     
+    def not_throw_exception_while_build(self):
+        self._builder.not_throw_exception_while_build()
+    
+    
     def _set_builder(self, criterias):
         if criterias is None:
             return _EmptyCriteriaBuilder(criterias)
@@ -0,0 +1,93 @@
+class _DepthAnalysis:
+    """
+    The smallest and the biggest depth of the leaves under every criteria.
+
+    Each subtree is analysed once, children before parents, and its result is
+    kept by the identity of its criteria, so `has_same_depth` and the build of
+    the criterias read it instead of traversing the tree again.
+    """
+    def __init__(self, get_children):
+        """
+        Parameters
+        ----------
+        get_children : callable
+            Returns the child criterias of a criteria, an empty sequence for a leaf.
+        """
+        self._get_children = get_children
+        self._depths = {}  # id(criteria) -> (criteria, min depth, max depth), the criteria keeps the id in use.
+
+
+    def get_depths(self, criteria):
+        """
+        Get the depths of the leaves under the criteria.
+
+        Returns
+        -------
+        tuple of int
+            The smallest and the biggest depth, (1, 1) for a leaf.
+
+        Raises
+        ------
+        TypeError
+            If the criteria is its own descendant.
+        """
+        depths = self._depths
+        if id(criteria) not in depths:
+            entered = {}  # id(criteria) -> its children, for the criterias waiting for their children.
+            stack = [criteria]
+            while stack:
+                node = stack[-1]
+                if id(node) in depths:
+                    stack.pop()
+                    continue
+
+                children = entered.pop(id(node), None)
+                if children is None:
+                    children = self._get_children(node)
+                    pending = [child for child in children if id(child) not in depths]
+                    if pending:
+                        # The entered criterias are the node and its ancestors.
+                        entered[id(node)] = children
+                        if any(id(child) in entered for child in pending):
+                            raise TypeError("The criterias have wrong structure, a criteria is its own descendant.")
+                        stack.extend(pending)
+                        continue
+
+                stack.pop()
+                if children:
+                    child_depths = [depths[id(child)] for child in children]
+                    depths[id(node)] = (node, 1 + min(low for (_, low, _) in child_depths),
+                                        1 + max(high for (_, _, high) in child_depths))
+                else:
+                    depths[id(node)] = (node, 1, 1)
+
+        (_, low, high) = depths[id(criteria)]
+        return low, high
+
+
+    def get_range(self, criterias):
+        """
+        Get the smallest and the biggest depth of the leaves under all the criterias.
+
+        Returns
+        -------
+        tuple of int
+            The depths, (0, 0) if there are no criterias.
+        """
+        if not criterias:
+            return 0, 0
+        depths = [self.get_depths(criteria) for criteria in criterias]
+        return min(low for (low, _) in depths), max(high for (_, high) in depths)
+
+
+    def has_same_depth(self, criterias):
+        """
+        Check if all the leaves under the criterias have the same depth.
+
+        Returns
+        -------
+        bool
+            True if they do, False otherwise or if there are no criterias.
+        """
+        (low, high) = self.get_range(criterias)
+        return bool(criterias) and low == high
@@ -3,11 +3,16 @@ class _ModelBuilder:
         self.problem = problem
         self.criterias = criterias
         self.alternatives = alternatives
+        self.criteria_index = {}
     
     def build(self):
         self._build_model(self.criterias)
         self._build_pcm(self.problem)
     
+    def get_criteria_index(self):
+        """Return the criteria keyed by their (name, id) in the pre-order of the hierarchy."""
+        return self.criteria_index
+    
     def _build_model(self, criterias):
         if len(criterias) == 0:
             self._build_model_without_criterias()
@@ -22,23 +27,31 @@ class _ModelBuilder:
         self._tie_problem(criterias)
     
     def _build_pcm(self, item):
-        item.create_pcm()
-        for child in item.get_children():
-            self._build_pcm(child)
+        for node in item.iter_preorder(alternatives=False):
+            node.create_pcm()
     
     
     def _tie_criterias(self, criterias):
-        """Tie the criteria with their children and alternatives."""
-        if not criterias:
-            return
-        
-        for criteria_dict in criterias:
-            for parent_criteria, criteria_list in criteria_dict.items():
-                if criteria_list is None:
-                    self._tie_alternatives(parent_criteria)
-                else:
-                    self._tie_criterias_with_parrent(parent_criteria, criteria_list)
-                    self._tie_criterias(criteria_list)
+        """Tie the criteria with their children and alternatives, in the pre-order of the hierarchy."""
+        stack = [self._iter_items(criterias)]
+        while stack:
+            item = next(stack[-1], None)
+            if item is None:
+                stack.pop()
+                continue
+            
+            (parent_criteria, criteria_list) = item
+            self.criteria_index.setdefault(parent_criteria.get_key(), parent_criteria)
+            if criteria_list is None:
+                self._tie_alternatives(parent_criteria)
+            else:
+                self._tie_criterias_with_parrent(parent_criteria, criteria_list)
+                stack.append(self._iter_items(criteria_list))
+    
+    
+    def _iter_items(self, criterias):
+        """Iterate over the (criteria, children) items of the list of dicts."""
+        return (item for criteria_dict in criterias for item in criteria_dict.items())
     
     
     def _tie_alternatives(self, criteria):
@@ -0,0 +1,127 @@
+import numpy as np
+from anahiepro.nodes import Criteria
+
+
+class _ParentArrayBuilder:
+    """
+    Build the hierarchy of a model from the parent index of every criteria.
+
+    The arrays are checked by one vectorized pass and the nodes are tied in
+    one traversal, without copying the criterias, recalculating their depths
+    or checking the type of every child as `add_child` does.
+    """
+    def __init__(self, problem, names, parents, alternatives):
+        self.problem = problem
+        self.names = names
+        self.alternatives = alternatives
+        self.parents = self._validate_parents(names, parents)
+        self.criterias = []
+        self.criteria_index = {}
+
+
+    def build(self):
+        """Create the criterias, tie them with the problem and the alternatives and create the PCMs."""
+        nodes = [Criteria(name) for name in self.names]
+        nodes_num = len(nodes)
+
+        # The children of the problem go first, the ones of the criteria `i` are the bucket i + 1.
+        children_offsets = np.concatenate(([0], np.cumsum(np.bincount(self.parents + 1, minlength=nodes_num + 1)))).tolist()
+        children = np.argsort(self.parents, kind="stable").tolist()
+
+        self._tie(self.problem, [nodes[index] for index in children[children_offsets[0]:children_offsets[1]]])
+        stack = [(index, self.criterias) for index in reversed(children[children_offsets[0]:children_offsets[1]])]
+        while stack:
+            (index, container) = stack.pop()
+            node = nodes[index]
+            self.criteria_index[node.get_key()] = node
+
+            (start, stop) = (children_offsets[index + 1], children_offsets[index + 2])
+            if start == stop:
+                container.append({node: None})
+                self._tie(node, self.alternatives)
+            else:
+                criteria_list = []
+                container.append({node: criteria_list})
+                self._tie(node, [nodes[child] for child in children[start:stop]])
+                stack.extend((child, criteria_list) for child in reversed(children[start:stop]))
+
+
+    def get_criterias(self):
+        """Return the criterias in the list of dicts structure of the other builders."""
+        return self.criterias
+
+
+    def get_criteria_index(self):
+        """Return the criteria keyed by their (name, id) in the pre-order of the hierarchy."""
+        return self.criteria_index
+
+
+    def _tie(self, parent, children):
+        """Tie the children with the parent and create its PCM."""
+        if not children:
+            children = self.alternatives
+        parent._children.extend(children)
+        for child in children:
+            child._parents.append(parent)
+        parent.create_pcm()
+
+
+    def _validate_parents(self, names, parents):
+        """
+        Check that the parents describe a tree under the problem.
+
+        Raises
+        ------
+        ValueError
+            If the parents are not the indexes of the criterias or -1 for the problem, or there is a cycle.
+        """
+        parents = np.asarray(parents)
+        if parents.ndim != 1 or len(parents) != len(names):
+            raise ValueError("The parents must be a one-dimensional array with an index for each name.")
+        if len(parents) and not np.issubdtype(parents.dtype, np.integer):
+            raise ValueError("The parents must be integer indexes.")
+        parents = parents.astype(np.intp, copy=False)
+        if np.any((parents < -1) | (parents >= len(parents))):
+            raise ValueError("The parents must be the indexes of the criterias, or -1 for the problem.")
+
+        _get_depths(parents)  # Every criteria has a depth only if it is connected to the problem.
+        return parents
+
+
+def _get_depths(parents):
+    """
+    Calculate the depth of every criteria by pointer jumping.
+
+    Every round adds the depth of the node each criteria points to and makes it
+    point twice as far, so log2(n) rounds of vectorized operations reach the problem.
+
+    Parameters
+    ----------
+    parents : numpy.ndarray
+        The index of the parent of each criteria, -1 for the problem.
+
+    Returns
+    -------
+    numpy.ndarray
+        The depth of each criteria, 1 for the children of the problem.
+
+    Raises
+    ------
+    ValueError
+        If some criterias do not reach the problem, so they are in a cycle.
+    """
+    nodes_num = len(parents)
+    # The problem is the extra node `nodes_num`, which points to itself and has the depth 0.
+    pointers = np.append(np.where(parents < 0, nodes_num, parents), nodes_num)
+    depths = np.ones(nodes_num + 1, dtype=np.intp)
+    depths[-1] = 0
+
+    for _ in range(max(nodes_num, 1).bit_length() + 1):
+        if np.all(pointers == nodes_num):
+            break
+        depths += depths[pointers]
+        pointers = pointers[pointers]
+
+    if np.any(pointers != nodes_num):
+        raise ValueError("The hierarchy must be a tree, some criterias are not connected to the problem.")
+    return depths[:-1]
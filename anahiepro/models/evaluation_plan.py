@@ -0,0 +1,144 @@
+import numpy as np
+from anahiepro.nodes import Alternative
+from anahiepro.pairwise import _refresh_eigen_results
+
+
+class EvaluationPlan:
+    """
+    A flat, array-backed form of a model which solves it without walking the nodes.
+
+    The nodes (except of alternatives) are numbered in the level order, so the
+    children of every node occupy a contiguous range of indexes. The local
+    priority vectors of all nodes are kept in one contiguous float64 buffer
+    and the global vectors in a (nodes, alternatives) buffer, so `solve` is a
+    loop of in-place matrix-vector products over precomputed views.
+
+    The structure of the plan is immutable. When the judgments change, call
+    `refresh` to reload the local priorities; when the hierarchy changes,
+    compile the model again.
+    """
+    def __init__(self, model):
+        """
+        Compile the model into a plan.
+
+        Parameters
+        ----------
+        model : Model
+            The model to compile.
+        """
+        self._model = model
+        self._nodes = self._number_nodes(model.get_problem())
+        alternatives_num = len(model.get_alternatives())
+
+        children_nums = [0 if self._is_leaf(node) else len(node.get_children()) for node in self._nodes]
+        self.child_offsets = self._read_only(np.concatenate(([1], 1 + np.cumsum(children_nums))))
+        self.leaves = self._read_only(np.array([self._is_leaf(node) for node in self._nodes], dtype=bool))
+
+        sizes = [alternatives_num if leaf else children_num for leaf, children_num in zip(self.leaves, children_nums)]
+        self.offsets = self._read_only(np.concatenate(([0], np.cumsum(sizes))))
+        self.order = self._read_only(np.flatnonzero(~self.leaves)[::-1])  # The children go before their parent.
+
+        self.priorities = np.zeros(self.offsets[-1])
+        self._global_vectors = np.zeros((len(self._nodes), alternatives_num))
+        self._local_vectors = [self.priorities[start:stop] for start, stop in zip(self.offsets[:-1], self.offsets[1:])]
+        self._steps = tuple((self._local_vectors[index],
+                             self._global_vectors[self.child_offsets[index]:self.child_offsets[index + 1]],
+                             self._global_vectors[index]) for index in self.order)
+
+        self._result = self._global_vectors[0].view()
+        self._result.flags.writeable = False
+        self.refresh()
+
+
+    def _number_nodes(self, problem):
+        """
+        Number the problem and the criteria in the level order.
+
+        Parameters
+        ----------
+        problem : Problem
+            The root of the hierarchy.
+
+        Returns
+        -------
+        tuple
+            The nodes, each node's children are placed one after another.
+        """
+        nodes = [problem]
+        index = 0
+        while index < len(nodes):
+            node = nodes[index]
+            if not self._is_leaf(node):
+                nodes.extend(node.get_children())
+            index += 1
+        return tuple(nodes)
+
+
+    def _is_leaf(self, node):
+        """
+        Check if the children of the node are alternatives.
+        """
+        return not node.get_children() or isinstance(node.get_children()[0], Alternative)
+
+
+    def _read_only(self, array):
+        array.flags.writeable = False
+        return array
+
+
+    def refresh(self):
+        """
+        Reload the local priority vectors of the nodes into the buffer.
+
+        Only the PCMs which changed since their last decomposition are decomposed again.
+
+        Raises
+        ------
+        ValueError
+            If the shape of a node's PCM does not match the compiled hierarchy.
+        """
+        self._model._apply_priority_method(self._nodes)
+        self._model._refresh_leaf_eigen_results()
+        _refresh_eigen_results(node.pcm for node in self._nodes)
+
+        for index, (node, local_vector) in enumerate(zip(self._nodes, self._local_vectors)):
+            priority_vector = node.pcm._eigen.priority_vector
+            if priority_vector.shape != local_vector.shape:
+                raise ValueError(f"The PCM of '{node.get_name()}' does not match the compiled hierarchy, compile the model again.")
+
+            if self.leaves[index]:
+                local_vector[:] = priority_vector
+                self._global_vectors[index] = priority_vector
+            else:
+                np.abs(priority_vector, out=local_vector)
+
+
+    def solve(self):
+        """
+        Calculate the global priority vector from the buffered local priorities.
+
+        Returns
+        -------
+        numpy.ndarray
+            The read-only global priority vector. It is overwritten by the next
+            call, so copy it if it has to be kept.
+        """
+        for local_vector, children_global_vectors, global_vector in self._steps:
+            np.dot(local_vector, children_global_vectors, out=global_vector)
+        return self._result
+
+
+    def get_nodes(self):
+        """
+        Get the nodes of the plan.
+
+        Returns
+        -------
+        tuple
+            The nodes in the order of their indexes.
+        """
+        return self._nodes
+
+
+    def __len__(self):
+        return len(self._nodes)
@@ -1,11 +1,17 @@
 from anahiepro.models._criterias_builders._wrapper_criteria_builder import _WrapperCriteriaBuilder
-from anahiepro.nodes import Problem, Criteria, Alternative
+from anahiepro.nodes import Problem, Alternative
 from anahiepro.models._model_builder import _ModelBuilder
+from anahiepro.models._parent_array_builder import _ParentArrayBuilder
+from anahiepro.models.evaluation_plan import EvaluationPlan
+from anahiepro.models.sensitivity import analyze_sensitivity
+from anahiepro.pairwise import _EigenResult, _decompose, _decompose_packed, _refresh_eigen_results, validate_matrices
+from anahiepro.priority_methods import get_priority_method
 import numpy as np
 
 
 class Model:
-    def __init__(self, problem: Problem, criterias, alternatives: list):
+    def __init__(self, problem: Problem, criterias, alternatives: list, priority_method=None, leaf_dtype=np.float64,
+                 packed_leaves=False):
         """
         Initialize the model with a problem, criteria, and alternatives.
         
@@ -17,6 +23,15 @@ class Model:
             The criteria for the model.
         alternatives : list
             A list of alternatives.
+        priority_method : str or PriorityMethod, optional
+            The method used to calculate the priority vectors of the nodes which
+            do not have their own method (default is the 'eig' method).
+        leaf_dtype : numpy.dtype, optional
+            The type of the items of the matrices which compare the alternatives,
+            np.float32 halves their memory (default is np.float64).
+        packed_leaves : bool, optional
+            Whether to keep only the log-judgments above the diagonal of the matrices
+            which compare the alternatives, which more than halves their memory (default is False).
         
         Raises
         ------
@@ -25,10 +40,95 @@ class Model:
         """
         self.problem = self._validate_problem(problem)
         self.alternatives = self._validate_alternatives(alternatives)
-        self.criterias = _WrapperCriteriaBuilder(criterias).build_criterias()
+        self.criterias = self._build_criterias(_WrapperCriteriaBuilder(criterias))
         
         builder = _ModelBuilder(self.problem, self.criterias, self.alternatives)
         builder.build()
+        self._set_up(builder, priority_method, leaf_dtype, packed_leaves)
+    
+    
+    @classmethod
+    def from_parents(cls, problem: Problem, names, parents, alternatives: list, priority_method=None,
+                     leaf_dtype=np.float64, packed_leaves=False):
+        """
+        Build the model from the parent index of every criteria.
+        
+        The arrays are checked by one vectorized pass and the hierarchy is built
+        by one traversal, which is much faster than nesting the criterias for
+        models with thousands of them.
+        
+        Parameters
+        ----------
+        problem : Problem
+            The problem instance.
+        names : sequence of str
+            The names of the criterias, each one gets a new `Criteria` in this order.
+        parents : array_like of int
+            The index of the parent of each criteria in `names`, -1 for the children
+            of the problem. The children of a node keep the order of `names`.
+        alternatives : list
+            A list of alternatives, tied to the criterias without children.
+        priority_method : str or PriorityMethod, optional
+            The method used to calculate the priority vectors of the nodes (default is the 'eig' method).
+        leaf_dtype : numpy.dtype, optional
+            The type of the items of the matrices which compare the alternatives (default is np.float64).
+        packed_leaves : bool, optional
+            Whether to keep only the packed log-judgments of the matrices which compare the alternatives (default is False).
+        
+        Returns
+        -------
+        Model
+            The model.
+        
+        Raises
+        ------
+        TypeError
+            If the problem or the alternatives are invalid.
+        ValueError
+            If the parents do not describe a tree under the problem.
+        """
+        model = cls.__new__(cls)
+        model.problem = model._validate_problem(problem)
+        model.alternatives = model._validate_alternatives(alternatives)
+        
+        builder = _ParentArrayBuilder(model.problem, names, parents, model.alternatives)
+        builder.build()
+        model.criterias = builder.get_criterias()
+        model._set_up(builder, priority_method, leaf_dtype, packed_leaves)
+        return model
+    
+    
+    def _set_up(self, builder, priority_method, leaf_dtype, packed_leaves):
+        """
+        Take the criteria index of the built hierarchy, share the leaf matrices and set the priority method.
+        """
+        self._criteria_index = builder.get_criteria_index()
+        nodes = self._get_nodes_with_pcm()
+        self._share_leaf_judgments(nodes, leaf_dtype, packed_leaves)
+        
+        self.priority_method = get_priority_method(priority_method)
+        self._apply_priority_method(nodes)
+    
+    
+    def _build_criterias(self, builder):
+        """
+        Build the criterias in the list of dicts structure.
+        
+        The leaves might have different depths: the global vector of every node
+        is composed from the global vectors of its children, whatever their depths are.
+        
+        Parameters
+        ----------
+        builder : _WrapperCriteriaBuilder
+            The builder of the given criterias.
+        
+        Returns
+        -------
+        list
+            The built criterias.
+        """
+        builder.not_throw_exception_while_build()
+        return builder.build_criterias()
     
     
     def _validate_problem(self, problem):
@@ -107,73 +207,115 @@ class Model:
         return self.alternatives
     
     
-    def get_criterias_name_ids(self):
+    def _share_leaf_judgments(self, nodes, dtype, packed):
         """
-        Get the names and IDs of the criteria.
+        Move the matrices of the leaves, which compare the alternatives, into one array.
+        
+        The array has shape (leaves, m, m), or (leaves, m * (m - 1) / 2) for
+        the packed log-judgments. The PCMs of the leaves keep views into the
+        array, so all of them are decomposed by one batched call without
+        stacking them first.
+        
+        Parameters
+        ----------
+        nodes : list
+            The nodes which have a PCM.
+        dtype : numpy.dtype
+            The type of the items of the array.
+        packed : bool
+            Whether to keep the packed log-judgments.
+        """
+        self._leaf_nodes = [node for node in nodes
+                            if not node._children or isinstance(node._children[0], Alternative)]
+        self._packed_leaves = packed
+        alternatives_num = len(self.alternatives)
+        shape = (alternatives_num * (alternatives_num - 1) // 2,) if packed else (alternatives_num, alternatives_num)
+        self._leaf_judgments = np.empty((len(self._leaf_nodes),) + shape, dtype=dtype)
+        for node, storage in zip(self._leaf_nodes, self._leaf_judgments):
+            node.pcm._set_packed(packed)
+            node.pcm._share(storage)
+    
+    
+    def get_leaf_judgments(self):
+        """
+        Get the matrices which compare the alternatives under each leaf criteria.
         
         Returns
         -------
         tuple
-            A tuple of criteria names and IDs.
+            The (name, id) keys of the leaves and the array with shape (leaves, m, m),
+            or (leaves, m * (m - 1) / 2) for the packed log-judgments, the PCMs of
+            the leaves are views into. Changing the array in place bypasses the
+            cached results, so use `load_judgments` for that.
         """
-        return tuple(self._get_around_and_collect_name_ids(self.criterias))
+        return tuple(node.get_key() for node in self._leaf_nodes), self._leaf_judgments
     
     
-    def _get_around_and_collect_name_ids(self, criterias):
+    def _refresh_leaf_eigen_results(self):
         """
-        Collect the names and IDs of the criteria recursively.
-        
-        Parameters
-        ----------
-        criterias : list
-            The list of criteria to collect names and IDs from.
+        Decompose the matrices of all the leaves by one call over the shared array.
         
-        Returns
-        -------
-        list
-            A list of criteria names and IDs.
+        It is only done when none of the leaves has a cached result, all of
+        them use the same method and still view the shared array; otherwise
+        `_refresh_eigen_results` handles them one group at a time.
         """
-        criterias_name_ids = []
+        pcms = [node.pcm for node in self._leaf_nodes]
+        if not pcms:
+            return
         
-        for criteria_dict in criterias:
-            for parent_criteria, criteria_list in criteria_dict.items():
-                self._add_criteria_name_id(criterias_name_ids, parent_criteria)
-                if criteria_list and not self._is_list_empty_or_has_instance_of_Alternative(criteria_list):
-                    criterias_name_ids.extend(self._get_around_and_collect_name_ids(criteria_list))
+        priority_method = pcms[0].priority_method
+        for pcm in pcms:
+            if pcm._eigen is not None or pcm._last_eigen is not None or not pcm._shared \
+                    or pcm.priority_method is not priority_method:
+                return
         
-        return criterias_name_ids
-    
+        if self._packed_leaves:
+            results = _decompose_packed(self._leaf_judgments, len(self.alternatives), priority_method)
+        else:
+            results = _decompose(self._leaf_judgments, priority_method)
+        for pcm, eigen in zip(pcms, zip(*results)):
+            pcm._eigen = _EigenResult(*eigen)
     
     
-    def _is_list_empty_or_has_instance_of_Alternative(self, what):
+    def set_priority_method(self, priority_method):
         """
-        Check if the list is empty or contains instances of Alternative.
+        Set the method used to calculate the priority vectors.
+        
+        The nodes which have their own method (see `Node.set_priority_method`) keep it.
         
         Parameters
         ----------
-        what : list
-            The list to check.
-        
-        Returns
-        -------
-        bool
-            True if the list is empty or contains instances of Alternative, False otherwise.
+        priority_method : str or PriorityMethod
+            The name of the method ('eig', 'power_iteration', 'geometric_mean', 'llsm',
+            'harker' or 'additive_normalization') or the method instance.
         """
-        return what is None or (isinstance(what, list) and len(what) > 0 and isinstance(what[0], Alternative))
+        self.priority_method = get_priority_method(priority_method)
+        self._apply_priority_method(self._get_nodes_with_pcm())
     
     
-    def _add_criteria_name_id(self, where: list, criteria: Criteria):
+    def _apply_priority_method(self, nodes):
         """
-        Add the criteria name and ID to the specified list.
+        Set the priority method of the model to the PCMs of the nodes without their own method.
         
         Parameters
         ----------
-        where : list
-            The list to add the criteria name and ID to.
-        criteria : Criteria
-            The criteria to add.
+        nodes : list
+            The nodes which have a PCM.
+        """
+        for node in nodes:
+            node.pcm.priority_method = node.get_priority_method() or self.priority_method
+    
+    
+    def get_criterias_name_ids(self):
+        """
+        Get the names and IDs of the criteria.
+        
+        Returns
+        -------
+        tuple
+            A tuple of criteria names and IDs.
         """
-        where.append((criteria._name, criteria._id))
+        return tuple(self._criteria_index)
     
     
     def _is_key_correct(self, key):
@@ -219,7 +361,7 @@ class Model:
             If the criteria is not found.
         """
         if self._is_key_correct(key):
-            criteria = self._find_criteria(key, self.criterias)
+            criteria = self._criteria_index.get(key)
             if criteria is None:
                 raise ValueError(f"The Criteria with key ({key[0]}, {key[1]}) not found.")
             return criteria
@@ -227,48 +369,155 @@ class Model:
             raise KeyError
     
     
-    def _find_criteria(self, key: tuple, criterias):
+    def attach_criteria_pcm(self, key: tuple, pcm):
         """
-        Recursive method to find criteria.
+        Attach a pairwise comparison matrix to the criteria identified by the key.
         
         Parameters
         ----------
         key : tuple
-            The (name, id) tuple of the criteria to find.
-        criterias : list
-            The list of criteria to search in.
+            The (name, id) tuple of the criteria.
+        pcm : array_like
+            The pairwise comparison matrix to attach.
+        """
+        criteria = self.find_criteria(key)
+        criteria.set_matrix(np.array(pcm))
+    
+    
+    def attach_pcms(self, mapping, validate=True):
+        """
+        Attach pairwise comparison matrices to many nodes at once.
+        
+        The matrices are grouped by their size and each group is copied into one
+        contiguous array and validated by one vectorized call. Nothing is attached
+        if any matrix is invalid.
+        
+        Parameters
+        ----------
+        mapping : dict
+            The matrices keyed by the (name, id) tuples of the criteria or of the problem.
+        validate : bool, optional
+            Whether to check the matrices, pass False only for trusted data (default is True).
+        
+        Raises
+        ------
+        KeyError
+            If a key is not valid.
+        ValueError
+            If a node is not found, the shape of a matrix does not match or a matrix is not valid.
+        """
+        groups = {}
+        for key, pcm in mapping.items():
+            matrix = np.asarray(pcm, dtype=float)
+            (keys, matrices) = groups.setdefault(matrix.shape, ([], []))
+            keys.append(key)
+            matrices.append(matrix)
+        
+        self._load_groups([(keys, np.stack(matrices)) for (keys, matrices) in groups.values()], validate)
+    
+    
+    def load_judgments(self, bundle, validate=True):
+        """
+        Load the matrices of the hierarchy from stacked arrays.
+        
+        Parameters
+        ----------
+        bundle : dict
+            The groups of the matrices in the format returned by `get_judgments`:
+            every value is a (keys, matrices) pair, where `keys` are the (name, id)
+            tuples of N nodes and `matrices` is an array with shape (N, n, n).
+        validate : bool, optional
+            Whether to check the matrices, pass False only for trusted data (default is True).
+        
+        Raises
+        ------
+        KeyError
+            If a key is not valid.
+        ValueError
+            If a node is not found, the shape of a matrix does not match or a matrix is not valid.
+        """
+        groups = []
+        for keys, matrices in bundle.values():
+            matrices = np.array(matrices, dtype=float)
+            if matrices.ndim != 3 or matrices.shape[0] != len(keys):
+                raise ValueError("The matrices of a group must be stacked into an array with shape (len(keys), n, n).")
+            groups.append((list(keys), matrices))
+        
+        self._load_groups(groups, validate)
+    
+    
+    def get_judgments(self):
+        """
+        Get the matrices of the problem and all criteria grouped by their size.
         
         Returns
         -------
-        Criteria
-            The found criteria, or None if not found.
-        """
-        for criteria_dict in criterias:
-            for parent_criteria, criteria_list in criteria_dict.items():
-                if parent_criteria.compare(key):
-                    return parent_criteria
-                
-                if criteria_list is not None:
-                    found_criteria = self._find_criteria(key, criteria_list)
-                    if found_criteria is not None:
-                        return found_criteria
-        return None
+        dict
+            The (keys, matrices) pairs keyed by the size of the matrices, where `keys`
+            is a tuple of the (name, id) tuples and `matrices` is an array with
+            shape (len(keys), size, size).
+        """
+        groups = {}
+        for node in [self.problem, *self._criteria_index.values()]:
+            (keys, matrices) = groups.setdefault(node.pcm.size, ([], []))
+            keys.append(node.get_key())
+            matrices.append(node.pcm.matrix)
+        
+        return {size: (tuple(keys), np.array(matrices, dtype=float)) for size, (keys, matrices) in groups.items()}
     
     
+    def _load_groups(self, groups, validate):
+        """
+        Attach the stacked matrices to the nodes.
+        
+        All the groups are checked before anything is attached. The PCMs of the
+        nodes become views into the stacked arrays, except of the leaves, whose
+        matrices are copied into the shared array of the leaves.
+        
+        Parameters
+        ----------
+        groups : list
+            The (keys, matrices) pairs, where `matrices` is an array with shape (len(keys), n, n).
+        validate : bool
+            Whether to check the matrices.
+        """
+        resolved_groups = []
+        for keys, matrices in groups:
+            nodes = [self._find_node(key) for key in keys]
+            for key, node in zip(keys, nodes):
+                if not node.pcm:
+                    node.create_pcm()
+                if matrices.shape[1:] != (node.pcm.size, node.pcm.size):
+                    raise ValueError(f"The shape of matrix for ({key[0]}, {key[1]}) do not match.")
+            
+            if validate:
+                failures = [f"({key[0]}, {key[1]}): {reason}" for key, reason in zip(keys, validate_matrices(matrices)) if reason]
+                if failures:
+                    raise ValueError("Matrices are not consistent or not valid pairwise comparison matrices:\n" + "\n".join(failures))
+            resolved_groups.append((nodes, matrices))
+        
+        for nodes, matrices in resolved_groups:
+            for node, matrix in zip(nodes, matrices):
+                node.pcm._try_to_set_matrix(matrix, validate=False)
+    
     
-    def attach_criteria_pcm(self, key: tuple, pcm):
+    def _find_node(self, key: tuple):
         """
-        Attach a pairwise comparison matrix to the criteria identified by the key.
+        Find the problem or the criteria by (name, id) tuple.
         
         Parameters
         ----------
         key : tuple
-            The (name, id) tuple of the criteria.
-        pcm : array_like
-            The pairwise comparison matrix to attach.
+            The (name, id) tuple of the node to find.
+        
+        Returns
+        -------
+        Node
+            The found node.
         """
-        criteria = self.find_criteria(key)
-        criteria.set_matrix(np.array(pcm))
+        if self._is_key_correct(key) and self.problem.compare(key):
+            return self.problem
+        return self.find_criteria(key)
     
     
     def __getitem__(self, key: tuple):
@@ -302,20 +551,20 @@ class Model:
         numpy.ndarray or list
             The global priority vector, or a list of (alternative, value) tuples if showAlternatives is True.
         """
-        def calculate_global_vector(node):
+        stale_nodes = self._get_stale_nodes()
+        self._apply_priority_method(node for node in stale_nodes if node.pcm)
+        self._refresh_leaf_eigen_results()
+        _refresh_eigen_results(node.pcm for node in stale_nodes if node.pcm)
+        
+        for node in reversed(stale_nodes):  # The children are placed after their parent.
+            priority_vector = node.pcm._eigen.priority_vector if node.pcm else None
             if not node._children or isinstance(node._children[0], Alternative):
-                return node.get_priority_vector()
-
-            children_global_vectors = []
-            for child in node._children:
-                children_global_vectors.append(calculate_global_vector(child))
-            
-            matrix = np.column_stack(children_global_vectors)
-            parrent_vector = np.abs(node.get_priority_vector())
-            global_vector = matrix.dot(parrent_vector)
-            return global_vector
-
-        global_vector = calculate_global_vector(self.problem)
+                node._global_vector = priority_vector
+            else:
+                matrix = np.column_stack([child._global_vector for child in node._children])
+                node._global_vector = matrix.dot(np.abs(priority_vector))
+        
+        global_vector = np.array(self.problem._global_vector)
         
         if showAlternatives:
             return [(alternative, value) for (alternative, value) in zip(self.alternatives, global_vector)]
@@ -323,6 +572,101 @@ class Model:
         return global_vector
     
     
+    def compile(self):
+        """
+        Compile the model into a flat array-backed evaluation plan.
+        
+        The plan solves the model by a loop of in-place matrix-vector products
+        without recursion and allocations, which pays off when the model is
+        solved many times. Call `refresh` on the plan after changing the judgments.
+        
+        Returns
+        -------
+        EvaluationPlan
+            The compiled plan.
+        """
+        return EvaluationPlan(self)
+    
+    
+    def analyze_sensitivity(self, samples=10000, distribution="lognormal", spread=None, chunk_size=1000, workers=None, seed=None):
+        """
+        Estimate the rank stability of the alternatives under the uncertainty of the judgments.
+        
+        See `anahiepro.models.sensitivity.analyze_sensitivity` for the parameters.
+        
+        Returns
+        -------
+        SensitivityResult
+            How often each alternative had each rank, and the mean and the
+            standard deviation of its global priority.
+        """
+        return analyze_sensitivity(self, samples, distribution, spread, chunk_size, workers, seed)
+    
+    
+    def _get_stale_nodes(self):
+        """
+        Collect the nodes which do not have a cached global vector.
+        
+        A node with the cached vector is not visited further, because its whole
+        subtree is up to date. Only the changed nodes and their ancestors are
+        collected after a single change, so solving the model again costs
+        O(depth) instead of O(tree).
+        
+        Returns
+        -------
+        list
+            The stale nodes, each parent is placed before its children.
+        """
+        stale_nodes = []
+        stack = [self.problem]
+        while stack:
+            node = stack.pop()
+            if node._global_vector is not None:
+                continue
+            stale_nodes.append(node)
+            stack.extend(child for child in node._children if not isinstance(child, Alternative))
+        return stale_nodes
+    
+    
+    def _get_nodes_with_pcm(self):
+        """
+        Collect the problem and all criteria which have a pairwise comparison matrix.
+        
+        Returns
+        -------
+        list
+            The nodes of the hierarchy in the pre-order, except of alternatives.
+        """
+        return [node for node in self.problem.iter_preorder(alternatives=False) if node.pcm]
+    
+    
+    def iter_preorder(self, alternatives=True, with_depth=False):
+        """
+        Iterate over the problem and the criterias, each node before its children.
+        
+        See `Node.iter_preorder` for the parameters.
+        """
+        return self.problem.iter_preorder(alternatives, with_depth)
+    
+    
+    def iter_postorder(self, alternatives=True):
+        """
+        Iterate over the problem and the criterias, each node after its children.
+        
+        See `Node.iter_postorder` for the parameters.
+        """
+        return self.problem.iter_postorder(alternatives)
+    
+    
+    def iter_levels(self, alternatives=True):
+        """
+        Iterate over the levels of the hierarchy, from the problem down.
+        
+        See `Node.iter_levels` for the parameters.
+        """
+        return self.problem.iter_levels(alternatives)
+    
+    
     def show(self):
         """
         Display the problem.
@@ -0,0 +1,70 @@
+from concurrent.futures import ProcessPoolExecutor
+from anahiepro.models._compact_model import _compact_model, _matrices, _decompose_groups, _compose
+
+
+def solve_many(models, workers=None, chunk_size=None):
+    """
+    Solve many independent models, optionally across a pool of processes.
+
+    Each model is sent as a snapshot of plain arrays (the matrices, the
+    priority methods and the child offsets of its hierarchy), so no nodes
+    are pickled and no nodes are built in the workers. The matrices of the
+    same size and priority method of all the models in a chunk are
+    decomposed together by one batched call.
+
+    The models are not changed, so their cached results are not updated.
+
+    Parameters
+    ----------
+    models : iterable of Model
+        The models to solve.
+    workers : int, optional
+        The number of the processes (default is to solve the models in this process).
+    chunk_size : int, optional
+        The number of the models sent to a worker at once (default is to give
+        each worker about four chunks).
+
+    Returns
+    -------
+    list of numpy.ndarray
+        The global priority vector of each model, in the order of the models.
+
+    Raises
+    ------
+    ValueError
+        If the number of the workers or the chunk size is not positive.
+    """
+    if (workers is not None and workers < 1) or (chunk_size is not None and chunk_size < 1):
+        raise ValueError("The number of the workers and the chunk size must be positive.")
+
+    compact_models = [_compact_model(model) for model in models]
+    if workers is None or workers == 1 or len(compact_models) < 2:
+        return _solve_compact_models(compact_models)
+
+    if chunk_size is None:
+        chunk_size = max(1, -(-len(compact_models) // (4 * workers)))
+    chunks = [compact_models[start:start + chunk_size] for start in range(0, len(compact_models), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return [global_vector for chunk in executor.map(_solve_compact_models, chunks) for global_vector in chunk]
+
+
+def _solve_compact_models(compact_models):
+    """
+    Solve the snapshots of the models.
+
+    Returns
+    -------
+    list of numpy.ndarray
+        The global priority vector of each model.
+    """
+    matrices = [matrix[None] for compact in compact_models for matrix in _matrices(compact)]
+    methods = [method for compact in compact_models for method in compact.methods]
+    local_vectors = _decompose_groups(matrices, methods)
+
+    global_vectors = []
+    start = 0
+    for compact in compact_models:
+        stop = start + len(compact.sizes)
+        global_vectors.append(_compose(compact, local_vectors[start:stop])[0])
+        start = stop
+    return global_vectors
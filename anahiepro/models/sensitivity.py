@@ -0,0 +1,217 @@
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import anahiepro.constants as const
+from anahiepro._log_space import _upper_triangle_indices
+from anahiepro.models._compact_model import _compact_model, _matrices, _compose
+
+
+DISTRIBUTIONS = ("lognormal", "uniform")
+DEFAULT_SPREADS = {"lognormal": 0.1, "uniform": 1.0}
+
+
+class SensitivityResult:
+    """
+    Summary statistics of the global priorities over the perturbed judgments.
+
+    The statistics are accumulated chunk by chunk, so they take O(m^2) memory
+    for m alternatives whatever the number of samples is.
+
+    Attributes
+    ----------
+    alternatives : tuple of str
+        The names of the alternatives.
+    samples : int
+        The number of the samples.
+    rank_counts : numpy.ndarray
+        The (m, m) array, rank_counts[a, r] is how many times the alternative `a` had the rank `r` (0 is the first).
+    mean : numpy.ndarray
+        The mean global priority of each alternative.
+    """
+    def __init__(self, alternatives):
+        """
+        Initialize empty statistics.
+
+        Parameters
+        ----------
+        alternatives : sequence of str
+            The names of the alternatives.
+        """
+        self.alternatives = tuple(alternatives)
+        alternatives_num = len(self.alternatives)
+        self.samples = 0
+        self.rank_counts = np.zeros((alternatives_num, alternatives_num), dtype=np.int64)
+        self.mean = np.zeros(alternatives_num)
+        self._squares = np.zeros(alternatives_num)  # The sums of the squared deviations from the mean.
+
+
+    def _update(self, global_vectors):
+        """
+        Add the global priority vectors of a chunk of samples, with shape (S, m).
+        """
+        chunk = SensitivityResult(self.alternatives)
+        (samples, alternatives_num) = global_vectors.shape
+        ranks = np.argsort(np.argsort(-global_vectors, axis=1, kind="stable"), axis=1)
+        cells = np.arange(alternatives_num) * alternatives_num + ranks
+        chunk.rank_counts = np.bincount(cells.ravel(), minlength=alternatives_num ** 2).reshape(alternatives_num, -1)
+        chunk.samples = samples
+        chunk.mean = global_vectors.mean(axis=0)
+        chunk._squares = ((global_vectors - chunk.mean) ** 2).sum(axis=0)
+        self._merge(chunk)
+
+
+    def _merge(self, other):
+        """
+        Merge the statistics of other samples into these ones (Chan's parallel variance update).
+        """
+        samples = self.samples + other.samples
+        if samples == 0:
+            return
+        delta = other.mean - self.mean
+        self.mean = self.mean + delta * (other.samples / samples)
+        self._squares = self._squares + other._squares + delta ** 2 * (self.samples * other.samples / samples)
+        self.rank_counts = self.rank_counts + other.rank_counts
+        self.samples = samples
+
+
+    @property
+    def std(self):
+        """
+        numpy.ndarray: The standard deviation of the global priority of each alternative.
+        """
+        return np.sqrt(self._squares / max(self.samples, 1))
+
+
+    @property
+    def rank_frequency(self):
+        """
+        numpy.ndarray: The (m, m) share of the samples where the alternative had the rank.
+        """
+        return self.rank_counts / max(self.samples, 1)
+
+
+    @property
+    def rank_first_frequency(self):
+        """
+        numpy.ndarray: The share of the samples where the alternative ranked first.
+        """
+        return self.rank_frequency[:, 0]
+
+
+    def __repr__(self):
+        frequencies = ", ".join(f"{name}: {frequency:.3f}" for name, frequency in zip(self.alternatives, self.rank_first_frequency))
+        return f"SensitivityResult(samples={self.samples}, rank_first_frequency={{{frequencies}}})"
+
+
+_SensitivityTask = namedtuple("_SensitivityTask", ["model", "distribution", "spread"])
+
+
+def analyze_sensitivity(model, samples=10000, distribution="lognormal", spread=None,
+                        chunk_size=1000, workers=None, seed=None):
+    """
+    Estimate the rank stability of the alternatives by the Monte Carlo simulation.
+
+    Every judgment a[i, j] (i < j) of every PCM of the model is perturbed
+    independently and a[j, i] is set to its reciprocal. The perturbed matrices
+    of a node are drawn as an (S, n, n) tensor and decomposed by one batched
+    call of the node's priority method, one node after another, so a chunk
+    only holds the tensor of one node and the (S, n) priority vectors of the
+    others. Then the global priorities of all the samples are composed at
+    once. The local priority vectors are taken by their absolute values, so
+    the ranking does not depend on the sign of the eigenvectors.
+
+    The samples are processed in chunks and only the summary statistics are
+    kept. Each chunk has its own random stream derived from the seed, so the
+    result does not depend on the number of workers.
+
+    Parameters
+    ----------
+    model : Model
+        The model with the judgments to perturb. It is not changed.
+    samples : int, optional
+        The number of the samples (default is 10000).
+    distribution : str, optional
+        'lognormal' multiplies each judgment by exp(N(0, spread)), 'uniform'
+        moves it uniformly within ±spread steps of the Saaty scale (default is 'lognormal').
+    spread : float, optional
+        The spread of the distribution (default is 0.1 for 'lognormal' and 1 for 'uniform').
+    chunk_size : int, optional
+        The number of the samples solved at once, the memory use is about
+        chunk_size * n^2 for the biggest matrix size n (default is 1000).
+    workers : int, optional
+        The number of the processes the chunks are spread across (default is to solve them in this process).
+    seed : int or numpy.random.SeedSequence, optional
+        The seed of the random numbers (default is a fresh entropy).
+
+    Returns
+    -------
+    SensitivityResult
+        The summary statistics of the samples.
+
+    Raises
+    ------
+    ValueError
+        If the distribution is unknown or the numbers of the samples, the chunk size or the workers are not positive.
+    """
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution '{distribution}'. Expected one of: {', '.join(DISTRIBUTIONS)}.")
+    if samples < 1 or chunk_size < 1 or (workers is not None and workers < 1):
+        raise ValueError("The numbers of the samples, the chunk size and the workers must be positive.")
+    if spread is None:
+        spread = DEFAULT_SPREADS[distribution]
+
+    task = _SensitivityTask(_compact_model(model), distribution, spread)
+    chunk_sizes = [chunk_size] * (samples // chunk_size) + ([samples % chunk_size] if samples % chunk_size else [])
+    seed_sequence = seed if isinstance(seed, np.random.SeedSequence) else np.random.SeedSequence(seed)
+    seeds = seed_sequence.spawn(len(chunk_sizes))
+
+    result = SensitivityResult(alternative.get_name() for alternative in model.get_alternatives())
+    if workers is None or workers == 1:
+        chunks = map(_run_chunk, [task] * len(chunk_sizes), chunk_sizes, seeds)
+        for chunk in chunks:
+            result._merge(chunk)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk in executor.map(_run_chunk, [task] * len(chunk_sizes), chunk_sizes, seeds):
+                result._merge(chunk)
+    return result
+
+
+def _run_chunk(task, samples, seed):
+    """
+    Solve one chunk of the perturbed models and summarize it.
+    """
+    rng = np.random.default_rng(seed)
+    # Only the perturbed matrices of one node are kept at a time, the other nodes keep their (S, n) vectors.
+    local_vectors = []
+    for (matrix, method) in zip(_matrices(task.model), task.model.methods):
+        (_, vectors) = method.calculate(_perturb(matrix, samples, task.distribution, task.spread, rng))
+        local_vectors.append(np.abs(vectors))
+
+    result = SensitivityResult([""] * task.model.alternatives_num)
+    result._update(_compose(task.model, local_vectors))
+    return result
+
+
+def _perturb(matrix, samples, distribution, spread, rng):
+    """
+    Draw the perturbed copies of a PCM as an (S, n, n) tensor.
+    """
+    size = matrix.shape[0]
+    (rows, cols) = _upper_triangle_indices(size)
+    judgments = matrix[rows, cols]
+
+    if distribution == "lognormal":
+        log_judgments = np.log(judgments) + rng.normal(0, spread, size=(samples, judgments.size))
+    else:
+        # The Saaty scale 1/9, ..., 1/2, 1, 2, ..., 9 is mapped to the steps -8, ..., 8.
+        steps = np.where(judgments >= 1, judgments - 1, 1 - 1 / judgments)
+        steps = steps + rng.uniform(-spread, spread, size=(samples, judgments.size))
+        steps = np.clip(steps, const.MIN_MARK - const.MAX_MARK, const.MAX_MARK - const.MIN_MARK)
+        log_judgments = np.where(steps >= 0, np.log1p(np.abs(steps)), -np.log1p(np.abs(steps)))
+
+    matrices = np.ones((samples, size, size))
+    matrices[:, rows, cols] = np.exp(log_judgments)
+    matrices[:, cols, rows] = np.exp(-log_judgments)
+    return matrices
+
@@ -1,16 +1,138 @@
-from pprint import pprint
+import numpy as np
 from anahiepro.models.model import Model
-from anahiepro.models._criterias_builders._wrapper_criteria_builder import _WrapperCriteriaBuilder
-from anahiepro.models._criteria_normalizers._criteria_normalizer import _CriteriaNormalizer
+from anahiepro.nodes import Alternative, Criteria, DummyCriteria
 
 
 class VaryDepthModel(Model):
-    def __init__(self, problem, criterias, alternatives):
-        builder = _WrapperCriteriaBuilder(criterias)
-        if not builder.has_same_depth():
-            criteria_normalizer = _CriteriaNormalizer(builder)
-            criterias = criteria_normalizer.get_normalized_criterias()
-        
-        super().__init__(problem, criterias, alternatives)
+    def __init__(self, problem, criterias, alternatives, priority_method=None, leaf_dtype=np.float64, packed_leaves=False):
+        super().__init__(problem, criterias, alternatives, priority_method, leaf_dtype, packed_leaves)
+
+
+    def _set_up(self, builder, priority_method, leaf_dtype, packed_leaves):
+        super()._set_up(builder, priority_method, leaf_dtype, packed_leaves)
+        self._pad_leaves()
+
+
+    def _pad_leaves(self):
+        """
+        Give the keys of the implicit DummyCriteria to the leaves shallower than the deepest one.
+
+        `Model` solves the hierarchy with the leaves of different depths as it is.
+        A dummy would have a 1x1 matrix and pass the vector of its child through
+        unchanged, so only the number of the dummies above each leaf is kept, for
+        `show` and the lookups. The dummies go between a leaf and its parent, as
+        the normalized hierarchy has them, and get their names and ids in the
+        pre-order, as if they were created.
+
+        Each dummy is numbered by its own counter, so the names are unique
+        (DummyCriteria0, DummyCriteria1, ...) and every dummy can be looked up
+        by its key. Before, all the dummies were named DummyCriteria0.
+        They share the id, the next free criteria id, as before.
+        """
+        leaves = []
+        stack = [(criteria_dict, 1) for criteria_dict in reversed(self.criterias)]
+        while stack:
+            (criteria_dict, depth) = stack.pop()
+            for parent_criteria, criteria_list in criteria_dict.items():
+                if criteria_list is None:
+                    leaves.append((parent_criteria, depth))
+                else:
+                    stack.extend((child_dict, depth + 1) for child_dict in reversed(criteria_list))
+
+        max_depth = max((depth for (_, depth) in leaves), default=0)
+        self._padding = {}
+        self._dummy_index = {}
+        for leaf, depth in leaves:
+            if depth == max_depth:
+                continue
+            keys = []
+            for _ in range(max_depth - depth):
+                keys.append(("DummyCriteria" + str(DummyCriteria._dummy_criteria_id), Criteria._criteria_id))
+                DummyCriteria._dummy_criteria_id += 1
+                self._dummy_index[keys[-1]] = leaf
+            self._padding[id(leaf)] = tuple(keys)
+        self._dummies = {}
+
+
+    def get_criterias_name_ids(self):
+        """
+        Get the names and IDs of the criteria, the implicit DummyCriteria included.
+
+        Returns
+        -------
+        tuple
+            A tuple of criteria names and IDs in the pre-order of the hierarchy.
+        """
+        if not self._padding:
+            return super().get_criterias_name_ids()
+
+        name_ids = []
+        for key, criteria in self._criteria_index.items():
+            name_ids.extend(self._padding.get(id(criteria), ()))
+            name_ids.append(key)
+        return tuple(name_ids)
+
+
+    def find_criteria(self, key: tuple):
+        """
+        Find criteria by (name, id) tuple.
+
+        An implicit DummyCriteria is created on the first lookup. It is linked to
+        the nodes around it, but it is not a child of its parent, and its 1x1
+        matrix does not take part in solving.
+
+        Parameters
+        ----------
+        key : tuple
+            The (name, id) tuple of the criteria to find.
+
+        Returns
+        -------
+        Criteria
+            The found criteria.
+        """
+        if self._is_key_correct(key) and key in self._dummy_index:
+            if key not in self._dummies:
+                self._create_dummies(self._dummy_index[key])
+            return self._dummies[key]
+        return super().find_criteria(key)
+
+
+    def _create_dummies(self, leaf):
+        """
+        Create the chain of the DummyCriteria above the leaf.
+        """
+        chain = [leaf.get_parents()[0]]
+        for name, dummy_id in self._padding[id(leaf)]:
+            dummy = DummyCriteria()
+            (dummy._name, dummy._id) = (name, dummy_id)
+            dummy._parents.append(chain[-1])
+            self._dummies[(name, dummy_id)] = dummy
+            chain.append(dummy)
         
-  
\ No newline at end of file
+        for dummy, child in zip(chain[1:], chain[2:] + [leaf]):
+            dummy._children.append(child)
+            dummy.create_pcm()
+
+
+    def show(self):
+        """
+        Display the problem, with the implicit DummyCriteria above the shallower leaves.
+
+        Returns
+        -------
+        str
+            The hierarchical representation of the problem.
+        """
+        if not self._padding:
+            return super().show()
+
+        graph = []
+        offset = 0
+        for node, depth in self.problem.iter_preorder(with_depth=True):
+            if not isinstance(node, Alternative):  # The alternatives follow their leaf and share its offset.
+                keys = self._padding.get(id(node), ())
+                graph.extend('+' + ('--' * (depth + level)) + name + '\n' for (level, (name, _)) in enumerate(keys))
+                offset = len(keys)
+            graph.append('+' + ('--' * (depth + offset)) + node.__str__())
+        return ''.join(graph)
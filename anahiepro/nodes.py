@@ -1,10 +1,14 @@
 from abc import ABC, abstractmethod
 import numpy as np
 from anahiepro.pairwise import PairwiseComparisonMatrix
+from anahiepro.priority_methods import get_priority_method
 
 # TODO: change the shape of 
 
 class Node(ABC):
+    # The nodes do not have __dict__, which saves memory for big hierarchies.
+    __slots__ = ("_id", "_name", "_parents", "_children", "_priority_method", "_global_vector", "_pcm")
+
     def __init__(self, name, parents=None, children=None, id=0, pcm=None):
         """
         Initialize a Node object.
@@ -24,7 +28,9 @@ class Node(ABC):
         self._name = name
         self._parents = []
         self._children = []
-        self.pcm = None
+        self._priority_method = None
+        self._global_vector = None
+        self._pcm = None
         
         if children:
             for child in children:
@@ -40,9 +46,50 @@ class Node(ABC):
     def __copy__(self):
         instance = type(self)(self._name)
         instance.pcm = self.pcm
+        instance._priority_method = self._priority_method
         return instance
 
 
+    @property
+    def pcm(self):
+        """
+        PairwiseComparisonMatrix: The pairwise comparison matrix of the node's children.
+        """
+        return self._pcm
+
+
+    @pcm.setter
+    def pcm(self, pcm):
+        if self._pcm is not None:
+            self._pcm._owners = [owner for owner in self._pcm._owners if owner is not self]
+        
+        self._pcm = pcm
+        if pcm is not None:
+            pcm._owners.append(self)
+        self._mark_dirty()
+
+
+    @pcm.deleter
+    def pcm(self):
+        self.pcm = None
+        del self._pcm
+
+
+    def _mark_dirty(self):
+        """
+        Drop the cached global vector of the node and of all its ancestors.
+        
+        The ancestors of a node without the cached vector do not have it either,
+        so the propagation stops at the first node which is already dirty.
+        """
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if node._global_vector is not None:
+                node._global_vector = None
+                stack.extend(node._parents)
+
+
     def get_name(self):
         """
         Get the name of the node.
@@ -179,14 +226,92 @@ class Node(ABC):
         str
             Hierarchical representation of the node.
         """
-        return self._show(0) 
+        return ''.join('+' + ('--' * depth) + node.__str__() for (node, depth) in self.iter_preorder(with_depth=True))
     
 
-    def _show(self, depth):
-        graph = '+' + ('--' * depth) + self.__str__()
-        for child in self._children:
-            graph += child._show(depth + 1)
-        return graph
+    def iter_preorder(self, alternatives=True, with_depth=False):
+        """
+        Iterate over the node and its descendants, each node before its children.
+        
+        An explicit stack is used instead of recursion, so the depth of the
+        hierarchy is not limited by the recursion limit.
+        
+        Parameters
+        ----------
+        alternatives : bool, optional
+            Whether to visit the alternatives, which are visited under each of their parents (default is True).
+        with_depth : bool, optional
+            Whether to yield (node, depth) pairs, the depth of this node is 0 (default is False).
+        
+        Yields
+        ------
+        Node or tuple
+            The nodes, or the (node, depth) pairs.
+        """
+        if with_depth:
+            stack = [(self, 0)]
+            while stack:
+                (node, depth) = stack.pop()
+                yield node, depth
+                children = node._children
+                if children and (alternatives or not isinstance(children[0], Alternative)):
+                    stack.extend((child, depth + 1) for child in reversed(children))
+            return
+        
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            children = node._children
+            if children and (alternatives or not isinstance(children[0], Alternative)):
+                stack.extend(reversed(children))
+    
+
+    def iter_postorder(self, alternatives=True):
+        """
+        Iterate over the node and its descendants, each node after its children.
+        
+        Parameters
+        ----------
+        alternatives : bool, optional
+            Whether to visit the alternatives, which are visited under each of their parents (default is True).
+        
+        Yields
+        ------
+        Node
+            The nodes.
+        """
+        stack = [(self, False)]
+        while stack:
+            (node, expanded) = stack.pop()
+            children = node._children
+            if expanded or not children or (not alternatives and isinstance(children[0], Alternative)):
+                yield node
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in reversed(children))
+    
+
+    def iter_levels(self, alternatives=True):
+        """
+        Iterate over the levels of the node's subtree, from the node down.
+        
+        Parameters
+        ----------
+        alternatives : bool, optional
+            Whether to visit the alternatives, which are listed under each of their parents (default is True).
+        
+        Yields
+        ------
+        list
+            The nodes of each level, the children of each node one after another.
+        """
+        level = [self]
+        while level:
+            yield level
+            level = [child for node in level
+                     if node._children and (alternatives or not isinstance(node._children[0], Alternative))
+                     for child in node._children]
     
 
     def compare(self, key: tuple):
@@ -216,10 +341,10 @@ class Node(ABC):
         if self.pcm and len(self.pcm.matrix) == len(self._children):
             return
         
-        self.pcm = PairwiseComparisonMatrix(len(self._children))
+        self.pcm = PairwiseComparisonMatrix(len(self._children), priority_method=self._priority_method)
     
 
-    def set_matrix(self, matrix):
+    def set_matrix(self, matrix, validate=True):
         """
         Set the matrix for the PCM.
         
@@ -227,23 +352,26 @@ class Node(ABC):
         ----------
         matrix : np.ndarray
             Matrix to be set.
+        validate : bool, optional
+            Whether to check the matrix, pass False only for trusted data (default is True).
         """
         if not self.pcm:
             self.create_pcm()
         
-        if np.array(matrix).shape != (self.pcm.size, self.pcm.size):
+        if np.shape(matrix) != (self.pcm.size, self.pcm.size):
             raise ValueError("The shape of matrix do not match.")
 
-        self.pcm.set_matrix(matrix)
+        self.pcm.set_matrix(matrix, validate)
     
     def _set_pcm(self, pcm):
         if not pcm:
             return
         
         if isinstance(pcm, PairwiseComparisonMatrix):
-            self.pcm = PairwiseComparisonMatrix(size=len(pcm.matrix), matrix=pcm.matrix)
+            self.pcm = PairwiseComparisonMatrix(size=len(pcm.matrix), matrix=pcm.matrix, priority_method=self._priority_method,
+                                                validate=False, packed=pcm.packed)  # The matrix was already checked by the given PCM.
         else:
-            self.pcm = PairwiseComparisonMatrix(size=len(pcm), matrix=pcm)
+            self.pcm = PairwiseComparisonMatrix(size=len(pcm), matrix=pcm, priority_method=self._priority_method)
         
         
     def set_comparison(self, i, j, value):
@@ -263,6 +391,35 @@ class Node(ABC):
             self.pcm.set_comparison(i, j, value)
     
 
+    def set_priority_method(self, priority_method):
+        """
+        Set the method used to calculate the priority vector of the node.
+        
+        The method of the node takes precedence over the method of the model.
+        
+        Parameters
+        ----------
+        priority_method : str or PriorityMethod
+            The name of the method ('eig', 'power_iteration', 'geometric_mean', 'llsm',
+            'harker' or 'additive_normalization') or the method instance. None resets it to the default.
+        """
+        self._priority_method = None if priority_method is None else get_priority_method(priority_method)
+        if self.pcm:
+            self.pcm.priority_method = self._priority_method
+    
+
+    def get_priority_method(self):
+        """
+        Get the method set for the node.
+        
+        Returns
+        -------
+        PriorityMethod
+            The method of the node, None if the node uses the default one.
+        """
+        return self._priority_method
+    
+
     def get_priority_vector(self):
         """
         Get the priority vector from the PCM.
@@ -322,6 +479,7 @@ class Node(ABC):
 
 
 class Problem(Node):
+    __slots__ = ()
     _problem_id = 0
     
     def __init__(self, name=None, children=None, pcm=None):
@@ -354,6 +512,7 @@ class Problem(Node):
         self._check_append_condision(child)
         self._children.append(child)
         child._add_parent(self)
+        self._mark_dirty()
 
 
     def get_key(self):
@@ -361,6 +520,7 @@ class Problem(Node):
 
 
 class Criteria(Node):
+    __slots__ = ()
     _criteria_id = 0
     
     def __init__(self, name=None, children=None, pcm=None):
@@ -395,6 +555,7 @@ class Criteria(Node):
         self._check_append_condision(child)
         self._children.append(child)
         child._add_parent(self)
+        self._mark_dirty()
 
 
     def get_key(self):
@@ -402,6 +563,7 @@ class Criteria(Node):
 
 
 class DummyCriteria(Criteria):
+    __slots__ = ()
     _dummy_criteria_id  = 0
     def __init__(self):
         super().__init__("DummyCriteria" + str(DummyCriteria._dummy_criteria_id))
@@ -409,6 +571,7 @@ class DummyCriteria(Criteria):
 
 
 class Alternative(Node):
+    __slots__ = ()
     _alternative_id = 0
     
     def __init__(self, name=None):
@@ -478,5 +641,9 @@ class Alternative(Node):
         raise NotImplementedError("The 'class Alternative(Node)' cannot have a 'PairwiseComparisonMatrix' instance.")
 
 
+    def set_priority_method(self, priority_method):
+        raise NotImplementedError("The 'class Alternative(Node)' cannot have a 'PairwiseComparisonMatrix' instance.")
+
+
     def get_key(self):
         return (self.get_name(), self._id)
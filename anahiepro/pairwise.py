@@ -1,12 +1,328 @@
+from collections import namedtuple
+from itertools import islice, compress
 import numpy as np
 import anahiepro.constants as const
+from anahiepro.priority_methods import get_priority_method
+from anahiepro.random_index import get_random_index
+from anahiepro._log_space import (_upper_triangle_indices, _pack, _unpack, _packed_index,
+                                  _geometric_consistency_index, _log_residuals, _log_row_sums, _log_matrix,
+                                  _inconsistent_triad_counts)
+
+
+def calculate_batch(matrices, priority_method=None):
+    """
+    Calculate the priority vectors and consistency ratios of a stack of matrices.
+
+    All the matrices are processed by a single vectorized call of the priority
+    method, so the result for each matrix is the same as the one returned by
+    ``PairwiseComparisonMatrix.calculate_priority_vector`` and
+    ``PairwiseComparisonMatrix.calculate_consistency_ratio``.
+
+    Parameters
+    ----------
+    matrices : array_like
+        Pairwise comparison matrices of the same size with shape (N, n, n).
+    priority_method : str or PriorityMethod, optional
+        The method used to calculate the priority vectors (default is the 'eig' method).
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        The priority vectors with shape (N, n) and the consistency ratios with shape (N,).
+
+    Raises
+    ------
+    ValueError
+        If the matrices are not stacked as an (N, n, n) array.
+    """
+    matrices = np.asarray(matrices, dtype=float)
+    if matrices.ndim != 3 or matrices.shape[1] != matrices.shape[2]:
+        raise ValueError("The matrices must be stacked into an array with shape (N, n, n).")
+
+    priority_method = get_priority_method(priority_method)
+    (max_eigvals, priority_vectors) = _decompose(matrices, priority_method)
+    if not priority_method.exact_eigenvalue:
+        max_eigvals = _principal_eigvals(matrices)
+    return priority_vectors, _consistency_ratio(max_eigvals, matrices.shape[1])
+
+
+def validate_matrices(matrices):
+    """
+    Check if the matrices are valid pairwise comparison matrices.
+
+    A valid matrix is square, has positive finite items, ones on the diagonal
+    and reciprocal items a[j, i] = 1 / a[i, j]. All the checks are vectorized
+    over the stack and only look at the strict upper triangle and its mirror,
+    without building the full 1 / matrix.T temporary.
+
+    Parameters
+    ----------
+    matrices : array_like
+        One matrix with shape (n, n) or a stack of matrices with shape (N, n, n).
+
+    Returns
+    -------
+    list
+        The reason why each matrix is invalid, or None for the valid matrices.
+    """
+    matrices = np.asarray(matrices)
+    if matrices.ndim == 2:
+        matrices = matrices[np.newaxis]
+    if matrices.ndim < 3:
+        return ["The matrix must be a two-dimensional array."]
+    if matrices.ndim > 3:
+        return ["The matrix must be a two-dimensional array."] * matrices.shape[0]
+    if matrices.shape[1] != matrices.shape[2]:
+        return ["The matrix is not square."] * matrices.shape[0]
+
+    (rows, cols) = _upper_triangle_indices(matrices.shape[1])
+    upper = matrices[:, rows, cols]
+    lower = matrices[:, cols, rows]
+    diagonal = np.diagonal(matrices, axis1=1, axis2=2)
+
+    with np.errstate(invalid="ignore", over="ignore"):
+        not_positive = ~(((upper > 0) & (upper < np.inf)).all(axis=1) & (diagonal > 0).all(axis=1))
+        invalid_diagonal = ~(np.abs(diagonal - 1) <= _RECIPROCITY_TOLERANCE).all(axis=1)
+        not_reciprocal = ~(np.abs(upper * lower - 1) <= _RECIPROCITY_TOLERANCE).all(axis=1)
+
+    invalid = not_positive | invalid_diagonal | not_reciprocal
+    reasons = [None] * matrices.shape[0]
+    for index in np.flatnonzero(invalid):
+        if not_positive[index]:
+            reasons[index] = "The items of the matrix must be positive finite numbers."
+        elif invalid_diagonal[index]:
+            reasons[index] = "The items on the diagonal must be 1."
+        else:
+            reasons[index] = "The matrix is not reciprocal."
+    return reasons
+
+
+_RECIPROCITY_TOLERANCE = 1e-5 + 1e-8  # The same tolerance as np.isclose(x, 1) has.
+
+
+ConsistencyCheck = namedtuple("ConsistencyCheck", ["index", "accepted", "lower_bound", "upper_bound", "reason"])
+ConsistencyCheck.__doc__ = """
+    The result of checking one matrix by `check_consistency`.
+
+    `lower_bound` and `upper_bound` bound the consistency ratio, they are equal
+    when it was calculated exactly and both are NaN for an invalid matrix.
+    `reason` is None for the accepted matrices.
+"""
+
+
+def check_consistency(matrices, max_ratio=const.COHERENCE_INDEX_RATE, chunk_size=256, power_steps=4):
+    """
+    Check the consistency ratios of a stream of matrices lazily.
+
+    The matrices are read by chunks, so the stream might be longer than the
+    memory. The principal eigenvalue of a positive matrix A lies between the
+    smallest and the biggest (A x)_i / x_i for any positive x (Collatz-Wielandt),
+    so after a few power iteration steps started from the geometric-mean vector
+    most of the matrices are accepted or rejected by the bounds alone. Only
+    the matrices with the threshold between the bounds are decomposed.
+
+    Parameters
+    ----------
+    matrices : iterable of array_like
+        The matrices, might have different sizes.
+    max_ratio : float, optional
+        The biggest acceptable consistency ratio (default is constants.COHERENCE_INDEX_RATE).
+    chunk_size : int, optional
+        The number of the matrices read and processed together (default is 256).
+    power_steps : int, optional
+        The number of the power iteration steps before the exact calculation (default is 4).
+
+    Yields
+    ------
+    ConsistencyCheck
+        The result for each matrix, in the order of the stream.
+
+    Raises
+    ------
+    ValueError
+        If chunk_size is not positive or power_steps is negative.
+    """
+    if chunk_size < 1:
+        raise ValueError("The 'chunk_size' must be a positive integer.")
+    if power_steps < 0:
+        raise ValueError("The 'power_steps' must not be negative.")
+    return _check_consistency(iter(matrices), max_ratio, chunk_size, power_steps)
+
+
+def _check_consistency(matrices, max_ratio, chunk_size, power_steps):
+    start = 0
+    while True:
+        chunk = [np.asarray(matrix, dtype=float) for matrix in islice(matrices, chunk_size)]
+        if not chunk:
+            return
+
+        results = [None] * len(chunk)
+        groups = {}
+        for (index, matrix) in enumerate(chunk):
+            # A stack of the items with other dimensions would be taken for one matrix, so they are rejected one by one.
+            if matrix.ndim != 2:
+                results[index] = ConsistencyCheck(start + index, False, np.nan, np.nan,
+                                                  "The matrix must be a two-dimensional array.")
+            else:
+                groups.setdefault(matrix.shape, []).append(index)
+        for indexes in groups.values():
+            group = np.stack([chunk[index] for index in indexes])
+            reasons = validate_matrices(group)
+            for (index, reason) in zip(indexes, reasons):
+                if reason is not None:
+                    results[index] = ConsistencyCheck(start + index, False, np.nan, np.nan, reason)
+
+            valid = [reason is None for reason in reasons]
+            if not any(valid):
+                continue
+            (lower, upper) = _bound_consistency_ratios(group[valid], max_ratio, power_steps)
+            for (index, lower_bound, upper_bound) in zip(compress(indexes, valid), lower, upper):
+                if upper_bound > max_ratio:
+                    results[index] = ConsistencyCheck(start + index, False, lower_bound, upper_bound,
+                                                      "The consistency ratio is above the threshold.")
+                else:
+                    results[index] = ConsistencyCheck(start + index, True, lower_bound, upper_bound, None)
+
+        yield from results
+        start += len(chunk)
+
+
+def _bound_consistency_ratios(matrices, max_ratio, power_steps):
+    """
+    Bound the consistency ratios of an (N, n, n) stack until each bound pair is on one side of max_ratio.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        The lower and the upper bounds with shape (N,), equal for the matrices decomposed exactly.
+    """
+    size = matrices.shape[-1]
+    if matrices.ndim != 3 or size != matrices.shape[1] or size < 3:
+        # The matrices smaller than 3x3 are always consistent, the invalid ones are rejected anyway.
+        return np.zeros(len(matrices)), np.zeros(len(matrices))
+
+    with np.errstate(all="ignore"):  # The invalid matrices might have any items.
+        vectors = np.exp(np.mean(np.log(matrices), axis=-1))
+        lower = np.full(len(matrices), -np.inf)
+        upper = np.full(len(matrices), np.inf)
+        undecided = np.arange(len(matrices))
+
+        for _ in range(power_steps + 1):
+            products = np.matmul(matrices[undecided], vectors[..., np.newaxis])[..., 0]
+            ratios = products / vectors
+            lower[undecided] = _consistency_ratio(ratios.min(axis=-1), size)
+            upper[undecided] = _consistency_ratio(ratios.max(axis=-1), size)
+
+            pending = ~((upper[undecided] <= max_ratio) | (lower[undecided] > max_ratio))
+            (undecided, vectors) = (undecided[pending], products[pending] / products[pending].max(axis=-1, keepdims=True))
+            if len(undecided) == 0:
+                break
+
+        if len(undecided):
+            exact = _consistency_ratio(_principal_eigvals(matrices[undecided]), size)
+            (lower[undecided], upper[undecided]) = (exact, exact)
+
+    return lower, upper
+
+
+def _decompose(matrices, priority_method, initial_vectors=None):
+    """
+    Find the principal eigenpairs of an (N, n, n) stack of matrices.
+    
+    The priority method refines the initial vectors if they are given.
+    """
+    if initial_vectors is None:
+        return priority_method.calculate(matrices)
+    return priority_method.refine(matrices, initial_vectors)
+
+
+def _decompose_packed(log_judgments, size, priority_method):
+    """
+    Find the principal eigenpairs of an (N, n * (n - 1) / 2) stack of packed log-judgments.
+    """
+    return priority_method.calculate_packed(log_judgments, size)
+
+
+def _refresh_eigen_results(pcms):
+    """
+    Fill the eigen-result cache of the given matrices.
+
+    Only the matrices without a cached result are decomposed, and those of
+    the same size and priority method are decomposed together by one batched call.
+    The matrices changed by single judgments since the last decomposition are
+    refined starting from their previous priority vectors. The packed
+    matrices are passed to the method as the log-judgments.
+
+    Parameters
+    ----------
+    pcms : iterable of PairwiseComparisonMatrix
+        The matrices to refresh.
+    """
+    groups = {}
+    for pcm in pcms:
+        if pcm._eigen is None:
+            warm_start = pcm._last_eigen is not None
+            packed = pcm.packed and not warm_start
+            groups.setdefault((pcm._get_shape(), pcm.priority_method, warm_start, packed), []).append(pcm)
+
+    for ((size, _), priority_method, warm_start, packed), group in groups.items():
+        if packed:
+            results = _decompose_packed(np.stack([pcm._matrix for pcm in group]), size, priority_method)
+        else:
+            initial_vectors = np.stack([pcm._last_eigen.priority_vector for pcm in group]) if warm_start else None
+            results = _decompose(np.stack([pcm.matrix for pcm in group]), priority_method, initial_vectors)
+        for pcm, eigen in zip(group, zip(*results)):
+            pcm._eigen = _EigenResult(*eigen)
+            pcm._last_eigen = None
+
+
+def _principal_eigvals(matrices):
+    """
+    Find the principal eigenvalues of an (N, n, n) stack of matrices, without the eigenvectors.
+    """
+    return np.max(np.real(np.linalg.eigvals(matrices)), axis=-1)
+
+
+def _consistency_ratio(max_eigval, size):
+    """
+    Calculate the consistency ratio from the principal eigenvalue(s) of matrices of the given size.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):  # The ratio is undefined for the matrices smaller than 3x3.
+        CI = np.divide((max_eigval - size), (size - 1))
+        RI = get_random_index(size)
+        return np.divide(CI, RI)
+
+
+class _EigenResult(namedtuple("_EigenResult", ["max_eigval", "priority_vector"])):
+    __slots__ = ()
+
+    @property
+    def consistency_ratio(self):
+        """
+        The consistency ratio by the principal eigenvalue of the priority method, which is
+        only estimated by the approximate methods.
+
+        It is calculated on request only, as the random index of a big matrix might have to be simulated.
+        """
+        return _consistency_ratio(self.max_eigval, len(self.priority_vector))
+
+
+InconsistencyRanking = namedtuple("InconsistencyRanking", ["rows", "cols", "scores", "suggested_values"])
+InconsistencyRanking.__doc__ = """
+    The judgments a[rows[k], cols[k]] above the diagonal, from the most inconsistent one.
+
+    `scores` are the contributions to the inconsistency and `suggested_values`
+    are the values which would make the judgments consistent with the others.
+"""
 
 
 """
     PairwiseComparisonMatrix represents the the pairwise comparison matrix
 """
 class PairwiseComparisonMatrix:
-    def __init__(self, size=0, matrix=None):
+    __slots__ = ("size", "_eigen", "_last_eigen", "_owners", "_priority_method", "_matrix", "_shared", "_packed")
+
+    def __init__(self, size=0, matrix=None, priority_method=None, validate=True, packed=False):
         """
         Initialize a pairwise comparison matrix with the given size.
         
@@ -14,11 +330,26 @@ class PairwiseComparisonMatrix:
         ----------
         size : int
             The size of the matrix.
+        matrix : array_like, optional
+            The matrix to set (default is None).
+        priority_method : str or PriorityMethod, optional
+            The method used to calculate the priority vector (default is the 'eig' method).
+        validate : bool, optional
+            Whether to check the given matrix, pass False only for trusted data (default is True).
+        packed : bool, optional
+            Whether to keep only the logarithms of the n(n-1)/2 judgments above
+            the diagonal, the full matrix is materialized on request (default is False).
         """
         self.size = size
+        self._eigen = None
+        self._last_eigen = None
+        self._owners = []
+        self._priority_method = get_priority_method(priority_method)
+        self._shared = False
+        self._packed = packed
         self.matrix = np.ones((size, size))
-        if matrix:
-            self._try_to_set_matrix(np.array(matrix))
+        if matrix is not None:
+            self._try_to_set_matrix(np.array(matrix), validate)
     
 
     def set_comparison(self, i, j, value):
@@ -55,11 +386,21 @@ class PairwiseComparisonMatrix:
         ValueError
             If trying to set a non-1 value on the diagonal.
         """
+        if self._packed:
+            (i, j) = (i % self.size, j % self.size)  # The negative indices count from the end, as numpy does.
         if self._is_diagonal_item(i, j) and value != 1:
             raise ValueError("The element in diagonal of matrix must be 1")
         
-        self.matrix[i, j] = value
-        self.matrix[j, i] = 1 / value
+        if not self._packed:
+            self.matrix[i, j] = value
+            self.matrix[j, i] = 1 / value
+        elif i < j:
+            self._matrix[_packed_index(i, j, self.size)] = np.log(value)
+        elif i > j:
+            self._matrix[_packed_index(j, i, self.size)] = -np.log(value)
+        if self._eigen is not None:
+            self._last_eigen = self._eigen  # The previous eigenvector is a good start for the changed matrix.
+        self._invalidate()
 
 
     def _is_diagonal_item(self, i, j):
@@ -81,7 +422,7 @@ class PairwiseComparisonMatrix:
         return i == j
 
 
-    def set_matrix(self, matrix):
+    def set_matrix(self, matrix, validate=True):
         """
         Set the entire matrix, ensuring it is a valid pairwise comparison matrix.
         
@@ -89,16 +430,18 @@ class PairwiseComparisonMatrix:
         ----------
         matrix : array_like
             The matrix to set.
+        validate : bool, optional
+            Whether to check the matrix, pass False only for trusted data (default is True).
         
         Raises
         ------
         ValueError
             If the matrix is not consistent or not valid.
         """
-        self._try_to_set_matrix(np.array(matrix))
+        self._try_to_set_matrix(np.array(matrix), validate)
     
 
-    def _try_to_set_matrix(self, matrix):
+    def _try_to_set_matrix(self, matrix, validate=True):
         """
         Attempt to set the matrix, checking for validity.
         
@@ -106,44 +449,165 @@ class PairwiseComparisonMatrix:
         ----------
         matrix : numpy.ndarray
             The matrix to set.
+        validate : bool, optional
+            Whether to check the matrix (default is True).
         
         Raises
         ------
         ValueError
             If the matrix is not consistent or not valid.
         """
-        if self._is_valid_matrix(matrix):
-            self.size = matrix.shape[0]
-            self.matrix = matrix
-        else:
-            raise ValueError("Matrix is not consistent or not a valid pairwise comparison matrix")
+        if validate:
+            reason = validate_matrices(matrix)[0]
+            if reason is not None:
+                raise ValueError("Matrix is not consistent or not a valid pairwise comparison matrix: " + reason)
+        
+        self.size = matrix.shape[0]
+        self.matrix = matrix
     
 
-    def _is_valid_matrix(self, matrix):
+    @property
+    def matrix(self):
+        """
+        numpy.ndarray: The pairwise comparison matrix.
+
+        Assigning a new matrix drops the cached eigen-result. Note that changing
+        the items of the returned array in place bypasses the cache, so use
+        `set_comparison` or `set_matrix` for that. If the matrix is a view into
+        a shared storage (see `_share`), a matrix of the same shape is copied
+        into the storage instead of replacing the view.
+
+        A packed matrix is materialized from the log-judgments on every
+        request and the result is read-only.
+        """
+        if self._packed:
+            matrix = _unpack(self._matrix, self.size)
+            matrix.flags.writeable = False
+            return matrix
+        return self._matrix
+
+
+    @matrix.setter
+    def matrix(self, matrix):
+        if self._packed:
+            self.size = len(matrix)
+            matrix = _pack(matrix)
+        
+        if self._shared and np.shape(matrix) == self._matrix.shape:
+            self._matrix[...] = matrix
+        else:
+            self._matrix = matrix
+            self._shared = False
+        self._last_eigen = None
+        self._invalidate()
+
+
+    @property
+    def packed(self):
         """
-        Check if the given matrix is a valid pairwise comparison matrix.
+        bool: Whether only the log-judgments above the diagonal are kept.
+        """
+        return self._packed
+
+
+    def get_packed(self):
+        """
+        Get the logarithms of the judgments above the diagonal, row by row.
+        
+        They determine a reciprocal matrix completely, so they are a compact
+        form for serialization and hashing.
+        
+        Returns
+        -------
+        numpy.ndarray
+            The read-only log-judgments with shape (n * (n - 1) / 2,).
+        """
+        log_judgments = self._matrix.view() if self._packed else _pack(self._matrix)
+        log_judgments.flags.writeable = False
+        return log_judgments
+
+
+    def _get_shape(self):
+        """
+        Get the shape of the matrix without materializing a packed one.
+        """
+        return (self.size, self.size) if self._packed else self._matrix.shape
+
+
+    def _set_packed(self, packed):
+        """
+        Switch the storage of the matrix between the full and the packed one.
         
+        The values do not change, so the cached eigen-result is kept.
+        """
+        if packed != self._packed:
+            matrix = self.matrix
+            self._packed = packed
+            self._shared = False
+            self._matrix = _pack(matrix) if packed else np.array(matrix)
+
+
+    def _share(self, storage):
+        """
+        Move the matrix into a slot of a shared storage and keep it there.
+
         Parameters
         ----------
-        matrix : numpy.ndarray
-            The matrix to check.
+        storage : numpy.ndarray
+            The view with the shape of the matrix, or of the log-judgments for a
+            packed matrix, e.g. a slice of a stacked array.
+        """
+        storage[...] = self._matrix
+        self._matrix = storage
+        self._shared = True
+        self._last_eigen = None
+        self._invalidate()
+
+
+    @property
+    def priority_method(self):
+        """
+        PriorityMethod: The method used to calculate the priority vector.
+
+        Setting another method drops the cached eigen-result. The value might
+        be a method name or a `PriorityMethod` instance.
+        """
+        return self._priority_method
+
+
+    @priority_method.setter
+    def priority_method(self, priority_method):
+        priority_method = get_priority_method(priority_method)
+        if priority_method is not self._priority_method:
+            self._priority_method = priority_method
+            self._invalidate()
+
+
+    def _invalidate(self):
+        """
+        Drop the cached eigen-result, so it is recalculated on the next request,
+        and notify the nodes which own the matrix.
+        """
+        self._eigen = None
+        for owner in self._owners:
+            owner._mark_dirty()
+
+
+    def _get_eigen(self):
+        """
+        Get the principal eigenvalue, the priority vector and the consistency ratio of the matrix.
+        
+        The result is calculated once and cached until the matrix changes.
         
         Returns
         -------
-        bool
-            True if the matrix is valid, False otherwise.
+        _EigenResult
+            The cached eigen-result.
         """
-        if matrix.shape[0] != matrix.shape[1]:
-            return False
-        if not np.allclose(matrix, 1 / matrix.T):
-            return False
-        
-        for i in range(matrix.shape[0]):
-            if int(matrix[i][i]) != 1:  # cast to int, because floating comparing can have a bad accuracy.
-                return False
+        if self._eigen is None:
+            _refresh_eigen_results([self])
+        return self._eigen
 
-        return True
-    
 
     def get_matrix(self):
         """
@@ -166,26 +630,108 @@ class PairwiseComparisonMatrix:
         numpy.ndarray
             The priority vector.
         """
-        (eigvals, eigvecs) = np.linalg.eig(self.matrix)
-        max_eigval_index = np.argmax(eigvals)
-        priority_vector = np.real(eigvecs[:, max_eigval_index])
-        return priority_vector
+        return self._get_eigen().priority_vector.copy()
     
 
     def calculate_consistency_ratio(self):
         """
         Calculate the consistency ratio of the pairwise comparison matrix.
         
+        The ratio is defined by the principal eigenvalue whatever the priority
+        method is. The methods which only estimate the eigenvalue get it from
+        the eigenvalues of the matrix on every call.
+        
         Returns
         -------
         float
             The consistency ratio.
         """
-        eigvals, _ = np.linalg.eig(self.matrix)
-        max_eigval = np.max(np.real(eigvals))
-        CI = np.divide((max_eigval - self.size), (self.size - 1))
-        RI = const.HOMOGENEITY_INDEXES.get(self.size, 1.49)
-        return np.divide(CI, RI)
+        eigen = self._get_eigen()
+        if self.priority_method.exact_eigenvalue:
+            return eigen.consistency_ratio
+        return _consistency_ratio(_principal_eigvals(self.matrix[np.newaxis])[0], self.size)
+    
+    
+    def estimate_consistency_ratio(self):
+        """
+        Estimate the consistency ratio by the eigenvalue estimation of the priority method.
+        
+        It is the consistency ratio for the 'eig' and 'power_iteration' methods.
+        The approximate methods estimate the eigenvalue as the mean of (A w)_i / w_i
+        over their own priority vector without any decomposition, so the estimate
+        depends on the method and might fall on the other side of the threshold
+        than the consistency ratio does.
+        
+        Returns
+        -------
+        float
+            The estimated consistency ratio.
+        """
+        return self._get_eigen().consistency_ratio
+
+
+    def calculate_geometric_consistency_index(self):
+        """
+        Calculate the geometric consistency index (GCI) of the matrix.
+        
+        It is the scaled sum of the squared log-residuals of the geometric-mean
+        priorities, so it costs O(n^2) without any decomposition. The usual
+        thresholds are 0.31 for n = 3, 0.35 for n = 4 and 0.37 for bigger matrices.
+        
+        Returns
+        -------
+        float
+            The geometric consistency index, NaN for the matrices smaller than 3x3.
+        """
+        return _geometric_consistency_index(self.get_packed()[np.newaxis], self.size)[0]
+
+
+    def rank_inconsistent_judgments(self, measure="deviation", threshold=1/3):
+        """
+        Rank the judgments above the diagonal by their contribution to the inconsistency.
+
+        The 'deviation' measure is |log(a[i, j] * w[j] / w[i])| for the priority
+        vector w of the matrix, it costs O(n^2) and suggests w[i] / w[j]. The
+        'triads' measure is the number of the triads (i, j, k) with Koczkodaj's
+        index above the threshold, it costs O(n^3) and suggests the geometric
+        mean of the indirect judgments a[i, k] * a[k, j].
+
+        Parameters
+        ----------
+        measure : str, optional
+            'deviation' or 'triads' (default is 'deviation').
+        threshold : float, optional
+            The biggest Koczkodaj's index of a consistent triad, only used by the 'triads' measure (default is 1/3).
+
+        Returns
+        -------
+        InconsistencyRanking
+            The indexes, the scores and the suggested values of the judgments, from the biggest score.
+
+        Raises
+        ------
+        ValueError
+            If the measure is unknown.
+        """
+        log_judgments = self.get_packed()
+        (rows, cols) = _upper_triangle_indices(self.size)
+
+        if measure == "deviation":
+            log_weights = np.log(np.abs(self.calculate_priority_vector()))
+            scores = np.abs(_log_residuals(log_judgments[np.newaxis], log_weights[np.newaxis])[0])
+            suggested_values = np.exp(log_weights[rows] - log_weights[cols])
+        elif measure == "triads":
+            scores = _inconsistent_triad_counts(_log_matrix(log_judgments, self.size), threshold)[rows, cols]
+            # sum over k of log a[i, k] + log a[k, j] is the difference of the log-row sums, and k = i, j add 2 log a[i, j].
+            row_sums = _log_row_sums(log_judgments[np.newaxis], self.size)[0]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                indirect = (row_sums[rows] - row_sums[cols] - 2 * log_judgments) / (self.size - 2)
+            suggested_values = np.exp(indirect) if self.size > 2 else np.exp(log_judgments)
+        else:
+            raise ValueError(f"Unknown inconsistency measure '{measure}'. Expected 'deviation' or 'triads'.")
+
+        order = np.argsort(-scores, kind="stable")
+        return InconsistencyRanking(rows[order], cols[order], scores[order], suggested_values[order])
 
 
     def __getitem__(self, key):
@@ -202,6 +748,13 @@ class PairwiseComparisonMatrix:
         float
             The value at the specified index.
         """
+        if self._packed and isinstance(key, tuple) and len(key) == 2 \
+                and all(isinstance(index, (int, np.integer)) for index in key):
+            (i, j) = (index % self.size for index in key)
+            if i == j:
+                return 1.0
+            return np.exp(self._matrix[_packed_index(i, j, self.size)]) if i < j \
+                else np.exp(-self._matrix[_packed_index(j, i, self.size)])
         return self.matrix[key]
     
     
@@ -0,0 +1,415 @@
+from abc import ABC, abstractmethod
+import numpy as np
+from anahiepro._log_space import _unpack, _log_row_sums, _log_residuals
+from anahiepro._comparison_graph import _degrees, _solve_laplacian
+
+
+class PriorityMethod(ABC):
+    """
+    Base class of the methods which derive a priority vector from pairwise comparison matrices.
+
+    Every method works on a stack of matrices with the same size, so a whole
+    group of matrices is processed by one vectorized call.
+
+    `exact_eigenvalue` tells if `calculate` returns the principal eigenvalues
+    themselves. The eigenvalues of the other methods are only estimations, so
+    the consistency ratio finds the principal eigenvalues separately for them.
+    """
+    name = None
+    exact_eigenvalue = False
+
+    @abstractmethod
+    def calculate(self, matrices):
+        """
+        Calculate the principal eigenvalues and the priority vectors of the matrices.
+
+        Parameters
+        ----------
+        matrices : numpy.ndarray
+            Pairwise comparison matrices with shape (N, n, n).
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            The principal eigenvalues (or their estimations) with shape (N,)
+            and the priority vectors with shape (N, n).
+        """
+        pass
+
+
+    def refine(self, matrices, initial_vectors):
+        """
+        Calculate the principal eigenvalues and the priority vectors starting from known vectors.
+
+        The vectors are the priority vectors of slightly different matrices, e.g.
+        before a single judgment was changed. The methods which cannot benefit
+        from them calculate the result from scratch.
+
+        Parameters
+        ----------
+        matrices : numpy.ndarray
+            Pairwise comparison matrices with shape (N, n, n).
+        initial_vectors : numpy.ndarray
+            The previous priority vectors with shape (N, n).
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            The principal eigenvalues with shape (N,) and the priority vectors with shape (N, n).
+        """
+        return self.calculate(matrices)
+
+
+    def calculate_packed(self, log_judgments, size):
+        """
+        Calculate the principal eigenvalues and the priority vectors of packed matrices.
+
+        The methods which work in the log space use the log-judgments as they
+        are, the others get the materialized matrices.
+
+        Parameters
+        ----------
+        log_judgments : numpy.ndarray
+            The logarithms of the judgments above the diagonal with shape (N, n * (n - 1) / 2).
+        size : int
+            The size n of the matrices.
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            The principal eigenvalues with shape (N,) and the priority vectors with shape (N, n).
+        """
+        return self.calculate(_unpack(log_judgments, size))
+
+
+    def calculate_sparse(self, size, rows, cols, log_judgments):
+        """
+        Calculate the principal eigenvalue and the priority vector of an incomplete matrix.
+
+        Only the known judgments are given, one per pair (i, j). The comparison
+        graph must be connected. Unlike the other methods it works on a single
+        matrix, as the incomplete matrices have different sets of judgments.
+
+        Parameters
+        ----------
+        size : int
+            The size n of the matrix.
+        rows, cols : numpy.ndarray
+            The indexes (i, j) of the known judgments.
+        log_judgments : numpy.ndarray
+            The logarithms of the known judgments a[i, j].
+
+        Returns
+        -------
+        tuple
+            The principal eigenvalue (or its estimation) of the completed matrix
+            and the priority vector with shape (n,).
+
+        Raises
+        ------
+        NotImplementedError
+            If the method needs a complete matrix.
+        """
+        raise NotImplementedError(f"The '{self.name}' method cannot work with an incomplete matrix, "
+                                  "use the 'llsm' or 'harker' method.")
+
+
+    def __repr__(self):
+        return type(self).__name__ + "()"
+
+
+class EigenvectorMethod(PriorityMethod):
+    """
+    The classic AHP method, the priority vector is the principal eigenvector
+    found by the full eigendecomposition of the matrix.
+    """
+    name = "eig"
+    exact_eigenvalue = True
+
+    def calculate(self, matrices):
+        eigvals, eigvecs = np.linalg.eig(matrices)
+        max_eigval_indexes = np.argmax(eigvals, axis=-1)
+        rows = np.arange(matrices.shape[0])
+
+        # The principal eigenvector of a positive matrix has the items of one sign,
+        # `eig` returns it with any sign, so it is turned to the non-negative one.
+        priority_vectors = np.abs(np.real(eigvecs[rows, :, max_eigval_indexes]))
+        max_eigvals = np.max(np.real(eigvals), axis=-1)
+        return max_eigvals, priority_vectors
+
+
+    def refine(self, matrices, initial_vectors):
+        """
+        Refine the previous eigenvectors by the power iteration seeded with them.
+
+        After a single judgment change the previous vector is close to the new
+        one, so the iteration converges in a few steps. The full decomposition
+        is only run for the matrices which do not converge quickly.
+        """
+        max_eigvals, priority_vectors, converged = _power_iterate(matrices, initial_vectors,
+                                                                  WARM_START_TOLERANCE, WARM_START_MAX_ITERATIONS)
+        if not np.all(converged):
+            (max_eigvals[~converged], priority_vectors[~converged]) = self.calculate(matrices[~converged])
+        return max_eigvals, priority_vectors
+
+
+class PowerIterationMethod(PriorityMethod):
+    """
+    Find the principal eigenvector by the power iteration.
+
+    By the Perron-Frobenius theorem a positive matrix has a dominant positive
+    eigenvector, so the iteration converges in a few matrix-vector products.
+    """
+    name = "power_iteration"
+    exact_eigenvalue = True
+
+    def __init__(self, tolerance=1e-10, max_iterations=1000):
+        """
+        Initialize the method.
+
+        Parameters
+        ----------
+        tolerance : float, optional
+            The iteration stops when no item of the vectors changes more than that (default is 1e-10).
+        max_iterations : int, optional
+            The maximum number of the matrix-vector products (default is 1000).
+        """
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+
+
+    def calculate(self, matrices, initial_vectors=None):
+        """
+        Calculate the principal eigenvalues and the priority vectors of the matrices.
+
+        Parameters
+        ----------
+        matrices : numpy.ndarray
+            Pairwise comparison matrices with shape (N, n, n).
+        initial_vectors : numpy.ndarray, optional
+            The vectors with shape (N, n) the iteration starts from (default is the uniform vectors).
+
+        Returns
+        -------
+        tuple of numpy.ndarray
+            The principal eigenvalues with shape (N,) and the priority vectors with shape (N, n).
+        """
+        if initial_vectors is None:
+            initial_vectors = np.ones(matrices.shape[:2])
+        (max_eigvals, vectors, _) = _power_iterate(matrices, initial_vectors, self.tolerance, self.max_iterations)
+        return max_eigvals, vectors
+
+
+    def refine(self, matrices, initial_vectors):
+        return self.calculate(matrices, initial_vectors)
+
+
+    def __repr__(self):
+        return f"{type(self).__name__}(tolerance={self.tolerance}, max_iterations={self.max_iterations})"
+
+
+class GeometricMeanMethod(PriorityMethod):
+    """
+    The priority vector is the geometric mean of the rows of the matrix.
+
+    It costs O(n^2) and does not need any decomposition. The packed matrices
+    are processed in the log space: the logarithm of the priority is the mean
+    of the antisymmetric log-row, and the eigenvalue estimation is a sum of
+    cosh of the log-residuals, without any product or division of the judgments.
+    """
+    name = "geometric_mean"
+
+    def calculate(self, matrices):
+        priority_vectors = np.exp(np.mean(np.log(matrices), axis=-1))
+        return _estimate_max_eigvals(matrices, priority_vectors), _normalize(priority_vectors)
+
+
+    def calculate_packed(self, log_judgments, size):
+        log_weights = _log_row_sums(log_judgments, size) / size
+        priority_vectors = np.exp(log_weights - log_weights.max(axis=-1, keepdims=True))
+
+        # mean_i (A w)_i / w_i = (1 / n) * sum_ij exp(r_ij), r_ij is antisymmetric and zero on the diagonal.
+        residuals = _log_residuals(log_judgments, log_weights)
+        max_eigvals = 1 + 2 * np.cosh(residuals).sum(axis=-1) / size
+        return max_eigvals, _normalize(priority_vectors)
+
+
+class LogarithmicLeastSquaresMethod(GeometricMeanMethod):
+    """
+    The priority vector minimizes the sum of (log a[i, j] - log w[i] + log w[j])^2.
+
+    For a complete matrix the solution is the geometric mean of the rows, so
+    the method computes it in the same way. For an incomplete matrix the sum
+    only runs over the known judgments and its minimum is the solution of
+    L v = b, where L is the Laplacian of the comparison graph and b[i] is the
+    sum of the known log a[i, j]. The system is solved by the conjugate
+    gradients, each step costs O(n + number of judgments).
+    """
+    name = "llsm"
+
+    def __init__(self, tolerance=1e-12, max_iterations=None):
+        """
+        Initialize the method.
+
+        Parameters
+        ----------
+        tolerance : float, optional
+            The relative residual of the Laplacian system the iteration stops at (default is 1e-12).
+        max_iterations : int, optional
+            The maximum number of the iterations (default is 10 * n).
+        """
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+
+
+    def calculate_sparse(self, size, rows, cols, log_judgments):
+        degrees = _degrees(size, rows, cols)
+        rhs = np.bincount(rows, log_judgments, size) - np.bincount(cols, log_judgments, size)
+        max_iterations = 10 * size if self.max_iterations is None else self.max_iterations
+        log_weights = _solve_laplacian(rows, cols, degrees, rhs, self.tolerance, max_iterations)
+
+        # The missing judgments of the completed matrix are w[i] / w[j], their residuals are zero.
+        residuals = log_judgments - (log_weights[rows] - log_weights[cols])
+        missing = size * (size - 1) // 2 - len(log_judgments)
+        max_eigval = 1 + 2 * (np.cosh(residuals).sum() + missing) / size
+        return max_eigval, _normalize(np.exp(log_weights - log_weights.max()))
+
+
+    def __repr__(self):
+        return f"{type(self).__name__}(tolerance={self.tolerance}, max_iterations={self.max_iterations})"
+
+
+class HarkerMethod(PowerIterationMethod):
+    """
+    Harker's method for incomplete matrices.
+
+    The missing judgments are taken out of the matrix and every missing one
+    in a row adds 1 to the diagonal item of that row. The priority vector is
+    the principal eigenvector of the result, found by the power iteration over
+    the known judgments. A complete matrix does not change, so the method is
+    the usual power iteration for it.
+    """
+    name = "harker"
+
+    def calculate_sparse(self, size, rows, cols, log_judgments):
+        diagonal = size - _degrees(size, rows, cols)
+        (upper, lower) = (np.exp(log_judgments), np.exp(-log_judgments))
+        vector = np.full(size, 1 / np.sqrt(size))
+        max_eigval = 0
+
+        for _ in range(self.max_iterations):
+            product = diagonal * vector + np.bincount(rows, upper * vector[cols], size) \
+                + np.bincount(cols, lower * vector[rows], size)
+            max_eigval = np.linalg.norm(product)
+            next_vector = product / max_eigval
+            converged = np.abs(next_vector - vector).max() <= self.tolerance
+            vector = next_vector
+            if converged:
+                break
+
+        return max_eigval, vector
+
+
+class AdditiveNormalizationMethod(PriorityMethod):
+    """
+    The priority vector is the mean of the rows of the matrix with normalized columns.
+    """
+    name = "additive_normalization"
+
+    def calculate(self, matrices):
+        priority_vectors = np.mean(matrices / np.sum(matrices, axis=-2, keepdims=True), axis=-1)
+        return _estimate_max_eigvals(matrices, priority_vectors), _normalize(priority_vectors)
+
+
+PRIORITY_METHODS = {method.name: method for method in (EigenvectorMethod,
+                                                        PowerIterationMethod,
+                                                        GeometricMeanMethod,
+                                                        LogarithmicLeastSquaresMethod,
+                                                        HarkerMethod,
+                                                        AdditiveNormalizationMethod)}
+
+DEFAULT_PRIORITY_METHOD = EigenvectorMethod()
+
+WARM_START_TOLERANCE = 1e-12
+WARM_START_MAX_ITERATIONS = 30
+
+
+def get_priority_method(method=None):
+    """
+    Get the priority method instance by its name.
+
+    Parameters
+    ----------
+    method : str or PriorityMethod, optional
+        The name of the method ('eig', 'power_iteration', 'geometric_mean', 'llsm',
+        'harker' or 'additive_normalization') or the method instance (default is the 'eig' method).
+
+    Returns
+    -------
+    PriorityMethod
+        The priority method instance.
+
+    Raises
+    ------
+    ValueError
+        If there is no method with the given name.
+    TypeError
+        If the method is neither a name nor a PriorityMethod instance.
+    """
+    if method is None:
+        return DEFAULT_PRIORITY_METHOD
+    if isinstance(method, PriorityMethod):
+        return method
+    if isinstance(method, str):
+        if method not in PRIORITY_METHODS:
+            raise ValueError(f"Unknown priority method '{method}'. Expected one of: {', '.join(PRIORITY_METHODS)}.")
+        if method == DEFAULT_PRIORITY_METHOD.name:
+            return DEFAULT_PRIORITY_METHOD
+        return PRIORITY_METHODS[method]()
+    raise TypeError("The priority method must be a name or a 'PriorityMethod' instance.")
+
+
+def _power_iterate(matrices, initial_vectors, tolerance, max_iterations):
+    """
+    Run the power iteration on a stack of matrices.
+
+    The iteration keeps the sign of the initial vectors, so they are taken by
+    absolute value and the eigenvectors of the positive matrices are non-negative.
+
+    Returns
+    -------
+    tuple of numpy.ndarray
+        The principal eigenvalues with shape (N,), the unit eigenvectors with shape (N, n)
+        and the flags with shape (N,) which show if the iteration converged for the matrix.
+    """
+    vectors = _normalize(np.abs(np.array(initial_vectors, dtype=float)))
+    max_eigvals = np.zeros(matrices.shape[0])
+    converged = np.zeros(matrices.shape[0], dtype=bool)
+
+    # The loop is dominated by the per-call overhead for small matrices,
+    # so it uses the array methods instead of the wrapper functions.
+    for _ in range(max_iterations):
+        products = np.matmul(matrices, vectors[..., np.newaxis])[..., 0]
+        max_eigvals = np.sqrt(np.einsum("ij,ij->i", products, products))
+        next_vectors = products / max_eigvals[:, np.newaxis]
+        converged = np.abs(next_vectors - vectors).max(axis=-1, initial=0) <= tolerance
+        vectors = next_vectors
+        if converged.all():
+            break
+
+    return max_eigvals, vectors, converged
+
+
+def _normalize(vectors):
+    """
+    Scale the vectors to the unit length, as the eigenvectors returned by the 'eig' method are.
+    """
+    return vectors / np.linalg.norm(vectors, axis=-1, keepdims=True)
+
+
+def _estimate_max_eigvals(matrices, vectors):
+    """
+    Estimate the principal eigenvalues as the mean of (A w)_i / w_i.
+    """
+    products = np.matmul(matrices, vectors[..., np.newaxis])[..., 0]
+    return np.mean(products / vectors, axis=-1)
@@ -0,0 +1,142 @@
+import json
+import os
+import numpy as np
+import anahiepro.constants as const
+
+
+"""
+    The random indexes (RI) of the consistency ratio: the mean consistency
+    index of the random reciprocal matrices of a given size
+"""
+
+
+GENERATED_SAMPLES = 2000            # The number of the random matrices simulated for a size out of the tables.
+_MAX_CHUNK_ITEMS = 2_000_000        # The biggest number of the items in a batch of the simulated matrices.
+_SAATY_SCALE = np.array([1/9, 1/8, 1/7, 1/6, 1/5, 1/4, 1/3, 1/2, 1, 2, 3, 4, 5, 6, 7, 8, 9])
+
+_generated_indexes = None
+
+
+def generate_random_index(size, samples=10000, seed=None):
+    """
+    Estimate the random index of the given size by simulation.
+
+    The judgments above the diagonal of each matrix are drawn uniformly from
+    the Saaty scale 1/9, 1/8, ..., 1, ..., 8, 9 and the principal eigenvalues
+    are found by batched `np.linalg.eigvals` calls.
+
+    Parameters
+    ----------
+    size : int
+        The size n of the matrices.
+    samples : int, optional
+        The number of the random matrices (default is 10000).
+    seed : int, optional
+        The seed of the random generator (default is None).
+
+    Returns
+    -------
+    float
+        The mean of (lambda_max - n) / (n - 1) over the random matrices, 0 for n < 3.
+
+    Raises
+    ------
+    ValueError
+        If size or samples is not positive.
+    """
+    if size < 1 or samples < 1:
+        raise ValueError("The 'size' and 'samples' must be positive integers.")
+    if size < 3:
+        return 0.0
+
+    rng = np.random.default_rng(seed)
+    (rows, cols) = np.triu_indices(size, 1)
+    chunk_size = max(1, _MAX_CHUNK_ITEMS // (size * size))
+    total = 0.0
+
+    for start in range(0, samples, chunk_size):
+        count = min(chunk_size, samples - start)
+        judgments = _SAATY_SCALE[rng.integers(0, len(_SAATY_SCALE), (count, len(rows)))]
+        matrices = np.ones((count, size, size))
+        matrices[:, rows, cols] = judgments
+        matrices[:, cols, rows] = 1 / judgments
+        total += np.max(np.real(np.linalg.eigvals(matrices)), axis=-1).sum()
+
+    return float((total / samples - size) / (size - 1))
+
+
+def get_random_index(size):
+    """
+    Get the random index of the given size.
+
+    The index comes from Saaty's table for n <= 15 and from the simulated table
+    shipped with the package for n <= 100. A bigger one is simulated on the first
+    use and kept in the cache file, so it is only calculated once per machine.
+
+    Parameters
+    ----------
+    size : int
+        The size n of the matrices.
+
+    Returns
+    -------
+    float
+        The random index.
+    """
+    if size in const.HOMOGENEITY_INDEXES:
+        return const.HOMOGENEITY_INDEXES[size]
+    if size in const.SIMULATED_HOMOGENEITY_INDEXES:
+        return const.SIMULATED_HOMOGENEITY_INDEXES[size]
+
+    generated_indexes = _load_generated_indexes()
+    if size not in generated_indexes:
+        generated_indexes[size] = round(generate_random_index(size, GENERATED_SAMPLES, seed=size), 4)
+        _save_generated_indexes(generated_indexes)
+    return generated_indexes[size]
+
+
+def get_cache_path():
+    """
+    Get the path of the file with the simulated random indexes.
+
+    Returns
+    -------
+    str
+        The 'random_indexes.json' file in the ANAHIEPRO_CACHE_DIR directory if
+        the variable is set, in XDG_CACHE_HOME/anahiepro or ~/.cache/anahiepro otherwise.
+        An empty variable is taken as unset, as the XDG specification requires.
+    """
+    directory = os.environ.get("ANAHIEPRO_CACHE_DIR")
+    if not directory:
+        directory = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                                 "anahiepro")
+    return os.path.join(directory, "random_indexes.json")
+
+
+def _load_generated_indexes():
+    """
+    Read the cache file once per process, an absent or broken file is an empty cache.
+    """
+    global _generated_indexes
+    if _generated_indexes is None:
+        try:
+            with open(get_cache_path()) as file:
+                _generated_indexes = {int(size): float(index) for (size, index) in json.load(file).items()}
+        except (OSError, ValueError, AttributeError):
+            _generated_indexes = {}
+    return _generated_indexes
+
+
+def _save_generated_indexes(generated_indexes):
+    """
+    Write the cache file atomically. The cache is only an optimization, so a failed write is ignored.
+    """
+    path = get_cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        with open(temporary_path, "w") as file:
+            json.dump({str(size): index for (size, index) in sorted(generated_indexes.items())}, file, indent=1)
+        os.replace(temporary_path, path)
+    except OSError:
+        pass
@@ -0,0 +1,54 @@
+"""
+    Measure the JudgmentScheduler: the time of proposing a pair and of adding
+    the answer, and how many judgments it asks for before it is confident,
+    against all the n(n-1)/2 judgments of a complete matrix.
+
+    Run it from the root of the repository:
+
+        python benchmarks/judgment_scheduler_benchmark.py [size] [noise]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anahiepro.incomplete_pairwise import IncompletePairwiseComparisonMatrix
+from anahiepro.judgment_scheduler import JudgmentScheduler
+
+
+SIZE = 500
+NOISE = 0.1
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else SIZE
+    noise = float(sys.argv[2]) if len(sys.argv) > 2 else NOISE
+    rng = np.random.default_rng(0)
+    weights = rng.uniform(1, 9, size)
+
+    scheduler = JudgmentScheduler(IncompletePairwiseComparisonMatrix(size))
+    (propose_times, add_times) = ([], [])
+    while not scheduler.is_confident(0.95, tolerance=0.25):
+        start = time.perf_counter()
+        (i, j) = scheduler.propose()
+        propose_times.append(time.perf_counter() - start)
+
+        value = weights[i] / weights[j] * np.exp(rng.normal(0, noise))
+        start = time.perf_counter()
+        scheduler.add_judgment(i, j, value)
+        add_times.append(time.perf_counter() - start)
+
+    # The priorities are defined up to a factor, so the log-errors are centered.
+    errors = np.log(scheduler.get_priority_vector()) - np.log(weights)
+    errors -= errors.mean()
+    print(f"size: {size}, noise: {noise}")
+    print(f"judgments: {len(scheduler.pcm)} of {size * (size - 1) // 2}")
+    print(f"median propose: {np.median(propose_times) * 1e3:.3f}ms, median add_judgment: {np.median(add_times) * 1e3:.3f}ms")
+    print(f"biggest relative error of the priorities: {np.expm1(np.abs(errors).max()):.3f}")
+
+
+if __name__ == "__main__":
+    main()
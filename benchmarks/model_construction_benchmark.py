@@ -0,0 +1,62 @@
+"""
+    Measure building a model from the parent indexes (Model.from_parents)
+    against building it from nested Criteria objects, for hierarchies with
+    three levels of criterias. Both times include creating the criterias.
+
+    Run it from the root of the repository:
+
+        python benchmarks/model_construction_benchmark.py [criterias...]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anahiepro.models.model import Model
+from anahiepro.nodes import Problem, Criteria, Alternative
+
+
+CRITERIAS_NUMS = (10000, 30000, 100000)
+ALTERNATIVES_NUM = 5
+
+
+def create_parents(criterias_num):
+    """Three levels with the same fan-out, the rest of the criterias are the leaves."""
+    fan_out = max(1, round(criterias_num ** (1 / 3)))
+    leaves_num = criterias_num - fan_out - fan_out ** 2
+    return np.concatenate((np.full(fan_out, -1),
+                           np.repeat(np.arange(fan_out), fan_out),
+                           fan_out + np.arange(leaves_num) * fan_out ** 2 // leaves_num))
+
+
+def create_criterias(names, parents):
+    nodes = [Criteria(name) for name in names]
+    for node, parent in zip(nodes, parents):
+        if parent >= 0:
+            nodes[parent].add_child(node)
+    return [node for node, parent in zip(nodes, parents) if parent < 0]
+
+
+def main():
+    criterias_nums = [int(argument) for argument in sys.argv[1:]] or CRITERIAS_NUMS
+    for criterias_num in criterias_nums:
+        parents = create_parents(criterias_num)
+        names = [f"Criteria{index}" for index in range(len(parents))]
+
+        start = time.perf_counter()
+        Model.from_parents(Problem(), names, parents, [Alternative() for _ in range(ALTERNATIVES_NUM)])
+        from_parents_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        Model(Problem(), create_criterias(names, parents), [Alternative() for _ in range(ALTERNATIVES_NUM)])
+        nested_time = time.perf_counter() - start
+
+        print(f"criterias: {len(parents)}, from_parents: {from_parents_time:.3f}s, "
+              f"nested criterias: {nested_time:.3f}s, speedup: {nested_time / from_parents_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+    Compare the accuracy and the speed of the priority methods against the 'eig' method.
+
+    Run it from the root of the repository:
+
+        python benchmarks/priority_methods_benchmark.py
+"""
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anahiepro.pairwise import calculate_batch
+from anahiepro.priority_methods import PRIORITY_METHODS
+
+
+SIZES = (3, 5, 10, 20, 50, 100, 200)
+MATRICES_NUM = 50
+REPEAT = 5
+
+
+def random_pcms(number, size, rng, noise=0.3):
+    """
+    Generate near-consistent pairwise comparison matrices with log-normal noise.
+    """
+    weights = rng.uniform(1, 9, size=(number, size))
+    log_matrices = np.log(weights[:, :, np.newaxis] / weights[:, np.newaxis, :])
+    log_matrices += np.triu(rng.normal(0, noise, size=(number, size, size)), 1)
+    upper = np.triu(log_matrices, 1)
+    return np.exp(upper - np.swapaxes(upper, 1, 2))
+
+
+def main():
+    rng = np.random.default_rng(0)
+    header = f"{'n':>4} {'method':>24} {'ms / matrix':>12} {'speedup':>8} {'max |dw|':>10} {'max |dCR|':>10}"
+    print(header)
+    print("-" * len(header))
+
+    for size in SIZES:
+        matrices = random_pcms(MATRICES_NUM, size, rng)
+        timings = {}
+        results = {}
+        for name in PRIORITY_METHODS:
+            timings[name] = min(timeit.repeat(lambda: calculate_batch(matrices, name), number=1, repeat=REPEAT))
+            results[name] = calculate_batch(matrices, name)
+
+        (eig_vectors, eig_ratios) = results["eig"]
+        eig_vectors = np.abs(eig_vectors)
+        for name in PRIORITY_METHODS:
+            (vectors, ratios) = results[name]
+            vector_error = np.max(np.abs(np.abs(vectors) - eig_vectors))
+            ratio_error = np.nanmax(np.abs(ratios - eig_ratios)) if size > 2 else 0.0
+            print(f"{size:>4} {name:>24} {1000 * timings[name] / MATRICES_NUM:>12.4f} "
+                  f"{timings['eig'] / timings[name]:>8.2f} {vector_error:>10.2e} {ratio_error:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
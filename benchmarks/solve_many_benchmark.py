@@ -0,0 +1,76 @@
+"""
+    Measure solve_many against calling Model.solve in a loop.
+
+    It also shows what a worker receives: the size of the pickled snapshot of
+    a model against the pickled node graph, and the time of taking the snapshots.
+
+    Run it from the root of the repository:
+
+        python benchmarks/solve_many_benchmark.py [models] [workers]
+"""
+import os
+import pickle
+import sys
+import time
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anahiepro.models.model import Model
+from anahiepro.models.parallel import solve_many
+from anahiepro.models._compact_model import _compact_model
+from anahiepro.nodes import Problem, Criteria, Alternative
+
+
+MODELS_NUM = 20000
+WORKERS = os.cpu_count()
+
+
+def consistent_pcm(size, rng):
+    weights = rng.uniform(1, 9, size)
+    return weights[:, np.newaxis] / weights[np.newaxis, :]
+
+
+def create_model(rng):
+    criterias = [{Criteria(): [{Criteria(): None}, {Criteria(): None}, {Criteria(): None}]},
+                 {Criteria(): [{Criteria(): None}, {Criteria(): None}]},
+                 {Criteria(): [{Criteria(): None}, {Criteria(): None}, {Criteria(): None}]}]
+    model = Model(Problem(), criterias, [Alternative() for _ in range(5)])
+    model.get_problem().set_matrix(consistent_pcm(3, rng), validate=False)
+    for key in model.get_criterias_name_ids():
+        criteria = model[key]
+        criteria.set_matrix(consistent_pcm(len(criteria.get_children()), rng), validate=False)
+    return model
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main():
+    models_num = int(sys.argv[1]) if len(sys.argv) > 1 else MODELS_NUM
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else WORKERS
+    rng = np.random.default_rng(0)
+    models = [create_model(rng) for _ in range(models_num)]
+
+    (snapshot_time, snapshots) = timed(lambda: [_compact_model(model) for model in models])
+    print(f"models: {models_num}, workers: {workers}")
+    print(f"pickled model: {len(pickle.dumps(models[0]))} bytes, pickled snapshot: {len(pickle.dumps(snapshots[0]))} bytes")
+    print(f"taking the snapshots: {snapshot_time:.3f}s")
+
+    (in_process_time, in_process) = timed(lambda: solve_many(models))
+    (pool_time, pooled) = timed(lambda: solve_many(models, workers=workers))
+    (loop_time, looped) = timed(lambda: [model.solve() for model in models])
+
+    assert all(np.allclose(a, b) for a, b in zip(looped, in_process))
+    assert all(np.allclose(a, b) for a, b in zip(looped, pooled))
+    print(f"Model.solve loop:            {loop_time:.3f}s")
+    print(f"solve_many in process:       {in_process_time:.3f}s")
+    print(f"solve_many with {workers:>2} workers: {pool_time:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
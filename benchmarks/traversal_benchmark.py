@@ -0,0 +1,75 @@
+"""
+    Measure building, solving and showing models with deep chains and wide
+    fans of criterias, and the iterators over their nodes against a recursive
+    traversal. The recursive traversal is skipped for the chains deeper than
+    the recursion limit, which the models handle now.
+
+    Run it from the root of the repository:
+
+        python benchmarks/traversal_benchmark.py [depth] [width]
+"""
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from anahiepro.models.model import Model
+from anahiepro.nodes import Problem, Criteria, Alternative
+
+
+DEPTH = 5000
+WIDTH = 300
+ALTERNATIVES_NUM = 3
+
+
+def create_chain(depth):
+    criteria = Criteria()
+    for _ in range(depth - 1):
+        criteria = Criteria(children=[criteria])
+    return [criteria]
+
+
+def create_fan(width):
+    return [Criteria(children=[Criteria() for _ in range(width)]) for _ in range(width)]
+
+
+def recursive_preorder(node, nodes):
+    nodes.append(node)
+    for child in node.get_children():
+        recursive_preorder(child, nodes)
+    return nodes
+
+
+def measure(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def run(title, criterias):
+    (build_time, model) = measure(lambda: Model(Problem(), criterias, [Alternative() for _ in range(ALTERNATIVES_NUM)]))
+    (solve_time, _) = measure(model.solve)
+    (show_time, _) = measure(model.show)
+    print(f"{title}: build {build_time:.3f}s, solve {solve_time:.3f}s, show {show_time:.3f}s")
+
+    for name in ("iter_preorder", "iter_postorder", "iter_levels"):
+        (iterate_time, _) = measure(lambda: sum(1 for _ in getattr(model, name)()))
+        print(f"    {name}: {iterate_time * 1e3:.1f}ms")
+
+    try:
+        (recursive_time, _) = measure(lambda: recursive_preorder(model.get_problem(), []))
+        print(f"    recursive pre-order: {recursive_time * 1e3:.1f}ms")
+    except RecursionError:
+        print("    recursive pre-order: RecursionError")
+
+
+def main():
+    depth = int(sys.argv[1]) if len(sys.argv) > 1 else DEPTH
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else WIDTH
+    run(f"chain of {depth} criterias", create_chain(depth))
+    run(f"fan of {width} criterias with {width} children each", create_fan(width))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+import set_up_test_pathes
+
+import numpy as np
+from anahiepro.nodes import Problem, Criteria, Alternative, DummyCriteria
+
+
+def reset_ids():
+    """Start the ids, and so the default names, of the new nodes from 0."""
+    Problem._problem_id = 0
+    Criteria._criteria_id = 0
+    Alternative._alternative_id = 0
+    DummyCriteria._dummy_criteria_id = 0
+
+
+def random_pcm(size, rng, spread=0.2):
+    """
+    Create a pairwise comparison matrix of random weights with the noise of the judgments.
+
+    Parameters
+    ----------
+    size : int
+        The size of the matrix.
+    rng : numpy.random.Generator
+        The generator of the weights and the noise.
+    spread : float, optional
+        The standard deviation of the log-normal noise of each judgment (default is 0.2).
+
+    Returns
+    -------
+    numpy.ndarray
+        The positive reciprocal matrix.
+    """
+    weights = rng.uniform(1, 9, size)
+    noise = np.triu(rng.normal(0, spread, (size, size)), 1)
+    return weights[:, np.newaxis] / weights[np.newaxis, :] * np.exp(noise - noise.T)
+
+
+def fill_model(model, rng, spread=0.2):
+    """Set the random matrices to the problem and all the criterias of the model."""
+    model.get_problem().set_matrix(random_pcm(len(model.get_problem().get_children()), rng, spread))
+    for key in model.get_criterias_name_ids():
+        model[key].set_matrix(random_pcm(len(model[key].get_children()), rng, spread))
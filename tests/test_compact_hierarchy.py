@@ -0,0 +1,98 @@
+import set_up_test_pathes
+
+import unittest
+import numpy as np
+from anahiepro.compact_hierarchy import CompactHierarchy, NodeView
+from anahiepro.models.model import Model
+from anahiepro.nodes import Problem, Criteria, Alternative
+from anahiepro.models.vary_depth_model import VaryDepthModel
+from fixtures import reset_ids, random_pcm
+
+
+
+class TestCompactHierarchy(unittest.TestCase):
+    def setUp(self):
+        reset_ids()
+        self.rng = np.random.default_rng(0)
+
+        # The nodes are given out of the level order on purpose.
+        self.names = ["Criteria2", "Problem", "Criteria0", "Criteria1", "Criteria3"]
+        self.parents = [2, -1, 1, 1, 2]
+        self.hierarchy = CompactHierarchy(self.names, self.parents, ["A", "B", "C"])
+
+
+    def test_arrays(self):
+        self.assertEqual(self.hierarchy.names, ("Problem", "Criteria0", "Criteria1", "Criteria2", "Criteria3"))
+        np.testing.assert_array_equal(self.hierarchy.ids, [0, 1, 2, 0, 3])
+        np.testing.assert_array_equal(self.hierarchy.parents, [-1, 0, 0, 1, 1])
+        np.testing.assert_array_equal(self.hierarchy.child_offsets, [1, 3, 5, 5, 5, 5])
+        np.testing.assert_array_equal(self.hierarchy.level_offsets, [0, 1, 3, 5])
+        np.testing.assert_array_equal(self.hierarchy.sizes, [2, 2, 3, 3, 3])
+        self.assertEqual(len(self.hierarchy.judgments), 2 * 4 + 3 * 9)
+
+
+    def test_views(self):
+        criteria = self.hierarchy[("Criteria0", 1)]
+
+        self.assertIsInstance(criteria, NodeView)
+        self.assertEqual(criteria.get_key(), ("Criteria0", 1))
+        self.assertEqual([child.get_name() for child in criteria.get_children()], ["Criteria2", "Criteria3"])
+        self.assertEqual(criteria.get_parents(), [self.hierarchy.get_problem()])
+        self.assertEqual([child.get_name() for child in self.hierarchy[3].get_children()], ["A", "B", "C"])
+        self.assertEqual(len(self.hierarchy.get_alternatives()[0].get_parents()), 3)
+        self.assertIsNone(self.hierarchy.get_alternatives()[0].get_pcm())
+
+        matrix = random_pcm(2, self.rng)
+        criteria.set_matrix(matrix)
+        np.testing.assert_array_almost_equal(criteria.get_pcm(), matrix)
+        criteria.set_comparison(0, 1, 5)
+        self.assertAlmostEqual(criteria.get_pcm()[1, 0], 1/5)
+        np.testing.assert_array_almost_equal(np.abs(criteria.get_priority_vector()),
+                                             np.array([5, 1]) / np.linalg.norm([5, 1]))
+
+        with self.assertRaises(ValueError):
+            criteria.set_matrix([[1, 2], [2, 1]])
+        with self.assertRaises(NotImplementedError):
+            self.hierarchy.get_alternatives()[0].set_matrix(matrix)
+
+
+    def test_find_criteria(self):
+        with self.assertRaises(KeyError):
+            self.hierarchy.find_criteria("Criteria0")
+        with self.assertRaises(ValueError):
+            self.hierarchy.find_criteria(("Criteria0", 7))
+        with self.assertRaises(IndexError):
+            self.hierarchy[5]
+
+
+    def test_invalid_parents(self):
+        with self.assertRaises(ValueError):
+            CompactHierarchy(["P", "Q"], [-1, -1], ["A"])
+        with self.assertRaises(ValueError):
+            CompactHierarchy(["P", "C"], [-1, 2], ["A"])
+        with self.assertRaises(ValueError):
+            CompactHierarchy(["P", "C0", "C1"], [-1, 2, 1], ["A"])
+        with self.assertRaises(ValueError):
+            CompactHierarchy(["P"], [-1], [])
+
+
+    def test_same_as_model(self):
+        for model_type in (Model, VaryDepthModel):
+            criterias = [{Criteria(): [{Criteria(): None}, {Criteria(): None}]},
+                         {Criteria(): [{Criteria(): None}, {Criteria(): None}, {Criteria(): None}]}] \
+                        if model_type is Model else \
+                        [{Criteria(): [{Criteria(): None}, {Criteria(): None}]},
+                         {Criteria(): [{Criteria(): [{Criteria(): None}]}, {Criteria(): None}]}]
+            model = model_type(Problem(), criterias, [Alternative() for _ in range(4)])
+            for node in model._get_nodes_with_pcm():
+                node.set_matrix(random_pcm(len(node.get_children()), self.rng))
+
+            hierarchy = CompactHierarchy.from_model(model)
+            np.testing.assert_array_almost_equal(hierarchy.solve(), model.solve())
+            self.assertEqual(hierarchy.show(), Model.show(model))  # The implicit DummyCriteria are not copied.
+            self.assertEqual(set(hierarchy.get_criterias_name_ids()), set(Model.get_criterias_name_ids(model)))
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,8 +1,10 @@
 import set_up_test_pathes
 
 import unittest
-from anahiepro.models.model import Model, Problem, Criteria, Alternative
+from anahiepro.models.model import Model
+from anahiepro.nodes import Problem, Criteria, Alternative
 from anahiepro.models._criterias_builders._wrapper_criteria_builder import _WrapperCriteriaBuilder, _EmptyCriteriaBuilder, _ListCriteriaBuilder, _ListDictCriteriaBuilder
+from anahiepro.models._depth_analysis import _DepthAnalysis
 
 
 
@@ -190,5 +192,62 @@ class TestWrapperCriteriaBuilder(unittest.TestCase):
             
 
 
+
+class TestDepthAnalysis(unittest.TestCase):
+    def test_min_and_max_depths(self):
+        leaf = Criteria()
+        criteria = Criteria(children=[Criteria(children=[Criteria()]), leaf])
+        analysis = _DepthAnalysis(lambda item: item.get_children())
+        
+        self.assertEqual(analysis.get_depths(criteria), (2, 3))
+        self.assertEqual(analysis.get_depths(leaf), (1, 1))
+        self.assertEqual(analysis.get_range([criteria, Criteria(children=[Criteria()])]), (2, 3))
+        self.assertEqual(analysis.get_range([]), (0, 0))
+        self.assertFalse(analysis.has_same_depth([criteria]))
+    
+    
+    def test_unbalanced_branch_with_same_max_depth(self):
+        criterias = [Criteria(children=[Criteria(children=[Criteria()]), Criteria()]),
+                     Criteria(children=[Criteria(children=[Criteria()])])]
+        self.assertFalse(_ListCriteriaBuilder(criterias).has_same_depth())
+        with self.assertRaises(TypeError):
+            _ListCriteriaBuilder(criterias).build_criteria()
+    
+    
+    def test_subtrees_are_analysed_once(self):
+        calls = []
+        def get_children(item):
+            calls.append(item)
+            return item.get_children()
+        
+        chain = Criteria()
+        for _ in range(3000):  # Deeper than the recursion limit.
+            chain = Criteria(children=[chain])
+        analysis = _DepthAnalysis(get_children)
+        
+        self.assertEqual(analysis.get_range([chain, chain.get_children()[0]]), (3000, 3001))
+        self.assertTrue(analysis.has_same_depth([chain]))
+        keys = [criteria.get_key() for criteria in calls]
+        self.assertEqual(len(set(keys)), len(keys), "A subtree was analysed more than once.")
+    
+    
+    def test_shared_depth_analysis(self):
+        builder = _WrapperCriteriaBuilder([Criteria(children=[Criteria()]), Criteria()])
+        self.assertEqual(builder.get_depth(), (1, 2))
+        self.assertEqual(len(builder._builder.depth_analysis._depths), 3)
+    
+    
+    def test_cycle(self):
+        criteria = Criteria()
+        criteria.add_child(Criteria(children=[criteria]))
+        with self.assertRaises(TypeError):
+            _ListCriteriaBuilder([criteria]).has_same_depth()
+
+        criteria = Criteria()
+        criteria._children = [criteria]
+        with self.assertRaises(TypeError):
+            _ListCriteriaBuilder([criteria]).has_same_depth()
+
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,78 @@
+import set_up_test_pathes
+
+import unittest
+import numpy as np
+from anahiepro.models.model import Model
+from anahiepro.nodes import Problem, Criteria, Alternative
+from anahiepro.models.vary_depth_model import VaryDepthModel
+from anahiepro.models.evaluation_plan import EvaluationPlan
+from fixtures import reset_ids, random_pcm, fill_model
+
+
+
+class TestEvaluationPlan(unittest.TestCase):
+    def setUp(self):
+        reset_ids()
+        self.rng = np.random.default_rng(0)
+        
+        criterias = [
+            {Criteria(): [{Criteria(): None}, {Criteria(): None}, {Criteria(): None}]},
+            {Criteria(): [{Criteria(): [{Criteria(): None}, {Criteria(): None}]}]}
+        ]
+        self.model = VaryDepthModel(Problem(), criterias, [Alternative() for _ in range(4)])
+        fill_model(self.model, self.rng, 0.3)
+
+
+    def test_compile(self):
+        plan = self.model.compile()
+        
+        self.assertIsInstance(plan, EvaluationPlan)
+        self.assertEqual(len(plan), len(plan.get_nodes()))
+        self.assertIs(plan.get_nodes()[0], self.model.get_problem())
+        self.assertFalse(plan.offsets.flags.writeable, "The structure of the plan must be immutable.")
+        
+        for index, node in enumerate(plan.get_nodes()):
+            if not plan.leaves[index]:
+                children = plan.get_nodes()[plan.child_offsets[index]:plan.child_offsets[index + 1]]
+                self.assertEqual(list(children), node.get_children())
+
+
+    def test_solve_matches_model(self):
+        plan = self.model.compile()
+        np.testing.assert_array_almost_equal(plan.solve(), self.model.solve())
+
+
+    def test_solve_reuses_buffers(self):
+        plan = self.model.compile()
+        first = plan.solve()
+        self.assertIs(plan.solve(), first)
+        self.assertFalse(first.flags.writeable)
+
+
+    def test_refresh_after_change(self):
+        plan = self.model.compile()
+        plan.solve()
+        
+        self.model[("Criteria1", 1)].set_comparison(0, 2, 7)
+        plan.refresh()
+        np.testing.assert_array_almost_equal(plan.solve(), self.model.solve())
+
+
+    def test_refresh_with_changed_structure(self):
+        plan = self.model.compile()
+        self.model[("Criteria0", 0)].set_matrix(np.ones((3, 3)))
+        self.model[("Criteria0", 0)].pcm.set_matrix(np.ones((2, 2)))
+        
+        with self.assertRaises(ValueError):
+            plan.refresh()
+
+
+    def test_model_without_criterias(self):
+        model = Model(Problem(), [], [Alternative() for _ in range(3)])
+        model.get_problem().set_matrix(random_pcm(3, self.rng, 0.3))
+        np.testing.assert_array_almost_equal(model.compile().solve(), model.solve())
+
+
+
+if __name__ == "__main__":
+    unittest.main()
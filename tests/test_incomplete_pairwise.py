@@ -0,0 +1,114 @@
+import set_up_test_pathes
+
+import unittest
+import numpy as np
+from anahiepro.incomplete_pairwise import IncompletePairwiseComparisonMatrix
+from anahiepro.pairwise import PairwiseComparisonMatrix
+from fixtures import random_pcm
+
+
+
+class TestIncompletePairwiseComparisonMatrix(unittest.TestCase):
+    def setUp(self):
+        self.matrix = random_pcm(6, np.random.default_rng(0), 0.3)
+        self.pairs = [(0, 1), (1, 2), (2, 3), (3, 4), (4, 5), (0, 5), (1, 4)]
+        self.pcm = IncompletePairwiseComparisonMatrix(6, {(i, j): self.matrix[i, j] for (i, j) in self.pairs})
+
+
+    def complete_pcm(self, priority_method):
+        return IncompletePairwiseComparisonMatrix(6, [(i, j, self.matrix[i, j]) for i in range(6) for j in range(i + 1, 6)],
+                                                  priority_method)
+
+
+    def test_judgments(self):
+        self.assertEqual(len(self.pcm), 7)
+        self.assertFalse(self.pcm.is_complete())
+        self.assertAlmostEqual(self.pcm[1, 0], self.matrix[1, 0])
+        self.assertTrue(np.isnan(self.pcm[0, 2]))
+        self.assertEqual(self.pcm[3, 3], 1)
+
+        self.pcm[2, 0] = 4
+        self.assertTrue(self.pcm.has_comparison(0, 2))
+        self.assertAlmostEqual(self.pcm[0, 2], 1/4)
+        self.pcm.remove_comparison(0, 2)
+        self.assertFalse(self.pcm.has_comparison(2, 0))
+
+        (rows, cols, values) = self.pcm.get_judgments()
+        np.testing.assert_array_equal(rows < cols, True)
+        np.testing.assert_array_almost_equal(values, self.matrix[rows, cols])
+        matrix = self.pcm.get_matrix()
+        self.assertEqual(np.isnan(matrix).sum(), 2 * (15 - 7))
+
+
+    def test_invalid_judgments(self):
+        with self.assertRaises(ValueError):
+            self.pcm.set_comparison(0, 1, 0)
+        with self.assertRaises(ValueError):
+            self.pcm.set_comparison(1, 1, 2)
+        with self.assertRaises(IndexError):
+            self.pcm.set_comparison(0, 6, 2)
+
+
+    def test_connectivity(self):
+        self.assertTrue(self.pcm.is_connected())
+
+        pcm = IncompletePairwiseComparisonMatrix(4, [(0, 1, 2), (3, 2, 3)])
+        self.assertFalse(pcm.is_connected())
+        np.testing.assert_array_equal(pcm.get_components(), [0, 0, 2, 2])
+        with self.assertRaises(ValueError):
+            pcm.calculate_priority_vector()
+
+
+    def test_complete_matrix(self):
+        llsm = self.complete_pcm("llsm")
+        geometric_mean = PairwiseComparisonMatrix(matrix=self.matrix, priority_method="geometric_mean")
+        np.testing.assert_array_almost_equal(llsm.calculate_priority_vector(), geometric_mean.calculate_priority_vector())
+        self.assertAlmostEqual(llsm.calculate_consistency_ratio(), geometric_mean.calculate_consistency_ratio())
+
+        harker = self.complete_pcm("harker")
+        eig = PairwiseComparisonMatrix(matrix=self.matrix)
+        np.testing.assert_array_almost_equal(harker.calculate_priority_vector(), np.abs(eig.calculate_priority_vector()))
+        self.assertAlmostEqual(harker.calculate_consistency_ratio(), eig.calculate_consistency_ratio())
+
+
+    def test_llsm(self):
+        priority_vector = self.pcm.calculate_priority_vector()
+
+        # The vector minimizes the squared log-residuals of the known judgments.
+        (rows, cols, values) = self.pcm.get_judgments()
+        design = np.zeros((len(rows), 6))
+        design[np.arange(len(rows)), rows] = 1
+        design[np.arange(len(rows)), cols] = -1
+        (log_weights, *_) = np.linalg.lstsq(design, np.log(values), rcond=None)
+        expected = np.exp(log_weights) / np.linalg.norm(np.exp(log_weights))
+        np.testing.assert_array_almost_equal(priority_vector, expected)
+
+        completed = self.pcm.complete()
+        self.assertIsInstance(completed, PairwiseComparisonMatrix)
+        self.assertAlmostEqual(completed[0, 1], self.matrix[0, 1])
+        np.testing.assert_array_almost_equal(completed.calculate_priority_vector(), priority_vector)
+
+
+    def test_harker(self):
+        self.pcm.priority_method = "harker"
+
+        (rows, cols, values) = self.pcm.get_judgments()
+        matrix = np.zeros((6, 6))
+        matrix[rows, cols] = values
+        matrix[cols, rows] = 1 / values
+        np.fill_diagonal(matrix, 6 - np.count_nonzero(matrix, axis=1))
+        eigvals, eigvecs = np.linalg.eig(matrix)
+        expected = np.abs(np.real(eigvecs[:, np.argmax(np.real(eigvals))]))
+
+        np.testing.assert_array_almost_equal(self.pcm.calculate_priority_vector(), expected)
+
+
+    def test_complete_only_methods(self):
+        self.pcm.priority_method = "eig"
+        with self.assertRaises(NotImplementedError):
+            self.pcm.calculate_priority_vector()
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import set_up_test_pathes
+
+import unittest
+import numpy as np
+from anahiepro.incomplete_pairwise import IncompletePairwiseComparisonMatrix
+from anahiepro.judgment_scheduler import JudgmentScheduler
+
+
+
+class TestJudgmentScheduler(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.weights = self.rng.uniform(1, 9, 8)
+
+
+    def judge(self, i, j, noise=0.1):
+        return self.weights[i] / self.weights[j] * np.exp(self.rng.normal(0, noise))
+
+
+    def fill(self, scheduler, steps):
+        for _ in range(steps):
+            (i, j) = scheduler.propose()
+            scheduler.add_judgment(i, j, self.judge(i, j))
+
+
+    def test_incremental_update(self):
+        scheduler = JudgmentScheduler(IncompletePairwiseComparisonMatrix(8))
+        self.fill(scheduler, 12)
+        scheduler.add_judgment(3, 1, 2)
+        scheduler.add_judgment(1, 3, 4)
+
+        rebuilt = JudgmentScheduler(scheduler.pcm)
+        np.testing.assert_allclose(scheduler._inverse, rebuilt._inverse, atol=1e-6)
+        np.testing.assert_allclose(scheduler._resistances, rebuilt._resistances, atol=1e-6)
+        np.testing.assert_array_almost_equal(scheduler._log_weights, rebuilt._log_weights)
+        self.assertAlmostEqual(scheduler._squared_errors, rebuilt._squared_errors)
+        np.testing.assert_array_almost_equal(scheduler.get_priority_vector(), scheduler.pcm.calculate_priority_vector())
+
+
+    def test_connects_items_first(self):
+        scheduler = JudgmentScheduler(IncompletePairwiseComparisonMatrix(8))
+        self.fill(scheduler, 7)
+        self.assertTrue(scheduler.pcm.is_connected())
+
+
+    def test_complete_matrix(self):
+        scheduler = JudgmentScheduler(IncompletePairwiseComparisonMatrix(4))
+        self.fill(scheduler, 6)
+        self.assertTrue(scheduler.pcm.is_complete())
+        self.assertIsNone(scheduler.propose())
+        self.assertTrue(scheduler.is_confident())
+
+
+    def test_top_k(self):
+        scheduler = JudgmentScheduler(IncompletePairwiseComparisonMatrix(8), top_k=2)
+        self.fill(scheduler, 10)
+
+        top = set(np.argsort(-scheduler.get_priority_vector())[:2])
+        (i, j) = scheduler.propose()
+        self.assertTrue(i in top or j in top)
+        with self.assertRaises(ValueError):
+            JudgmentScheduler(IncompletePairwiseComparisonMatrix(8), top_k=0)
+
+
+    def test_stops_before_complete(self):
+        scheduler = JudgmentScheduler(IncompletePairwiseComparisonMatrix(8), noise=0.01)
+        self.assertFalse(scheduler.is_confident())
+
+        while not scheduler.is_confident(0.95):
+            (i, j) = scheduler.propose()
+            scheduler.add_judgment(i, j, self.weights[i] / self.weights[j])
+
+        self.assertLess(len(scheduler.pcm), 28)
+        np.testing.assert_array_almost_equal(scheduler.get_priority_vector(), self.weights / np.linalg.norm(self.weights))
+
+
+    def test_noise(self):
+        scheduler = JudgmentScheduler(IncompletePairwiseComparisonMatrix(8))
+        self.assertAlmostEqual(scheduler.get_noise(), JudgmentScheduler.DEFAULT_NOISE)
+        self.assertEqual(JudgmentScheduler(scheduler.pcm, noise=0.2).get_noise(), 0.2)
+
+
+
+if __name__ == '__main__':
+    unittest.main()
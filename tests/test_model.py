@@ -2,8 +2,12 @@ import os
 import set_up_test_pathes
 
 import unittest
+from unittest.mock import patch
 import numpy as np
-from anahiepro.models.model import Model, Problem, Criteria, Alternative
+from anahiepro.models.model import Model, Problem, Alternative
+from anahiepro.models.vary_depth_model import VaryDepthModel
+from anahiepro.nodes import Criteria, DummyCriteria
+from fixtures import reset_ids, fill_model
 
 
 
@@ -26,9 +30,7 @@ def load_data(file_path):
 
 class TestModelCreation(unittest.TestCase):
     def setUp(self):
-        Problem._problem_id = 0
-        Criteria._criteria_id = 0
-        Alternative._alternative_id = 0
+        reset_ids()
         
         self.problem = Problem()
         self.criterias = [Criteria(), Criteria()]
@@ -53,7 +55,7 @@ class TestModelCreation(unittest.TestCase):
             Model(self.problem, dict(), self.alternatives)
 
 
-    def test_ivalid_criterias_with_diff_depth(self):
+    def test_criterias_with_diff_depth(self):
         list_dict = [{Criteria("Criteria1"): [
                         {Criteria("Criteria2"): [{Criteria("Criteria7"): None}]},
                         {Criteria("Criteria3"): [{Criteria("Criteria7"): None}]}
@@ -68,11 +70,11 @@ class TestModelCreation(unittest.TestCase):
         list_criterias = [Criteria("Criteria1", [Criteria("Criteria2"), Criteria("Criteria3")]),
                           Criteria("Criteria5", [Criteria("Criteria4"), Criteria("Criteria6", [Criteria("Criteria7")])])]
 
-        invalide_criterias = [list_dict, list_criterias]
-        
-        for invalide_criteria in invalide_criterias:
-            with self.assertRaises(TypeError):
-                Model(self.problem, invalide_criteria, self.alternatives)
+        for criterias in [list_dict, list_criterias]:
+            self.setUp()
+            model = Model(self.problem, criterias, self.alternatives)
+            self.assertEqual(model.solve().shape, (len(self.alternatives),))
+            self.assertNotIn("DummyCriteria", model.show())
 
 
     def test_invalid_criterias_list_dict(self):
@@ -141,13 +143,69 @@ class TestModelCreation(unittest.TestCase):
         self.assertIsInstance(model, Model)
         self.assertEqual(model.criterias, [], "The criterias list is not empty")
 
-    
+
+
+class TestModelFromParents(unittest.TestCase):
+    def setUp(self):
+        reset_ids()
+
+        self.names = ["Criteria0", "Criteria1", "Criteria2", "Criteria3", "Criteria4", "Criteria5"]
+        self.parents = [-1, -1, 0, 1, 0, 1]
+        self.alternatives = [Alternative(), Alternative()]
+
+
+    def test_same_as_nested_criterias(self):
+        model = Model.from_parents(Problem(), self.names, self.parents, self.alternatives)
+
+        criterias = [Criteria("Criteria0"), Criteria("Criteria1")]
+        nested_criterias = [Criteria("Criteria2"), Criteria("Criteria3"), Criteria("Criteria4"), Criteria("Criteria5")]
+        for (criteria, parent) in zip(nested_criterias, self.parents[2:]):
+            criterias[parent].add_child(criteria)
+        nested_model = Model(Problem(), criterias, self.alternatives)
+
+        self.assertEqual(model.show().replace("Problem0", "Problem1"), nested_model.show())
+        self.assertEqual(repr(model.criterias), repr(nested_model.criterias))
+        # The nested criterias are copied with new ids, so only the names are compared.
+        self.assertEqual([name for (name, _) in model.get_criterias_name_ids()],
+                         [name for (name, _) in nested_model.get_criterias_name_ids()])
+        self.assertEqual([criteria._id for criteria in model._criteria_index.values()],
+                         [0, 2, 4, 1, 3, 5])
+
+        matrix = [[1, 3], [1/3, 1]]
+        for (key, nested_key) in zip(model.get_criterias_name_ids(), nested_model.get_criterias_name_ids()):
+            if key[0] in ("Criteria0", "Criteria3"):
+                model.attach_criteria_pcm(key, matrix)
+                nested_model.attach_criteria_pcm(nested_key, matrix)
+        np.testing.assert_array_almost_equal(model.solve(), nested_model.solve())
+
+
+    def test_without_criterias(self):
+        model = Model.from_parents(Problem(), [], [], self.alternatives)
+        self.assertEqual(model.criterias, [])
+        self.assertEqual(model.get_problem().get_children(), self.alternatives)
+        np.testing.assert_array_almost_equal(model.solve(), Model(Problem(), [], self.alternatives).solve())
+
+
+    def test_invalid_parents(self):
+        invalid_parents = [[-1, -1, 0, 1, 0], [-1, -1, 0, 1, 0, 6], [-1, -1, 0, 1, 0, -2],
+                           [-1, 3, 0, 1, 0, 1], [-1, -1, 0, 1, 0, 1.5]]
+        for parents in invalid_parents:
+            with self.assertRaises(ValueError):
+                Model.from_parents(Problem(), self.names, parents, self.alternatives)
+
+
+    def test_different_depths(self):
+        model = Model.from_parents(Problem(), self.names, [-1, -1, 0, 2, 0, 1], self.alternatives)
+        self.assertEqual(len(model.get_criterias_name_ids()), len(self.names))
+        self.assertEqual(model.solve().shape, (len(self.alternatives),))
+        with self.assertRaises(TypeError):
+            Model.from_parents(Problem(), self.names, self.parents, "alternatives")
+
+
 
 class TestModelFunctionality(unittest.TestCase):
     def setUp(self):
-        Problem._problem_id = 0
-        Criteria._criteria_id = 0
-        Alternative._alternative_id = 0
+        reset_ids()
         
         self.problem = Problem()
 
@@ -206,6 +264,30 @@ class TestModelFunctionality(unittest.TestCase):
             self.model.find_criteria(key_not_exist)
         
     
+    def test_criteria_index_matches_hierarchy(self):
+        criterias = []
+        stack = list(reversed(self.model.get_problem().get_children()))
+        while stack:
+            criteria = stack.pop()
+            criterias.append(criteria)
+            stack.extend(reversed([child for child in criteria.get_children() if isinstance(child, Criteria)]))
+        
+        self.assertEqual(list(self.model._criteria_index.values()), criterias)
+        for criteria in criterias:
+            self.assertIs(self.model.find_criteria(criteria.get_key()), criteria)
+
+
+    def test_deep_hierarchy(self):
+        criteria = Criteria()
+        for _ in range(3000):  # Deeper than the recursion limit.
+            criteria = Criteria(children=[criteria])
+        model = Model(Problem(), [criteria], self.alternatives)
+        
+        self.assertEqual(len(model.get_criterias_name_ids()), 3001)
+        self.assertEqual(len(list(model.iter_levels(alternatives=False))), 3002)
+        np.testing.assert_array_almost_equal(model.solve(), np.full(3, 1 / np.sqrt(3)))
+
+
     def test_get_criterias_name_ids(self):
         expected_name_ids = [("Criteria"+str(index), index) for index in range(8)]
         actual_name_ids = list(self.model.get_criterias_name_ids())
@@ -229,12 +311,297 @@ class TestModelFunctionality(unittest.TestCase):
             self.assertEqual(self.model[key].pcm.matrix.shape, (3, 3)) 
 
 
+    def test_repeated_solve_uses_cached_eigen_results(self):
+        first = self.model.solve()
+        eigens = [node.pcm._eigen for node in self.model._get_nodes_with_pcm()]
+        second = self.model.solve()
+        
+        np.testing.assert_array_equal(first, second)
+        for node, eigen in zip(self.model._get_nodes_with_pcm(), eigens):
+            self.assertIs(node.pcm._eigen, eigen, "The eigen-result was recalculated for unchanged model.")
+
+
+    def test_incremental_solve_after_one_change(self):
+        self.model.solve()
+        edited = self.model[("Criteria1", 1)]
+        sibling = self.model[("Criteria2", 2)]
+        other_branch = self.model[("Criteria4", 4)]
+        sibling_vector = sibling._global_vector
+        
+        edited.set_comparison(0, 1, 5)
+        
+        self.assertEqual(self.model._get_stale_nodes(), [self.model.get_problem(), self.model[("Criteria0", 0)], edited])
+        self.assertIsNone(edited._global_vector)
+        self.assertIsNotNone(other_branch._global_vector)
+        
+        result = self.model.solve()
+        self.assertIs(sibling._global_vector, sibling_vector, "The global vector of unchanged node was recalculated.")
+        
+        fresh_vectors = {}
+        for node in reversed(self.model._get_nodes_with_pcm()):
+            if isinstance(node.get_children()[0], Alternative):
+                fresh_vectors[id(node)] = node.get_priority_vector()
+            else:
+                matrix = np.column_stack([fresh_vectors[id(child)] for child in node.get_children()])
+                fresh_vectors[id(node)] = matrix.dot(np.abs(node.get_priority_vector()))
+        np.testing.assert_array_almost_equal(result, fresh_vectors[id(self.model.get_problem())])
+
+
+    def test_incremental_solve_matches_fresh_model(self):
+        rng = np.random.default_rng(0)
+        for _ in range(20):
+            fill_model(self.model, rng, 0.5)
+            self.model.solve()
+            edited = self.model[self.model.get_criterias_name_ids()[rng.integers(6)]]
+            edited.set_comparison(0, 1, rng.choice([1/7, 1/3, 3, 7]))
+            result = self.model.solve()
+
+            fresh_model = Model(Problem(), [{Criteria(): [{Criteria(): None} for _ in range(3)]} for _ in range(2)],
+                                [Alternative() for _ in range(3)])
+            fresh_model.get_problem().set_matrix(self.model.get_problem().get_pcm())
+            for (key, fresh_key) in zip(self.model.get_criterias_name_ids(), fresh_model.get_criterias_name_ids()):
+                fresh_model[fresh_key].set_matrix(self.model[key].get_pcm())
+
+            np.testing.assert_array_almost_equal(result, fresh_model.solve())
+            self.assertTrue(np.all(result > 0))
+
+
+    def test_attach_pcm_marks_ancestors_dirty(self):
+        self.model.solve()
+        self.model.attach_criteria_pcm(("Criteria5", 5), [[1, 2, 3], [1/2, 1, 2], [1/3, 1/2, 1]])
+        
+        self.assertIsNone(self.model[("Criteria5", 5)]._global_vector)
+        self.assertIsNone(self.model[("Criteria4", 4)]._global_vector)
+        self.assertIsNone(self.model.get_problem()._global_vector)
+        self.assertIsNotNone(self.model[("Criteria0", 0)]._global_vector)
+
+
+
+class TestVaryDepthModel(unittest.TestCase):
+    def setUp(self):
+        reset_ids()
+        
+        self.alternatives = [Alternative(), Alternative(), Alternative()]
+        self.model = VaryDepthModel(Problem(), self.create_criterias(), self.alternatives)
+    
+    
+    def create_criterias(self):
+        return [{Criteria(): [{Criteria(): [{Criteria(): None}]}, {Criteria(): None}]},
+                {Criteria(): None}]
+    
+    
+    def fill(self, model, rng):
+        for node in model._get_nodes_with_pcm():
+            if len(node.get_children()) > 1:
+                weights = rng.uniform(1, 9, len(node.get_children()))
+                node.set_matrix(weights[:, np.newaxis] / weights[np.newaxis, :])
+    
+    
+    def test_dummies_are_not_created(self):
+        nodes = self.model._get_nodes_with_pcm()
+        self.assertEqual(len(nodes), 6)
+        self.assertFalse(any(isinstance(node, DummyCriteria) for node in nodes))
+    
+    
+    def test_show(self):
+        lines = self.model.show().splitlines()
+        self.assertEqual(lines[:4], ["+Problem0", "+--Criteria0", "+----Criteria1", "+------Criteria2"])
+        self.assertEqual(lines[7:9], ["+----DummyCriteria0", "+------Criteria3"])
+        self.assertEqual(lines[12:14], ["+--DummyCriteria1", "+----DummyCriteria2"])
+        self.assertEqual(lines[14:], ["+------Criteria4", "+--------Alternative0", "+--------Alternative1", "+--------Alternative2"])
+    
+    
+    def test_lookups(self):
+        keys = self.model.get_criterias_name_ids()
+        self.assertEqual([name for (name, _) in keys],
+                         ["Criteria0", "Criteria1", "Criteria2", "DummyCriteria0", "Criteria3",
+                          "DummyCriteria1", "DummyCriteria2", "Criteria4"])
+        
+        dummy = self.model[keys[5]]
+        self.assertIsInstance(dummy, DummyCriteria)
+        self.assertEqual(dummy.get_key(), keys[5])
+        self.assertIs(self.model[keys[6]].get_parents()[0], dummy)
+        self.assertIs(self.model[keys[6]].get_children()[0], self.model[keys[7]])
+        np.testing.assert_array_equal(dummy.get_pcm(), [[1]])
+        self.assertIs(self.model[keys[5]], dummy)
+    
+    
+    def test_dummy_keys(self):
+        keys = self.model.get_criterias_name_ids()
+        self.assertEqual(len(set(keys)), len(keys))
+        self.assertEqual([keys[3], keys[5], keys[6]], [("DummyCriteria0", 5), ("DummyCriteria1", 5), ("DummyCriteria2", 5)])
+        self.assertEqual(self.model[("DummyCriteria1", 5)].get_key(), ("DummyCriteria1", 5))
+    
+    
+    def test_solve_as_normalized_hierarchy(self):
+        normalized_criterias = [{Criteria(): [{Criteria(): [{Criteria(): None}]},
+                                              {DummyCriteria(): [{Criteria(): None}]}]},
+                                {DummyCriteria(): [{DummyCriteria(): [{Criteria(): None}]}]}]
+        normalized_model = Model(Problem(), normalized_criterias, self.alternatives)
+        
+        self.fill(self.model, np.random.default_rng(0))
+        self.fill(normalized_model, np.random.default_rng(0))
+        self.assertEqual(len(normalized_model._get_nodes_with_pcm()), 9)
+        np.testing.assert_array_almost_equal(self.model.solve(), normalized_model.solve())
+    
+    
+    def test_solve_as_model(self):
+        model = Model(Problem(), self.create_criterias(), self.alternatives)
+        
+        self.fill(self.model, np.random.default_rng(0))
+        self.fill(model, np.random.default_rng(0))
+        self.assertEqual(len(model._get_nodes_with_pcm()), len(self.model._get_nodes_with_pcm()))
+        np.testing.assert_array_almost_equal(self.model.solve(), model.solve())
+
+
+
+class TestModelBulkJudgments(unittest.TestCase):
+    def setUp(self):
+        reset_ids()
+        
+        criterias = [
+            {Criteria(): [{Criteria(): None}, {Criteria(): None}, {Criteria(): None}]},
+            {Criteria(): [{Criteria(): None}, {Criteria(): None}]}
+        ]
+        self.model = Model(Problem(), criterias, [Alternative(), Alternative()])
+        self.two = np.array([[1, 3], [1/3, 1]])
+        self.three = np.array([[1, 2, 4], [1/2, 1, 2], [1/4, 1/2, 1]])
+        self.mapping = {("Problem0", 0): self.two,
+                        ("Criteria0", 0): self.three,
+                        ("Criteria4", 4): self.two,
+                        ("Criteria1", 1): self.two}
+
+
+    def test_attach_pcms(self):
+        self.model.attach_pcms(self.mapping)
+        
+        np.testing.assert_array_almost_equal(self.model.get_problem().get_pcm(), self.two)
+        np.testing.assert_array_almost_equal(self.model[("Criteria0", 0)].get_pcm(), self.three)
+        np.testing.assert_array_almost_equal(self.model[("Criteria4", 4)].get_pcm(), self.two)
+        self.assertIs(self.model[("Criteria4", 4)].get_pcm().base, self.model.get_problem().get_pcm().base,
+                      "The matrices of the same size must be views into one array.")
+        self.assertIs(self.model[("Criteria1", 1)].get_pcm().base, self.model.get_leaf_judgments()[1],
+                      "The matrices of the leaves must stay in the shared array.")
+
+
+    def test_attach_pcms_is_atomic(self):
+        self.mapping[("Criteria2", 2)] = np.array([[1, 3], [0.5, 1]])
+        
+        with self.assertRaises(ValueError) as context:
+            self.model.attach_pcms(self.mapping)
+        
+        self.assertIn("(Criteria2, 2)", str(context.exception))
+        np.testing.assert_array_equal(self.model.get_problem().get_pcm(), np.ones((2, 2)))
+
+
+    def test_attach_pcms_invalid_keys(self):
+        with self.assertRaises(ValueError):
+            self.model.attach_pcms({("Criteria0", 0): self.two})
+        with self.assertRaises(ValueError):
+            self.model.attach_pcms({("Criteria100", 100): self.two})
+        with self.assertRaises(KeyError):
+            self.model.attach_pcms({"Criteria0": self.two})
+
+
+    def test_get_and_load_judgments(self):
+        self.model.attach_pcms(self.mapping)
+        expected = self.model.solve()
+        bundle = self.model.get_judgments()
+        
+        self.assertEqual(set(bundle), {2, 3})
+        (keys, matrices) = bundle[2]
+        self.assertEqual(matrices.shape, (len(keys), 2, 2))
+        
+        self.setUp()
+        self.model.load_judgments(bundle)
+        np.testing.assert_array_almost_equal(self.model.solve(), expected)
+
+
+    def test_load_judgments_invalid_stack(self):
+        with self.assertRaises(ValueError):
+            self.model.load_judgments({2: ([("Criteria1", 1), ("Criteria2", 2)], np.ones((3, 2, 2)))})
+
+
+
+class TestModelLeafJudgments(unittest.TestCase):
+    def setUp(self):
+        reset_ids()
+        
+        self.criterias = [
+            {Criteria(): [{Criteria(): None}, {Criteria(): None}]},
+            {Criteria(): [{Criteria(): None}, {Criteria(): None}]}
+        ]
+        self.alternatives = [Alternative(), Alternative(), Alternative()]
+        self.three = np.array([[1, 2, 4], [1/2, 1, 2], [1/4, 1/2, 1]])
+    
+    
+    def test_leaves_share_one_array(self):
+        model = Model(Problem(), self.criterias, self.alternatives)
+        (keys, judgments) = model.get_leaf_judgments()
+        
+        self.assertEqual(set(keys), {("Criteria1", 1), ("Criteria2", 2), ("Criteria4", 4), ("Criteria5", 5)})
+        self.assertEqual(judgments.shape, (4, 3, 3))
+        
+        leaf = model[keys[0]]
+        leaf.set_matrix(self.three)
+        np.testing.assert_array_almost_equal(judgments[0], self.three)
+        self.assertTrue(np.shares_memory(leaf.get_pcm(), judgments))
+        
+        leaf.set_comparison(0, 1, 3)
+        self.assertAlmostEqual(judgments[0, 1, 0], 1/3)
+    
+    
+    def test_leaves_solved_by_one_call(self):
+        model = Model(Problem(), self.criterias, self.alternatives)
+        for key in model.get_leaf_judgments()[0]:
+            model[key].set_matrix(self.three)
+        expected = [node.pcm.calculate_priority_vector() for node in model._leaf_nodes]
+        for node in model._leaf_nodes:
+            node.pcm._invalidate()
+        
+        with patch("numpy.linalg.eig", wraps=np.linalg.eig) as eig:
+            model.solve()
+        
+        self.assertEqual([call.args[0].shape for call in eig.call_args_list if call.args[0].shape[1] == 3], [(4, 3, 3)])
+        for node, vector in zip(model._leaf_nodes, expected):
+            np.testing.assert_array_almost_equal(node.pcm._eigen.priority_vector, vector)
+    
+    
+    def test_float32_leaves(self):
+        model = Model(Problem(), self.criterias, self.alternatives, leaf_dtype=np.float32)
+        reference = Model(Problem(), [
+            {Criteria(): [{Criteria(): None}, {Criteria(): None}]},
+            {Criteria(): [{Criteria(): None}, {Criteria(): None}]}
+        ], [Alternative(), Alternative(), Alternative()])
+        for current in (model, reference):
+            for key in current.get_leaf_judgments()[0]:
+                current[key].set_matrix(self.three)
+        
+        self.assertEqual(model.get_leaf_judgments()[1].dtype, np.float32)
+        np.testing.assert_allclose(np.abs(model.solve()), np.abs(reference.solve()), rtol=1e-5)
+    
+    
+    def test_packed_leaves(self):
+        model = Model(Problem(), self.criterias, self.alternatives, packed_leaves=True)
+        reference = Model(Problem(), [
+            {Criteria(): [{Criteria(): None}, {Criteria(): None}]},
+            {Criteria(): [{Criteria(): None}, {Criteria(): None}]}
+        ], [Alternative(), Alternative(), Alternative()])
+        for current in (model, reference):
+            for key in current.get_leaf_judgments()[0]:
+                current[key].set_matrix(self.three)
+        
+        (keys, judgments) = model.get_leaf_judgments()
+        self.assertEqual(judgments.shape, (4, 3))
+        self.assertTrue(model[keys[0]].pcm.packed)
+        np.testing.assert_array_almost_equal(judgments[0], np.log([2, 4, 2]))
+        np.testing.assert_array_almost_equal(model.solve(), reference.solve())
+
+
 
 class TestModelSolve(unittest.TestCase):
     def setUp(self):
-        Problem._problem_id = 0
-        Criteria._criteria_id = 0
-        Alternative._alternative_id = 0
+        reset_ids()
         
         self.relative_path = os.path.dirname(os.path.abspath(__file__)) 
         
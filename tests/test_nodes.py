@@ -2,7 +2,7 @@ import set_up_test_pathes
 
 import unittest
 import numpy as np
-from anahiepro.nodes import Problem, Criteria, Alternative
+from anahiepro.nodes import Problem, Criteria, DummyCriteria, Alternative
 
 
 
@@ -134,6 +134,11 @@ class TestCriteria(unittest.TestCase):
     # The next test is not writen because in the past one we check also mhetods that are in all classes.
 
 
+    def test_nodes_have_no_dict(self):
+        for node in (Problem(), self.criteria, DummyCriteria(), Alternative()):
+            self.assertFalse(hasattr(node, "__dict__"), f"{type(node).__name__} must use __slots__")
+
+
 
 class TestAlternative(unittest.TestCase):
     def setUp(self):
@@ -177,6 +182,51 @@ class TestAlternative(unittest.TestCase):
 
 
 
+
+class TestNodeIterators(unittest.TestCase):
+    def setUp(self):
+        self.alternatives = [Alternative("A0"), Alternative("A1")]
+        self.leaves = [Criteria("C2"), Criteria("C3"), Criteria("C4")]
+        self.criterias = [Criteria("C0", children=self.leaves[:2]), Criteria("C1", children=self.leaves[2:])]
+        self.problem = Problem("P", children=self.criterias)
+        for leaf in self.leaves:
+            for alternative in self.alternatives:
+                leaf.add_child(alternative)
+
+
+    def names(self, nodes):
+        return [node.get_name() for node in nodes]
+
+
+    def test_preorder(self):
+        self.assertEqual(self.names(self.problem.iter_preorder(alternatives=False)), ["P", "C0", "C2", "C3", "C1", "C4"])
+        self.assertEqual(self.names(self.criterias[1].iter_preorder()), ["C1", "C4", "A0", "A1"])
+        self.assertEqual([(node.get_name(), depth) for (node, depth) in self.criterias[0].iter_preorder(False, with_depth=True)],
+                         [("C0", 0), ("C2", 1), ("C3", 1)])
+
+
+    def test_postorder(self):
+        self.assertEqual(self.names(self.problem.iter_postorder(alternatives=False)), ["C2", "C3", "C0", "C4", "C1", "P"])
+        self.assertEqual(self.names(self.criterias[1].iter_postorder()), ["A0", "A1", "C4", "C1"])
+
+
+    def test_levels(self):
+        self.assertEqual([self.names(level) for level in self.problem.iter_levels(alternatives=False)],
+                         [["P"], ["C0", "C1"], ["C2", "C3", "C4"]])
+        self.assertEqual(self.names(list(self.problem.iter_levels())[-1]), ["A0", "A1"] * 3)
+
+
+    def test_deep_chain(self):
+        criteria = Criteria("Leaf")
+        for _ in range(5000):  # Deeper than the recursion limit.
+            criteria = Criteria("Node", children=[criteria])
+
+        self.assertEqual(sum(1 for _ in criteria.iter_postorder()), 5001)
+        self.assertEqual(len(list(criteria.iter_levels())), 5001)
+        self.assertTrue(criteria.show().endswith("+" + "--" * 5000 + "Leaf\n"))
+
+
+
 if __name__ == "__main__":
     unittest.main()
     
\ No newline at end of file
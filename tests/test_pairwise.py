@@ -1,9 +1,12 @@
 import set_up_test_pathes
 
 import unittest
+from unittest.mock import patch
 import numpy as np
-from anahiepro.pairwise import PairwiseComparisonMatrix
+from anahiepro.pairwise import PairwiseComparisonMatrix, calculate_batch, validate_matrices, check_consistency
+from anahiepro.priority_methods import EigenvectorMethod
 import anahiepro.constants as const
+from fixtures import random_pcm
 
 
 
@@ -129,5 +132,384 @@ class TestPairwiseMatrix(unittest.TestCase):
         self.assertTrue(np.isnan(self.pcm.calculate_consistency_ratio()), "Consistency ratio have to be nan")
 
 
+
+class TestValidateMatrices(unittest.TestCase):
+    def test_stack_reasons(self):
+        valid = np.array([[1, 3], [1/3, 1]])
+        not_reciprocal = np.array([[1, 3], [0.5, 1]])
+        invalid_diagonal = np.array([[2, 3], [1/3, 1]])
+        negative = np.array([[1, -1], [-1, 1]])
+        with_zero = np.zeros((2, 2))
+        
+        reasons = validate_matrices(np.stack([valid, not_reciprocal, invalid_diagonal, negative, with_zero]))
+        
+        self.assertIsNone(reasons[0])
+        self.assertIn("reciprocal", reasons[1])
+        self.assertIn("diagonal", reasons[2])
+        self.assertIn("positive", reasons[3])
+        self.assertIn("positive", reasons[4])
+
+
+    def test_single_matrix(self):
+        self.assertEqual(validate_matrices(np.ones((3, 3))), [None])
+        self.assertIn("square", validate_matrices(np.ones((2, 3)))[0])
+        self.assertIsNotNone(validate_matrices(np.ones(3))[0])
+        self.assertEqual(len(validate_matrices(np.ones((4, 2, 3, 3)))), 4)
+
+
+    def test_set_matrix_without_validation(self):
+        pcm = PairwiseComparisonMatrix(3)
+        trusted = np.array([[1, 3], [0.5, 1]])
+        
+        with self.assertRaises(ValueError):
+            pcm.set_matrix(trusted)
+        
+        pcm.set_matrix(trusted, validate=False)
+        np.testing.assert_array_equal(pcm.get_matrix(), trusted)
+        self.assertEqual(pcm.size, 2)
+
+
+
+class TestEigenCache(unittest.TestCase):
+    def setUp(self):
+        self.pcm = PairwiseComparisonMatrix(matrix=[[1, 3, 1/2],
+                                                    [1/3, 1, 1/4],
+                                                    [2, 4, 1]])
+
+
+    def test_result_is_cached(self):
+        self.pcm.calculate_priority_vector()
+        eigen = self.pcm._eigen
+        self.pcm.calculate_consistency_ratio()
+        self.pcm.calculate_priority_vector()
+        self.assertIs(self.pcm._eigen, eigen, "The eigen-result was recalculated for unchanged matrix.")
+
+
+    def test_returned_vector_does_not_change_cache(self):
+        priority_vector = self.pcm.calculate_priority_vector()
+        priority_vector[0] = 100
+        self.assertNotEqual(self.pcm.calculate_priority_vector()[0], 100)
+
+
+    def test_invalidation(self):
+        changes = [lambda: self.pcm.set_comparison(0, 1, 5),
+                   lambda: self.pcm.__setitem__((0, 1), 7),
+                   lambda: self.pcm.set_matrix(np.ones((3, 3)))]
+
+        for change in changes:
+            before = self.pcm.calculate_priority_vector()
+            change()
+            self.assertIsNone(self.pcm._eigen, "The eigen-result was not invalidated.")
+            expected, _ = calculate_batch(self.pcm.get_matrix()[np.newaxis])
+            after = self.pcm.calculate_priority_vector()
+            np.testing.assert_array_almost_equal(after, expected[0])
+            self.assertFalse(np.allclose(before, after))
+
+
+
+class TestSharedStorage(unittest.TestCase):
+    def test_matrix_is_copied_into_storage(self):
+        storage = np.ones((2, 2, 2))
+        pcm = PairwiseComparisonMatrix(2)
+        pcm._share(storage[1])
+        
+        pcm.set_matrix([[1, 3], [1/3, 1]])
+        np.testing.assert_array_almost_equal(storage[1], [[1, 3], [1/3, 1]])
+        self.assertTrue(np.shares_memory(pcm.matrix, storage))
+    
+    
+    def test_other_shape_leaves_storage(self):
+        storage = np.ones((1, 2, 2))
+        pcm = PairwiseComparisonMatrix(2)
+        pcm._share(storage[0])
+        
+        pcm.set_matrix(np.ones((3, 3)))
+        self.assertEqual(pcm.matrix.shape, (3, 3))
+        self.assertFalse(np.shares_memory(pcm.matrix, storage))
+        np.testing.assert_array_equal(storage[0], np.ones((2, 2)))
+
+
+
+class TestPackedStorage(unittest.TestCase):
+    def setUp(self):
+        self.matrix = np.array([[1, 3, 1/2, 4],
+                                [1/3, 1, 1/4, 2],
+                                [2, 4, 1, 5],
+                                [1/4, 1/2, 1/5, 1]])
+        self.pcm = PairwiseComparisonMatrix(matrix=self.matrix, packed=True)
+    
+    
+    def test_storage(self):
+        self.assertTrue(self.pcm.packed)
+        self.assertEqual(self.pcm.get_packed().shape, (6,))
+        np.testing.assert_array_almost_equal(self.pcm.get_packed(), np.log([3, 1/2, 4, 1/4, 2, 5]))
+        np.testing.assert_array_almost_equal(self.pcm.get_matrix(), self.matrix)
+        self.assertFalse(self.pcm.get_matrix().flags.writeable)
+        np.testing.assert_array_almost_equal(PairwiseComparisonMatrix(matrix=self.matrix).get_packed(), self.pcm.get_packed())
+    
+    
+    def test_set_comparison(self):
+        self.pcm.set_comparison(2, 1, 1/6)
+        self.pcm[0, 3] = 7
+        
+        self.assertAlmostEqual(self.pcm[1, 2], 6)
+        self.assertAlmostEqual(self.pcm[2, 1], 1/6)
+        self.assertAlmostEqual(self.pcm[3, 0], 1/7)
+        self.assertEqual(self.pcm[2, 2], 1)
+        np.testing.assert_array_almost_equal(self.pcm.get_matrix() * self.pcm.get_matrix().T, np.ones((4, 4)))
+    
+    
+    def test_negative_indices(self):
+        full = PairwiseComparisonMatrix(matrix=self.matrix)
+        for pcm in (self.pcm, full):
+            pcm.set_comparison(0, -1, 3)
+            pcm[-2, 1] = 1/6
+        
+        np.testing.assert_array_almost_equal(self.pcm.get_matrix(), full.get_matrix())
+        self.assertAlmostEqual(self.pcm[0, 3], 3)
+        self.assertAlmostEqual(self.pcm[1, 2], 6)
+        self.assertAlmostEqual(self.pcm[1, 0], 1/3)
+    
+    
+    def test_same_results(self):
+        full = PairwiseComparisonMatrix(matrix=self.matrix)
+        
+        np.testing.assert_array_almost_equal(self.pcm.calculate_priority_vector(), full.calculate_priority_vector())
+        self.assertAlmostEqual(self.pcm.calculate_consistency_ratio(), full.calculate_consistency_ratio())
+        
+        self.pcm.set_comparison(0, 1, 5)
+        full.set_comparison(0, 1, 5)
+        np.testing.assert_array_almost_equal(self.pcm.calculate_priority_vector(), full.calculate_priority_vector())
+    
+    
+    def test_log_space_priorities(self):
+        full = PairwiseComparisonMatrix(matrix=self.matrix, priority_method="geometric_mean")
+        self.pcm.priority_method = "geometric_mean"
+        
+        with patch("numpy.linalg.eig", wraps=np.linalg.eig) as eig:
+            np.testing.assert_array_almost_equal(self.pcm.calculate_priority_vector(), full.calculate_priority_vector())
+            self.assertAlmostEqual(self.pcm.calculate_consistency_ratio(), full.calculate_consistency_ratio())
+        eig.assert_not_called()
+    
+    
+    def test_geometric_consistency_index(self):
+        log_matrix = np.log(self.matrix)
+        log_weights = log_matrix.mean(axis=1)
+        residuals = np.triu(log_matrix - (log_weights[:, np.newaxis] - log_weights[np.newaxis, :]), 1)
+        expected = 2 * np.sum(residuals ** 2) / (3 * 2)
+        
+        self.assertAlmostEqual(self.pcm.calculate_geometric_consistency_index(), expected)
+        self.assertAlmostEqual(PairwiseComparisonMatrix(matrix=self.matrix).calculate_geometric_consistency_index(), expected)
+        self.assertAlmostEqual(PairwiseComparisonMatrix(matrix=[[1, 2, 4], [1/2, 1, 2], [1/4, 1/2, 1]])
+                               .calculate_geometric_consistency_index(), 0)
+    
+    
+    def test_set_matrix(self):
+        with self.assertRaises(ValueError):
+            self.pcm.set_matrix(np.ones((3, 2)))
+        
+        self.pcm.set_matrix(np.ones((2, 2)))
+        self.assertEqual(self.pcm.size, 2)
+        self.assertEqual(self.pcm.get_packed().shape, (1,))
+
+
+
+class TestWarmStart(unittest.TestCase):
+    def setUp(self):
+        self.pcm = PairwiseComparisonMatrix(matrix=random_pcm(30, np.random.default_rng(0)))
+
+
+    def test_refined_vector_matches_decomposition(self):
+        self.pcm.calculate_priority_vector()
+        self.pcm.set_comparison(3, 7, 5)
+        self.assertIsNotNone(self.pcm._last_eigen)
+
+        with patch("numpy.linalg.eig", wraps=np.linalg.eig) as eig:
+            priority_vector = self.pcm.calculate_priority_vector()
+            consistency_ratio = self.pcm.calculate_consistency_ratio()
+            eig.assert_not_called()
+
+        expected_vectors, expected_ratios = calculate_batch(self.pcm.get_matrix()[np.newaxis])
+        np.testing.assert_array_almost_equal(np.abs(priority_vector), np.abs(expected_vectors[0]), decimal=10)
+        self.assertAlmostEqual(consistency_ratio, expected_ratios[0], places=10)
+        self.assertIsNone(self.pcm._last_eigen)
+
+
+    def test_several_edits_before_calculation(self):
+        self.pcm.calculate_priority_vector()
+        self.pcm.set_comparison(0, 1, 2)
+        self.pcm[5, 9] = 1/3
+
+        expected_vectors, _ = calculate_batch(self.pcm.get_matrix()[np.newaxis])
+        np.testing.assert_array_almost_equal(np.abs(self.pcm.calculate_priority_vector()), np.abs(expected_vectors[0]))
+
+
+    def test_set_matrix_drops_previous_eigen(self):
+        self.pcm.calculate_priority_vector()
+        self.pcm.set_comparison(0, 1, 2)
+        self.pcm.set_matrix(np.ones((3, 3)))
+        self.assertIsNone(self.pcm._last_eigen)
+
+
+    def test_fallback_when_not_converged(self):
+        matrices = np.array([[[1, 9, 1/9], [1/9, 1, 9], [9, 1/9, 1]]])
+        
+        with patch("numpy.linalg.eig", wraps=np.linalg.eig) as eig:
+            max_eigvals, priority_vectors = EigenvectorMethod().refine(matrices, np.array([[1, 1e-3, 1e-3]]))
+            eig.assert_called_once()
+        
+        expected_eigvals, expected_vectors = EigenvectorMethod().calculate(matrices)
+        np.testing.assert_array_almost_equal(np.abs(priority_vectors), np.abs(expected_vectors))
+        np.testing.assert_array_almost_equal(max_eigvals, expected_eigvals)
+
+
+
+class TestCalculateBatch(unittest.TestCase):
+    def setUp(self):
+        self.matrices = np.array([
+            [[1, 3, 1/2],
+             [1/3, 1, 1/4],
+             [2, 4, 1]],
+            [[1, 2, 3],
+             [1/2, 1, 2],
+             [1/3, 1/2, 1]]
+        ])
+
+
+    def test_batch_matches_single_matrix(self):
+        priority_vectors, consistency_ratios = calculate_batch(self.matrices)
+
+        for matrix, priority_vector, consistency_ratio in zip(self.matrices, priority_vectors, consistency_ratios):
+            pcm = PairwiseComparisonMatrix(matrix=matrix)
+            np.testing.assert_array_almost_equal(priority_vector, pcm.calculate_priority_vector())
+            self.assertAlmostEqual(consistency_ratio, pcm.calculate_consistency_ratio())
+
+
+    def test_batch_shapes(self):
+        priority_vectors, consistency_ratios = calculate_batch(self.matrices)
+        self.assertEqual(priority_vectors.shape, (2, 3))
+        self.assertEqual(consistency_ratios.shape, (2,))
+
+
+    def test_batch_invalid_shape(self):
+        with self.assertRaises(ValueError):
+            calculate_batch(np.ones((3, 3)))
+
+
+
+class TestInconsistencyRanking(unittest.TestCase):
+    def setUp(self):
+        weights = np.array([1, 2, 3, 4, 6])
+        self.consistent = weights[:, np.newaxis] / weights[np.newaxis, :]
+        self.matrix = self.consistent.copy()
+        self.matrix[1, 3] = 4
+        self.matrix[3, 1] = 1/4
+        self.pcm = PairwiseComparisonMatrix(matrix=self.matrix, priority_method="geometric_mean")
+
+
+    def test_deviation(self):
+        ranking = self.pcm.rank_inconsistent_judgments()
+        self.assertEqual((ranking.rows[0], ranking.cols[0]), (1, 3))
+        self.assertTrue(np.all(np.diff(ranking.scores) <= 0))
+
+        priority_vector = self.pcm.calculate_priority_vector()
+        np.testing.assert_array_almost_equal(ranking.scores,
+                                             np.abs(np.log(self.matrix[ranking.rows, ranking.cols]
+                                                           * priority_vector[ranking.cols] / priority_vector[ranking.rows])))
+        np.testing.assert_array_almost_equal(ranking.suggested_values,
+                                             priority_vector[ranking.rows] / priority_vector[ranking.cols])
+
+
+    def test_triads(self):
+        ranking = self.pcm.rank_inconsistent_judgments("triads", threshold=0.5)
+        self.assertEqual((ranking.rows[0], ranking.cols[0]), (1, 3))
+        self.assertAlmostEqual(ranking.suggested_values[0], self.consistent[1, 3])
+
+        log_matrix = np.log(self.matrix)
+        for (i, j, score) in zip(ranking.rows, ranking.cols, ranking.scores):
+            indexes = [1 - np.exp(-abs(log_matrix[i, j] + log_matrix[j, k] - log_matrix[i, k])) > 0.5 for k in range(5)]
+            self.assertEqual(score, sum(indexes))
+
+
+    def test_packed(self):
+        packed = PairwiseComparisonMatrix(matrix=self.matrix, priority_method="geometric_mean", packed=True)
+        for measure in ("deviation", "triads"):
+            # The ties might be ordered in another way, so the judgments are compared by their cells.
+            (expected, actual) = (self.pcm.rank_inconsistent_judgments(measure), packed.rank_inconsistent_judgments(measure))
+            (expected_order, actual_order) = (np.lexsort((expected.cols, expected.rows)), np.lexsort((actual.cols, actual.rows)))
+            for (expected_field, actual_field) in zip(expected, actual):
+                np.testing.assert_array_almost_equal(actual_field[actual_order], expected_field[expected_order])
+
+
+    def test_unknown_measure(self):
+        with self.assertRaises(ValueError):
+            self.pcm.rank_inconsistent_judgments("cosine")
+
+
+
+class TestCheckConsistency(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.matrices = []
+        for (size, spread) in zip(rng.integers(3, 9, 60), np.tile([0.05, 0.2, 0.5], 20)):
+            self.matrices.append(random_pcm(size, rng, spread))
+
+
+    def test_same_as_exact(self):
+        with patch("numpy.linalg.eigvals", wraps=np.linalg.eigvals) as eigvals:
+            results = list(check_consistency(iter(self.matrices), chunk_size=16))
+        self.assertLess(sum(len(call.args[0]) for call in eigvals.call_args_list), len(self.matrices) // 4)
+
+        self.assertEqual([result.index for result in results], list(range(len(self.matrices))))
+        for (matrix, result) in zip(self.matrices, results):
+            consistency_ratio = PairwiseComparisonMatrix(matrix=matrix).calculate_consistency_ratio()
+            self.assertEqual(result.accepted, consistency_ratio <= const.COHERENCE_INDEX_RATE)
+            self.assertLessEqual(result.lower_bound, consistency_ratio + 1e-9)
+            self.assertGreaterEqual(result.upper_bound, consistency_ratio - 1e-9)
+            self.assertEqual(result.reason is None, result.accepted)
+
+
+    def test_exact_without_power_steps(self):
+        results = list(check_consistency(self.matrices[:6], max_ratio=0.05, power_steps=0))
+        for (matrix, result) in zip(self.matrices, results):
+            if result.lower_bound == result.upper_bound:
+                self.assertAlmostEqual(result.upper_bound, PairwiseComparisonMatrix(matrix=matrix).calculate_consistency_ratio())
+
+
+    def test_invalid_and_small_matrices(self):
+        invalid = np.ones((3, 3))
+        invalid[0, 1] = 2
+        results = list(check_consistency([invalid, [[1, 4], [1/4, 1]]]))
+
+        self.assertFalse(results[0].accepted)
+        self.assertEqual(results[0].reason, "The matrix is not reciprocal.")
+        self.assertTrue(np.isnan(results[0].upper_bound))
+        self.assertTrue(results[1].accepted)
+        with self.assertRaises(ValueError):
+            check_consistency([], chunk_size=0)
+
+
+    def test_not_two_dimensional_items(self):
+        stream = [np.ones(3), self.matrices[0], np.ones(3), np.ones((2, 3, 3)), np.ones((2, 3, 3)),
+                  np.ones((2, 3)), np.ones((2, 3)), 1.0]
+        results = list(check_consistency(stream))
+
+        self.assertEqual([result.index for result in results], list(range(len(stream))))
+        self.assertEqual([result.accepted for result in results], [False, True, False, False, False, False, False, False])
+        for index in (0, 2, 3, 4, 7):
+            self.assertEqual(results[index].reason, "The matrix must be a two-dimensional array.")
+            self.assertTrue(np.isnan(results[index].lower_bound))
+        for index in (5, 6):
+            self.assertEqual(results[index].reason, "The matrix is not square.")
+
+
+    def test_lazy(self):
+        def matrices():
+            yield self.matrices[0]
+            raise RuntimeError("The stream is read too far.")
+
+        self.assertEqual(next(check_consistency(matrices(), chunk_size=1)).index, 0)
+
+
 if __name__ == '__main__':
     unittest.main()
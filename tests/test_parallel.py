@@ -0,0 +1,97 @@
+import set_up_test_pathes
+
+import unittest
+import pickle
+import numpy as np
+from anahiepro.models.model import Model
+from anahiepro.nodes import Problem, Criteria, Alternative
+from anahiepro.models.vary_depth_model import VaryDepthModel
+from anahiepro.models.parallel import solve_many
+from anahiepro.models._compact_model import _compact_model, _matrices
+from anahiepro.priority_methods import EigenvectorMethod
+from fixtures import reset_ids, random_pcm
+
+
+
+class TestSolveMany(unittest.TestCase):
+    def setUp(self):
+        reset_ids()
+        self.rng = np.random.default_rng(0)
+
+
+    def create_model(self, model_type=Model, priority_method=None):
+        criterias = [{Criteria(): [{Criteria(): None}, {Criteria(): None}]},
+                     {Criteria(): [{Criteria(): [{Criteria(): None}]}, {Criteria(): [{Criteria(): None}]}]}] \
+                    if model_type is VaryDepthModel else \
+                    [{Criteria(): [{Criteria(): None}, {Criteria(): None}]},
+                     {Criteria(): [{Criteria(): None}, {Criteria(): None}, {Criteria(): None}]}]
+        model = model_type(Problem(), criterias, [Alternative() for _ in range(4)], priority_method)
+        model.get_problem().set_matrix(random_pcm(2, self.rng))
+        for node in model._get_nodes_with_pcm()[1:]:
+            node.set_matrix(random_pcm(len(node.get_children()), self.rng))
+        return model
+
+
+    def create_models(self):
+        return ([self.create_model() for _ in range(5)]
+                + [self.create_model(VaryDepthModel) for _ in range(3)]
+                + [self.create_model(priority_method="geometric_mean") for _ in range(3)])
+
+
+    def test_matches_solve(self):
+        models = self.create_models()
+        results = solve_many(models)
+
+        self.assertEqual(len(results), len(models))
+        for model, result in zip(models, results):
+            np.testing.assert_array_almost_equal(result, model.solve())
+
+
+    def test_workers_keep_order(self):
+        models = self.create_models()
+        results = solve_many(models, workers=2, chunk_size=2)
+
+        for model, result in zip(models, results):
+            np.testing.assert_array_almost_equal(result, model.solve())
+
+
+    def test_models_are_not_changed(self):
+        model = self.create_model()
+        solve_many([model])
+        self.assertIsNone(model.get_problem()._global_vector)
+
+        model = self.create_model(priority_method="geometric_mean")
+        expected = model.solve()
+        criteria = model[model.get_criterias_name_ids()[0]]
+        criteria.pcm.priority_method = "eig"  # Model.solve sets the method of the model back.
+        states = [(node.pcm.priority_method, node.pcm._eigen, node._global_vector) for node in model._get_nodes_with_pcm()]
+
+        np.testing.assert_array_almost_equal(solve_many([model])[0], expected)
+        for (node, state) in zip(model._get_nodes_with_pcm(), states):
+            for (value, expected_value) in zip((node.pcm.priority_method, node.pcm._eigen, node._global_vector), state):
+                self.assertIs(value, expected_value)
+        self.assertIsInstance(criteria.pcm.priority_method, EigenvectorMethod)
+
+
+    def test_snapshot(self):
+        model = self.create_model()
+        compact = pickle.loads(pickle.dumps(_compact_model(model)))
+
+        nodes = [model.get_problem()] + [model[key] for key in model.get_criterias_name_ids()]
+        self.assertEqual(len(compact.sizes), len(nodes))
+        np.testing.assert_array_equal(compact.child_offsets, [1, 3, 5, 8, 8, 8, 8, 8, 8])
+        np.testing.assert_array_equal(compact.order, [2, 1, 0])
+        np.testing.assert_array_equal(_matrices(compact)[0], model.get_problem().get_pcm())
+
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            solve_many([], workers=0)
+        with self.assertRaises(ValueError):
+            solve_many([], chunk_size=0)
+        self.assertEqual(solve_many([]), [])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,186 @@
+import set_up_test_pathes
+
+import unittest
+import numpy as np
+from anahiepro.pairwise import PairwiseComparisonMatrix, calculate_batch
+from anahiepro.priority_methods import (PriorityMethod, EigenvectorMethod, PowerIterationMethod, GeometricMeanMethod,
+                                        LogarithmicLeastSquaresMethod, AdditiveNormalizationMethod, get_priority_method,
+                                        PRIORITY_METHODS)
+from anahiepro._log_space import _pack
+from anahiepro.models.model import Model
+from anahiepro.nodes import Problem, Criteria, Alternative
+from anahiepro.models.vary_depth_model import VaryDepthModel
+from anahiepro.random_index import get_random_index
+from fixtures import reset_ids, random_pcm
+
+
+
+class TestPriorityMethods(unittest.TestCase):
+    def setUp(self):
+        self.matrices = np.array([
+            [[1, 3, 1/2],
+             [1/3, 1, 1/4],
+             [2, 4, 1]],
+            [[1, 2, 3],
+             [1/2, 1, 2],
+             [1/3, 1/2, 1]]
+        ])
+        self.consistent_matrix = np.array([
+            [1, 2, 4],
+            [1/2, 1, 2],
+            [1/4, 1/2, 1]
+        ])
+
+
+    def test_methods_agree_on_consistent_matrix(self):
+        expected = np.array([4, 2, 1]) / np.linalg.norm([4, 2, 1])
+
+        for name in PRIORITY_METHODS:
+            max_eigvals, priority_vectors = get_priority_method(name).calculate(self.consistent_matrix[np.newaxis])
+            np.testing.assert_array_almost_equal(np.abs(priority_vectors[0]), expected, err_msg=name)
+            self.assertAlmostEqual(max_eigvals[0], 3, msg=name)
+
+
+    def test_power_iteration_matches_eig(self):
+        eig_eigvals, eig_vectors = EigenvectorMethod().calculate(self.matrices)
+        power_eigvals, power_vectors = PowerIterationMethod().calculate(self.matrices)
+
+        np.testing.assert_array_almost_equal(np.abs(eig_vectors), power_vectors)
+        np.testing.assert_array_almost_equal(eig_eigvals, power_eigvals)
+
+
+    def test_approximate_methods_are_close_to_eig(self):
+        _, eig_vectors = EigenvectorMethod().calculate(self.matrices)
+
+        for method in (GeometricMeanMethod(), AdditiveNormalizationMethod()):
+            _, priority_vectors = method.calculate(self.matrices)
+            np.testing.assert_allclose(priority_vectors, np.abs(eig_vectors), atol=0.03, err_msg=repr(method))
+
+
+    def test_packed_matrices(self):
+        log_judgments = _pack(self.matrices)
+
+        for name in PRIORITY_METHODS:
+            method = get_priority_method(name)
+            (max_eigvals, priority_vectors) = method.calculate(self.matrices)
+            (packed_max_eigvals, packed_priority_vectors) = method.calculate_packed(log_judgments, 3)
+            np.testing.assert_array_almost_equal(packed_priority_vectors, priority_vectors, err_msg=name)
+            np.testing.assert_array_almost_equal(packed_max_eigvals, max_eigvals, err_msg=name)
+
+
+    def test_llsm_is_geometric_mean_for_complete_matrices(self):
+        _, expected = GeometricMeanMethod().calculate(self.matrices)
+        _, priority_vectors = get_priority_method("llsm").calculate(self.matrices)
+
+        self.assertIsInstance(get_priority_method("llsm"), LogarithmicLeastSquaresMethod)
+        np.testing.assert_array_almost_equal(priority_vectors, expected)
+
+
+    def test_get_priority_method(self):
+        self.assertIsInstance(get_priority_method(None), EigenvectorMethod)
+        self.assertIsInstance(get_priority_method("geometric_mean"), GeometricMeanMethod)
+
+        method = PowerIterationMethod(tolerance=1e-6)
+        self.assertIs(get_priority_method(method), method)
+
+        with self.assertRaises(ValueError):
+            get_priority_method("unknown")
+        with self.assertRaises(TypeError):
+            get_priority_method(42)
+
+
+    def test_base_method_is_abstract(self):
+        with self.assertRaises(TypeError):
+            PriorityMethod()
+
+
+    def test_calculate_batch_with_method(self):
+        priority_vectors, _ = calculate_batch(self.matrices, "geometric_mean")
+        _, expected = GeometricMeanMethod().calculate(self.matrices)
+        np.testing.assert_array_almost_equal(priority_vectors, expected)
+
+
+
+class TestPcmPriorityMethod(unittest.TestCase):
+    def test_method_change_invalidates_cache(self):
+        pcm = PairwiseComparisonMatrix(matrix=[[1, 3, 1/2],
+                                               [1/3, 1, 1/4],
+                                               [2, 4, 1]])
+        pcm.calculate_priority_vector()
+        pcm.priority_method = "additive_normalization"
+        self.assertIsNone(pcm._eigen)
+        self.assertIsInstance(pcm.priority_method, AdditiveNormalizationMethod)
+
+        _, expected = AdditiveNormalizationMethod().calculate(pcm.get_matrix()[np.newaxis])
+        np.testing.assert_array_almost_equal(pcm.calculate_priority_vector(), expected[0])
+
+
+    def test_consistency_ratio_does_not_depend_on_method(self):
+        matrices = [random_pcm(size, np.random.default_rng(size), 0.5) for size in range(3, 9)]
+        for matrix in matrices:
+            expected = PairwiseComparisonMatrix(matrix=matrix).calculate_consistency_ratio()
+            _, expected_ratios = calculate_batch(matrix[np.newaxis])
+            for name in PRIORITY_METHODS:
+                pcm = PairwiseComparisonMatrix(matrix=matrix, priority_method=name)
+                self.assertAlmostEqual(pcm.calculate_consistency_ratio(), expected, msg=name)
+                self.assertAlmostEqual(calculate_batch(matrix[np.newaxis], name)[1][0], expected_ratios[0], msg=name)
+
+        pcm = PairwiseComparisonMatrix(matrix=matrices[-1], priority_method="geometric_mean")
+        (max_eigval, _) = GeometricMeanMethod().calculate(matrices[-1][np.newaxis])
+        self.assertNotAlmostEqual(pcm.estimate_consistency_ratio(), pcm.calculate_consistency_ratio())
+        self.assertAlmostEqual(pcm.estimate_consistency_ratio(), (max_eigval[0] - 8) / 7 / get_random_index(8))
+
+
+
+class TestModelPriorityMethod(unittest.TestCase):
+    def setUp(self):
+        reset_ids()
+
+
+    def create_model(self, model_type=Model, priority_method=None):
+        criterias = [{Criteria(): [{Criteria(): None}, {Criteria(): None}]},
+                     {Criteria(): [{Criteria(): None}, {Criteria(): None}]}]
+        model = model_type(Problem(), criterias, [Alternative(), Alternative(), Alternative()], priority_method)
+
+        model.get_problem().set_matrix([[1, 3], [1/3, 1]])
+        for key in model.get_criterias_name_ids():
+            criteria = model[key]
+            if len(criteria.get_children()) == 2:
+                criteria.set_matrix([[1, 1/2], [2, 1]])
+            else:
+                criteria.set_matrix([[1, 3, 1/2], [1/3, 1, 1/4], [2, 4, 1]])
+        return model
+
+
+    def test_model_method(self):
+        for model_type in (Model, VaryDepthModel):
+            eig_result = self.create_model(model_type).solve()
+            power_model = self.create_model(model_type, "power_iteration")
+
+            for node in power_model._get_nodes_with_pcm():
+                self.assertIsInstance(node.pcm.priority_method, PowerIterationMethod)
+            np.testing.assert_array_almost_equal(np.abs(eig_result), power_model.solve())
+
+
+    def test_node_method_takes_precedence(self):
+        model = self.create_model(priority_method="geometric_mean")
+        criteria = model[("Criteria0", 0)]
+        criteria.set_priority_method("additive_normalization")
+        model.set_priority_method("power_iteration")
+
+        self.assertIsInstance(criteria.pcm.priority_method, AdditiveNormalizationMethod)
+        self.assertIsInstance(model.get_problem().pcm.priority_method, PowerIterationMethod)
+
+        criteria.set_priority_method(None)
+        model.solve()
+        self.assertIsInstance(criteria.pcm.priority_method, PowerIterationMethod)
+
+
+    def test_alternative_cannot_have_method(self):
+        with self.assertRaises(NotImplementedError):
+            Alternative().set_priority_method("eig")
+
+
+
+if __name__ == '__main__':
+    unittest.main()
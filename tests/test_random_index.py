@@ -0,0 +1,93 @@
+import set_up_test_pathes
+
+import unittest
+import json
+import os
+import tempfile
+from unittest.mock import patch
+import numpy as np
+import anahiepro.constants as const
+import anahiepro.random_index as random_index
+from anahiepro.random_index import generate_random_index, get_random_index, get_cache_path
+from anahiepro.pairwise import PairwiseComparisonMatrix
+
+
+
+class TestRandomIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.environment = patch.dict(os.environ, {"ANAHIEPRO_CACHE_DIR": self.directory.name})
+        self.environment.start()
+        random_index._generated_indexes = None
+
+
+    def tearDown(self):
+        self.environment.stop()
+        self.directory.cleanup()
+        random_index._generated_indexes = None
+
+
+    def test_tables(self):
+        self.assertEqual(get_random_index(5), 1.12)
+        self.assertEqual(get_random_index(15), 1.59)
+        self.assertEqual(get_random_index(40), const.SIMULATED_HOMOGENEITY_INDEXES[40])
+        self.assertEqual(sorted(const.SIMULATED_HOMOGENEITY_INDEXES), list(range(16, 101)))
+        self.assertTrue(np.all(np.diff(list(const.SIMULATED_HOMOGENEITY_INDEXES.values())) > -0.01))
+
+
+    def test_generate(self):
+        self.assertAlmostEqual(generate_random_index(10, samples=4000, seed=0), const.HOMOGENEITY_INDEXES[10], delta=0.02)
+        self.assertEqual(generate_random_index(10, samples=100, seed=1), generate_random_index(10, samples=100, seed=1))
+        self.assertEqual(generate_random_index(2), 0)
+        with self.assertRaises(ValueError):
+            generate_random_index(5, samples=0)
+
+
+    def test_cache(self):
+        with patch.object(random_index, "GENERATED_SAMPLES", 4), \
+             patch("anahiepro.random_index.generate_random_index", wraps=generate_random_index) as generate:
+            index = get_random_index(101)
+            self.assertEqual(get_random_index(101), index)
+            self.assertEqual(generate.call_count, 1)
+
+            with open(get_cache_path()) as file:
+                self.assertEqual(json.load(file), {"101": index})
+
+            random_index._generated_indexes = None
+            self.assertEqual(get_random_index(101), index)
+            self.assertEqual(generate.call_count, 1)
+
+
+    def test_cache_path(self):
+        home_cache = os.path.join(os.path.expanduser("~"), ".cache", "anahiepro", "random_indexes.json")
+        with patch.dict(os.environ, {"ANAHIEPRO_CACHE_DIR": "", "XDG_CACHE_HOME": ""}):
+            self.assertEqual(get_cache_path(), home_cache)
+        with patch.dict(os.environ, {"ANAHIEPRO_CACHE_DIR": "", "XDG_CACHE_HOME": self.directory.name}):
+            self.assertEqual(get_cache_path(), os.path.join(self.directory.name, "anahiepro", "random_indexes.json"))
+
+
+    def test_priority_vector_does_not_simulate(self):
+        weights = np.arange(1, 121)
+        pcm = PairwiseComparisonMatrix(matrix=weights[:, np.newaxis] / weights[np.newaxis, :],
+                                       priority_method="geometric_mean")
+
+        with patch("anahiepro.random_index.generate_random_index") as generate:
+            pcm.calculate_priority_vector()
+        generate.assert_not_called()
+
+
+    def test_consistency_ratio(self):
+        weights = np.arange(1, 21)
+        matrix = weights[:, np.newaxis] / weights[np.newaxis, :]
+        matrix[0, 1] *= 3
+        matrix[1, 0] /= 3
+        pcm = PairwiseComparisonMatrix(matrix=matrix)
+
+        max_eigval = np.max(np.real(np.linalg.eigvals(matrix)))
+        self.assertAlmostEqual(pcm.calculate_consistency_ratio(),
+                               (max_eigval - 20) / 19 / const.SIMULATED_HOMOGENEITY_INDEXES[20])
+
+
+
+if __name__ == '__main__':
+    unittest.main()
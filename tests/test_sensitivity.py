@@ -0,0 +1,88 @@
+import set_up_test_pathes
+
+import unittest
+import numpy as np
+from anahiepro.models.model import Model
+from anahiepro.nodes import Problem, Criteria, Alternative
+from anahiepro.models.sensitivity import SensitivityResult, analyze_sensitivity, _perturb
+from fixtures import reset_ids
+
+
+
+class TestSensitivityAnalysis(unittest.TestCase):
+    def setUp(self):
+        reset_ids()
+
+        criterias = [{Criteria(): [{Criteria(): None}, {Criteria(): None}]},
+                     {Criteria(): [{Criteria(): None}, {Criteria(): None}]}]
+        self.model = Model(Problem(), criterias, [Alternative(), Alternative(), Alternative()])
+        self.model.get_problem().set_matrix([[1, 3], [1/3, 1]])
+        for key in self.model.get_criterias_name_ids():
+            criteria = self.model[key]
+            if len(criteria.get_children()) == 2:
+                criteria.set_matrix([[1, 1/2], [2, 1]])
+            else:
+                criteria.set_matrix([[1, 3, 1/2], [1/3, 1, 1/4], [2, 4, 1]])
+
+
+    def test_small_spread_matches_solve(self):
+        result = self.model.analyze_sensitivity(samples=50, spread=1e-9, seed=0)
+
+        np.testing.assert_array_almost_equal(result.mean, np.abs(self.model.solve()))
+        np.testing.assert_array_almost_equal(result.std, np.zeros(3))
+        np.testing.assert_array_equal(result.rank_first_frequency, [0, 0, 1])
+
+
+    def test_frequencies(self):
+        result = self.model.analyze_sensitivity(samples=2500, distribution="uniform", spread=4, chunk_size=1000, seed=1)
+
+        self.assertEqual(result.samples, 2500)
+        self.assertEqual(result.alternatives, ("Alternative0", "Alternative1", "Alternative2"))
+        np.testing.assert_array_equal(result.rank_counts.sum(axis=0), [2500] * 3)
+        np.testing.assert_array_equal(result.rank_counts.sum(axis=1), [2500] * 3)
+        self.assertAlmostEqual(result.rank_first_frequency.sum(), 1)
+
+
+    def test_result_does_not_depend_on_workers(self):
+        serial = analyze_sensitivity(self.model, samples=300, chunk_size=100, seed=7)
+        parallel = analyze_sensitivity(self.model, samples=300, chunk_size=100, workers=2, seed=7)
+
+        np.testing.assert_array_equal(serial.rank_counts, parallel.rank_counts)
+        np.testing.assert_array_almost_equal(serial.mean, parallel.mean)
+        np.testing.assert_array_almost_equal(serial.std, parallel.std)
+
+
+    def test_streamed_statistics(self):
+        global_vectors = np.random.default_rng(0).uniform(size=(100, 3))
+        streamed = SensitivityResult(["a", "b", "c"])
+        for chunk in np.split(global_vectors, [10, 45]):
+            streamed._update(chunk)
+
+        np.testing.assert_array_almost_equal(streamed.mean, global_vectors.mean(axis=0))
+        np.testing.assert_array_almost_equal(streamed.std, global_vectors.std(axis=0))
+        np.testing.assert_array_equal(streamed.rank_counts[:, 0],
+                                      np.bincount(np.argmax(global_vectors, axis=1), minlength=3))
+
+
+    def test_perturbed_matrices_are_reciprocal(self):
+        matrix = np.array([[1, 9, 1/2], [1/9, 1, 1/8], [2, 8, 1]])
+        rng = np.random.default_rng(0)
+
+        for distribution in ("lognormal", "uniform"):
+            matrices = _perturb(matrix, 20, distribution, 1.0, rng)
+            np.testing.assert_array_almost_equal(matrices * np.swapaxes(matrices, 1, 2), np.ones((20, 3, 3)))
+
+        matrices = _perturb(matrix, 20, "uniform", 1.0, rng)
+        self.assertTrue(np.all((matrices >= 1/9 - 1e-12) & (matrices <= 9 + 1e-12)))
+
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            self.model.analyze_sensitivity(distribution="normal")
+        with self.assertRaises(ValueError):
+            self.model.analyze_sensitivity(samples=0)
+
+
+
+if __name__ == '__main__':
+    unittest.main()